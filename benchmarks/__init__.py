@@ -0,0 +1,4 @@
+"""Benchmarks for the dashboard data pipeline.
+
+Run from the repository root, e.g. ``python -m benchmarks.bench_snapshot``.
+"""
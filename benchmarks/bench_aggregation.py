@@ -0,0 +1,66 @@
+"""Vectorized aggregation vs the original mask-and-concat loops.
+
+Usage::
+
+    python -m benchmarks.bench_aggregation [--scale 1] [--max-scale 8] [--legacy-max 70]
+
+The Page 2 player summary from :func:`nba_analysis.aggregation.player_summary`
+is timed against the loop the dashboard used to run (``tests/test_pages.py``
+checks that they agree). The timings show how both scale with the number of
+selected players, up to all 281 in ``players_teams.csv``, and how the
+vectorized summary for all 281 players scales with the size of the log.
+"""
+import argparse
+import time
+
+from nba_analysis.aggregation import player_summary
+from nba_analysis.data import read_players_teams
+from tests.support import legacy_player_summary
+
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+def best_of(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregation engine benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-scale', type=int, default=8,
+                        help="largest log size for the row-scaling table")
+    parser.add_argument('--legacy-max', type=int, default=70,
+                        help="largest selection to time the legacy loop on (it is slow)")
+    args = parser.parse_args(argv)
+
+    shot_data = synthetic_shot_data(BASE_ROWS * args.scale)
+    all_players = [name.title() for name in read_players_teams()['Player']]
+
+    print(f"{len(shot_data):,} shots")
+    print(f"{'players':>8}{'legacy (s)':>12}{'vectorized (s)':>16}{'per player (ms)':>17}")
+    for n_players in (1, 17, 35, 70, 140, 281):
+        players = all_players[:n_players]
+        vectorized = best_of(lambda: player_summary(shot_data, players), args.repeat)
+        if n_players <= args.legacy_max:
+            legacy = f"{best_of(lambda: legacy_player_summary(shot_data, players), 1):>12.3f}"
+        else:
+            legacy = f"{'-':>12}"
+        print(f"{n_players:>8}{legacy}{vectorized:>16.4f}{vectorized / n_players * 1000:>17.3f}")
+
+    print(f"\n{'shots':>12}{'281 players (s)':>17}{'per 1M shots (s)':>18}")
+    scale = 1
+    while scale <= args.max_scale:
+        scaled = synthetic_shot_data(BASE_ROWS * scale)
+        elapsed = best_of(lambda: player_summary(scaled, all_players), args.repeat)
+        print(f"{len(scaled):>12,}{elapsed:>17.4f}{elapsed / len(scaled) * 1e6:>18.4f}")
+        scale *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""Latency of bootstrap confidence intervals for the 17 famous players.
+
+Usage::
+
+    python -m benchmarks.bench_bootstrap [--scale 1] [--repeat 20] [--limit-ms 100]
+
+Computes the Page 2 comparison of all of ``analytics.FAMOUS_PLAYERS`` with
+95% intervals from 2000 resamples per (player, level) cell, for a few
+filter combinations, and fails if the mean time exceeds ``--limit-ms``.
+``tests/test_bootstrap.py`` checks the intervals themselves, against
+explicit resampling of a few cells' shots with replacement.
+"""
+import argparse
+
+from nba_analysis import analytics, bootstrap
+from nba_analysis.cube import ShotCube
+
+from .bench_cube import mean_time
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+FILTERS = [analytics.common_filters(), analytics.common_filters("Home", "2", "3 Points", "Below 5 points"),
+           analytics.common_filters("Away", "4", "2 Points", "All")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bootstrap interval latency benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--limit-ms', type=float, default=100.0, help="latency the intervals must stay under")
+    args = parser.parse_args(argv)
+
+    shot_cube = ShotCube.from_frame(synthetic_shot_data(BASE_ROWS * args.scale))
+    players = analytics.FAMOUS_PLAYERS
+
+    print(f"{len(players)} players, {bootstrap.RESAMPLES} resamples per cell, limit {args.limit_ms:.0f} ms")
+    print(f"{'filters':<40}{'cells':>7}{'plain (ms)':>12}{'intervals (ms)':>16}{'median width':>14}")
+    slowest = 0.0
+    for filters in FILTERS:
+        summary = analytics.player_comparison(shot_cube, players, intervals=True, **filters)
+        plain = mean_time(lambda: analytics.player_comparison(shot_cube, players, **filters), args.repeat)
+        with_intervals = mean_time(lambda: analytics.player_comparison(shot_cube, players, intervals=True,
+                                                                       **filters), args.repeat)
+        slowest = max(slowest, with_intervals)
+        width = (summary['CI High'] - summary['CI Low']).median()
+        print(f"{str(tuple(filters.values())):<40}{len(summary):>7}{plain * 1000:>12.2f}"
+              f"{with_intervals * 1000:>16.2f}{width:>14.1f}")
+    assert slowest * 1000 <= args.limit_ms, f"intervals took {slowest * 1000:.1f} ms"
+    print(f"Slowest {slowest * 1000:.1f} ms, within {args.limit_ms:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Chart-data latency from the shot cube vs scanning the filtered shots.
+
+Usage::
+
+    python -m benchmarks.bench_cube [--scales 1 10] [--repeat 200]
+
+For each log size, every summary the dashboard draws is computed once by
+filtering the frame and running the vectorized aggregation, and once from the
+cube (``tests/test_pages.py`` checks that they agree). Cube latency should
+stay flat as the log grows.
+"""
+import argparse
+import time
+
+from nba_analysis.aggregation import shooting_summary
+from nba_analysis.cube import ShotCube
+from tests.support import QUERIES, filter_frame
+
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+FILTERS = {'location': 'H', 'period': 2, 'pts_type': 3, 'close_game': True}
+
+
+def mean_time(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shot cube latency benchmark")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for scale in args.scales:
+        shot_data = synthetic_shot_data(BASE_ROWS * scale)
+        start = time.perf_counter()
+        shot_cube = ShotCube.from_frame(shot_data)
+        build = time.perf_counter() - start
+        print(f"\n{len(shot_data):,} shots | cube built in {build:.3f}s, "
+              f"{(shot_cube.made.nbytes + shot_cube.shots.nbytes) / 2**20:.1f} MiB")
+        print(f"{'query':<18}{'scan (ms)':>12}{'cube (ms)':>12}")
+        for name, query in QUERIES.items():
+            scan = mean_time(lambda: shooting_summary(filter_frame(shot_data, **FILTERS), **query),
+                           max(1, args.repeat // 20))
+            cube = mean_time(lambda: shot_cube.summary(**query, **FILTERS), args.repeat)
+            print(f"{name:<18}{scan * 1000:>12.2f}{cube * 1000:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Shot distribution payload: every shot as a WebGL point vs the binned grid.
+
+Usage::
+
+    python -m benchmarks.bench_density [--scales 1 10] [--repeat 5]
+
+For a few selections of players, from the seven bubble chart players to the
+whole league, builds the shot distribution figure two ways: a ``Scattergl``
+trace with one point per shot, and the heatmap of
+:class:`nba_analysis.density.ShotDensity` counts. Reports the JSON payload
+sent to the browser and the time to build and serialize each figure.
+``tests/test_density.py`` checks the grid counts against ``np.histogram2d``.
+"""
+import argparse
+import time
+
+import plotly.graph_objects as go
+
+from nba_analysis import analytics, density, figures, views
+from nba_analysis.store import ShotStore
+
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+FILTERS = analytics.common_filters()
+
+
+# Name -> ``players`` filter, None for every player
+SELECTIONS = {
+    '7 players': views.DEFAULT_BUBBLE_PLAYERS,
+    '17 famous players': analytics.FAMOUS_PLAYERS,
+    'every player': None,
+}
+
+
+def scatter_figure(shot_store, players):
+    """Every selected shot as one point."""
+    rows = shot_store.rows(players=players, **FILTERS)
+    return go.Figure(go.Scattergl(x=shot_store.columns['SHOT_DIST'][rows],
+                                  y=shot_store.columns['CLOSE_DEF_DIST'][rows],
+                                  mode='markers', marker=dict(size=3, opacity=0.3)))
+
+
+def timed(build, repeat):
+    """Mean seconds to build and serialize a figure, and its payload bytes."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        payload = figures.payload_bytes(build())
+    return (time.perf_counter() - start) / repeat, payload
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shot distribution payload benchmark")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for scale in args.scales:
+        shot_store = ShotStore.from_frame(synthetic_shot_data(BASE_ROWS * scale))
+        shot_density = density.ShotDensity(shot_store)
+        print(f"\n{len(shot_store):,} shots")
+        print(f"{'selection':<20}{'shots':>10}{'points (KiB)':>14}{'points (ms)':>13}"
+              f"{'grid (KiB)':>12}{'grid (ms)':>11}")
+        for name, players in SELECTIONS.items():
+            n_shots = len(shot_store.rows(players=players, **FILTERS))
+            points_time, points_bytes = timed(lambda: scatter_figure(shot_store, players), args.repeat)
+            grid_time, grid_bytes = timed(
+                lambda: figures.shot_density_figure(shot_density.summary(players=players, **FILTERS)), args.repeat)
+            print(f"{name:<20}{n_shots:>10,}{points_bytes / 1024:>14.1f}{points_time * 1000:>13.1f}"
+                  f"{grid_bytes / 1024:>12.1f}{grid_time * 1000:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
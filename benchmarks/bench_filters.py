@@ -0,0 +1,49 @@
+"""Peak memory of filtering the column store vs chained frame copies.
+
+Usage::
+
+    python -m benchmarks.bench_filters [--scale 10]
+
+Switches the common filters (and a team selection) on one at a time and,
+for each number of active filters, computes the shot clock table twice:
+the way the original dashboard did, by boolean-indexing the frame once per
+filter and writing the bin column into the resulting copy, and from
+:meth:`nba_analysis.store.ShotStore.rows`, which folds every filter into one
+mask, gathering the precomputed bin codes of the selected rows. Peak traced
+memory is measured with :class:`nba_analysis.instrumentation.StageTimer`.
+``tests/test_store.py`` checks that both count the same shots and that the
+store's peak does not grow as filters are added.
+"""
+import argparse
+
+from nba_analysis.data import read_players_teams
+from nba_analysis.instrumentation import StageTimer
+from nba_analysis.store import ShotStore
+from tests.support import FILTER_STEPS, chained_table, store_table
+
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Filter memory benchmark")
+    parser.add_argument('--scale', type=int, default=10, help="multiple of the real log size")
+    args = parser.parse_args(argv)
+
+    shot_data = synthetic_shot_data(BASE_ROWS * args.scale)
+    shot_store = ShotStore.from_frame(shot_data, read_players_teams())
+    timer = StageTimer(trace_memory=True)
+
+    print(f"{len(shot_data):,} shots")
+    print(f"{'filters':>8}{'rows':>11}{'chained peak (MiB)':>20}{'store peak (MiB)':>18}")
+    for n_filters in range(len(FILTER_STEPS) + 1):
+        filters = dict(FILTER_STEPS[:n_filters])
+        with timer.stage('chained') as chained:
+            chained_table(shot_data, **filters)
+        with timer.stage('store') as stored:
+            rows = store_table(shot_store, **filters)[0]
+        print(f"{n_filters:>8}{len(rows):>11,}{chained.peak_bytes / 2**20:>20.1f}"
+              f"{stored.peak_bytes / 2**20:>18.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Ingesting new games vs reloading the whole season.
+
+Usage::
+
+    python -m benchmarks.bench_ingest [--scale 1] [--games 10 100 1000]
+
+The synthetic log is split by ``GAME_ID`` into a season on disk and a batch
+of new games. The season is loaded with its cube, shot clock profile,
+column store and density, as the dashboard serves them; the timings compare
+ingesting N games (writing their partition and updating everything loaded)
+with parsing the season and the partition and building all of it again.
+The results of an ingest are checked by ``tests/test_ingest.py``.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from nba_analysis import data
+from nba_analysis.cube import load_shot_cube
+from nba_analysis.density import load_shot_density
+from nba_analysis.ingest import ingest_games
+from nba_analysis.shot_clock import load_shot_clock_profile
+from nba_analysis.store import load_shot_store
+
+from .synthetic import BASE_ROWS, generate_shot_log
+
+
+def load_served(paths):
+    """Load the log and everything the dashboard derives from it."""
+    args = (paths['shots'], paths['players'], paths['snapshot'])
+    load_shot_cube(*args)
+    load_shot_clock_profile(data.load_shot_log(*args))
+    load_shot_density(load_shot_store(*args))
+
+
+def setup(workdir, log, new_game_ids):
+    """Write and load the season without ``new_game_ids``; return the paths and the new rows."""
+    paths = {name: os.path.join(workdir, file) for name, file in
+             [('shots', 'shot_logs.csv'), ('players', 'players_teams.csv'), ('snapshot', 'shot_logs.feather')]}
+    shutil.copy(data.PLAYERS_TEAMS_PATH, paths['players'])
+    for path in [paths['snapshot'], data.ingested_directory(paths['shots'])]:
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+    is_new = log['GAME_ID'].isin(new_game_ids)
+    log[~is_new].to_csv(paths['shots'], index=False, encoding="ISO-8859-1")
+    data.clear_cache()
+    load_served(paths)
+    return paths, log[is_new]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental ingestion benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--games', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args(argv)
+
+    log = generate_shot_log(BASE_ROWS * args.scale)
+    games = np.sort(log['GAME_ID'].unique())
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    try:
+        print(f"{len(log):,} shots in {len(games):,} games")
+        print(f"{'new games':>10}{'new shots':>11}{'ingest (s)':>12}{'reload (s)':>12}")
+        for n_games in args.games:
+            paths, new_rows = setup(workdir, log, games[-n_games:])
+            start = time.perf_counter()
+            ingest_games(new_rows, paths['shots'], paths['players'], paths['snapshot'])
+            load_served(paths)
+            ingest = time.perf_counter() - start
+
+            # A cold load of the season and the partition from the CSV files
+            data.clear_cache()
+            start = time.perf_counter()
+            load_served(dict(paths, snapshot=None))
+            reload = time.perf_counter() - start
+            print(f"{n_games:>10,}{len(new_rows):>11,}{ingest:>12.3f}{reload:>12.3f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
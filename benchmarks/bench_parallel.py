@@ -0,0 +1,65 @@
+"""Process-pool summaries vs the single-process scan, by number of workers.
+
+Usage::
+
+    python -m benchmarks.bench_parallel [--scale 10] [--processes 1 2 4 8] [--repeat 5]
+
+Times the Page 3 "all 30 teams" and Page 2 "all 281 players" selections
+with :class:`nba_analysis.parallel.ParallelSummary` for each worker count,
+against :func:`nba_analysis.aggregation.shooting_summary` in one process
+(``tests/test_parallel.py`` checks that both give the same table). Pools are
+started (and their workers have mapped the columns) before timing; the
+start-up cost is reported separately.
+"""
+import argparse
+import os
+import time
+
+from nba_analysis.aggregation import shooting_summary
+from nba_analysis.data import read_players_teams
+from nba_analysis.parallel import ParallelSummary
+
+from .bench_cube import mean_time
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+def selections():
+    players = [player.lower() for player in read_players_teams()['Player']]
+    return {
+        'all 30 teams': dict(by=['team_name']),
+        f'all {len(players)} players': dict(by=['player_name'], keys={'player_name': players}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parallel summary benchmark")
+    parser.add_argument('--scale', type=int, default=10, help="multiple of the real log size")
+    parser.add_argument('--processes', type=int, nargs='+',
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    shot_data = synthetic_shot_data(BASE_ROWS * args.scale)
+    queries = selections()
+    serial = {name: mean_time(lambda: shooting_summary(shot_data, **query), args.repeat)
+              for name, query in queries.items()}
+    print(f"{len(shot_data):,} shots, {os.cpu_count()} CPUs")
+    print(f"{'workers':>8}{'start (s)':>11}" + ''.join(f"{name + ' (ms)':>24}{'speedup':>9}" for name in queries))
+    print(f"{'serial':>8}{'':>11}" + ''.join(f"{serial[name] * 1000:>24.1f}{1:>9.2f}" for name in queries))
+
+    for processes in args.processes:
+        start = time.perf_counter()
+        with ParallelSummary(shot_data, processes) as backend:
+            # Wait for every worker to come up and map the columns
+            for query in queries.values():
+                backend.summary(**query)
+            startup = time.perf_counter() - start
+            row = f"{processes:>8}{startup:>11.2f}"
+            for name, query in queries.items():
+                elapsed = mean_time(lambda: backend.summary(**query), args.repeat)
+                row += f"{elapsed * 1000:>24.1f}{serial[name] / elapsed:>9.2f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Page switch latency with and without background prefetching.
+
+Usage::
+
+    python -m benchmarks.bench_prefetch [--scale 1] [--repeat 5]
+
+For every pair of pages, times switching from one to the other with the
+default selections: building the target page's figures from the cube into
+an empty figure cache, versus taking them from a cache that a
+:class:`nba_analysis.prefetch.Prefetcher` filled in the background after
+the first page rendered. Rendering (figure serialization by Streamlit) is
+the same either way and not included. The prefetcher itself is checked by
+``tests/test_prefetch.py``.
+"""
+import argparse
+import time
+
+from nba_analysis import analytics, views
+from nba_analysis.cube import ShotCube
+from nba_analysis.figure_cache import FigureCache
+from nba_analysis.prefetch import Prefetcher
+from nba_analysis.shot_clock import ShotClockProfile
+from tests.support import wait_idle
+
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+FILTERS = analytics.common_filters()
+
+
+def switch(figure_cache, page_views):
+    """Seconds to get every figure of a page, building the missing ones."""
+    start = time.perf_counter()
+    for view in page_views:
+        figure_cache.get_or_build(view.key, lambda: view.figure(view.table()))
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Background prefetch benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    shot_data = synthetic_shot_data(BASE_ROWS * args.scale)
+    shot_cube = ShotCube.from_frame(shot_data)
+    profile = ShotClockProfile.from_frame(shot_data)
+    print(f"{'from':<40}{'to':<40}{'cold (ms)':>10}{'prefetched (ms)':>16}")
+    for page in views.PAGES:
+        for target in views.PAGES:
+            if target == page:
+                continue
+            cold = warm = 0.0
+            for _ in range(args.repeat):
+                cold += switch(FigureCache(), views.page_views(target, shot_cube, profile, FILTERS))
+
+                figure_cache = FigureCache()
+                prefetcher = Prefetcher(figure_cache)
+                switch(figure_cache, views.page_views(page, shot_cube, profile, FILTERS))
+                prefetcher.schedule('session', tuple(FILTERS.items()),
+                                    [view for other in views.PAGES if other != page
+                                     for view in views.page_views(other, shot_cube, profile, FILTERS)])
+                wait_idle(prefetcher, 'session')
+                warm += switch(figure_cache, views.page_views(target, shot_cube, profile, FILTERS))
+                prefetcher.shutdown()
+            print(f"{page:<40}{target:<40}{cold / args.repeat * 1000:>10.1f}{warm / args.repeat * 1000:>16.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Batch report throughput: all 435 team pairs and the Page 2 player packs.
+
+Usage::
+
+    python -m benchmarks.bench_report [--scale 1] [--workers 1 2 4]
+
+Computes the tables of every team pair and of a set of player comparisons
+twice: one call per chart, as the dashboard does, and in one batched pass
+with :func:`nba_analysis.report.figure_tasks`. Then renders the figures to
+JSON files with each number of worker processes and reports figures per
+second. ``tests/test_report.py`` checks the batched tables against the
+per-chart ones.
+"""
+import argparse
+import shutil
+import tempfile
+import time
+
+from nba_analysis import analytics, report
+from nba_analysis.cube import ShotCube
+from tests.support import PLAYER_COMPARISONS, per_chart_tables
+
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+FILTERS = [analytics.common_filters(), analytics.common_filters("Home", "2", "3 Points", "Below 5 points")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch report benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args(argv)
+
+    shot_cube = ShotCube.from_frame(synthetic_shot_data(BASE_ROWS * args.scale))
+    team_pairs = report.all_team_pairs(shot_cube)
+    players = [('players', names) for names in PLAYER_COMPARISONS]
+    comparisons = team_pairs + players
+    print(f"{len(team_pairs)} team pairs, {len(players)} player comparisons")
+
+    print(f"{'filters':<60}{'per chart (s)':>14}{'batched (s)':>12}")
+    for filters in FILTERS:
+        start = time.perf_counter()
+        for kind, names in comparisons:
+            per_chart_tables(shot_cube, kind, names, filters)
+        per_chart = time.perf_counter() - start
+        start = time.perf_counter()
+        report.figure_tasks(shot_cube, comparisons, filters)
+        batched = time.perf_counter() - start
+        print(f"{str(tuple(filters.values())):<60}{per_chart:>14.2f}{batched:>12.2f}")
+
+    tasks, _ = report.figure_tasks(shot_cube, comparisons, FILTERS[0])
+    print(f"\n{'workers':>8}{'figures':>9}{'seconds':>9}{'figures/s':>11}")
+    for workers in args.workers:
+        directory = tempfile.mkdtemp(prefix='nba_report_')
+        try:
+            start = time.perf_counter()
+            written = [path for path in report.render(tasks, directory, 'json', workers) if path is not None]
+            elapsed = time.perf_counter() - start
+        finally:
+            shutil.rmtree(directory)
+        print(f"{workers:>8}{len(written):>9}{elapsed:>9.2f}{len(written) / elapsed:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+"""Load test of the query API: requests per second and latency percentiles.
+
+Usage::
+
+    python -m benchmarks.bench_service [--scale 1] [--clients 1 4 16] [--requests 2000]
+
+Starts :mod:`nba_analysis.service` in its own process on a synthetic log.
+Each client thread sends its share of requests over one keep-alive
+connection, in three rounds: ``cold`` requests a new URL every time (every
+response is computed), ``cached`` cycles through those URLs again (served
+from the response cache), and ``revalidate`` sends their ETags in
+``If-None-Match`` (empty 304 responses). The responses themselves are
+checked by ``tests/test_service.py``.
+"""
+import argparse
+import http.client
+import itertools
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+import time
+from urllib.parse import urlencode
+
+import numpy as np
+
+from nba_analysis import analytics, data
+from nba_analysis.service import FILTER_PARAMETERS, QueryServer, QueryService
+
+from .synthetic import BASE_ROWS, write_shot_log
+
+
+def _serve(paths, cache_size, queue):
+    server = QueryServer(('127.0.0.1', 0), QueryService(paths['shots'], paths['players'], None,
+                                                        cache_size=cache_size))
+    # Load the data before reporting ready
+    server.service.get('/options')
+    queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+def urls():
+    """Distinct request URLs: player pairs, teams and Page 1 tables under every filter."""
+    filters = [dict(zip(FILTER_PARAMETERS, values)) for values in itertools.product(
+        *[list(choices) for _, choices in FILTER_PARAMETERS.values()])]
+    pairs = list(itertools.combinations(analytics.FAMOUS_PLAYERS, 2))
+    result = []
+    for i, selection in enumerate(filters):
+        player1, player2 = pairs[i % len(pairs)]
+        result += [f'/players?{urlencode({"player": [player1, player2], **selection}, doseq=True)}',
+                   f'/teams?{urlencode({"team": ["Atlanta Hawks", "Golden State Warriors"], **selection}, doseq=True)}',
+                   f'/shot-clock?{urlencode(selection)}',
+                   f'/catch-and-shoot?{urlencode(selection)}']
+    return result
+
+
+def load(port, request_urls, n_clients, etags=None):
+    """Send ``request_urls`` from ``n_clients`` threads; returns latencies and the ETags seen."""
+    latencies = []
+    seen = {}
+    lock = threading.Lock()
+
+    def client(share):
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        times = []
+        for url in share:
+            headers = {'If-None-Match': etags[url]} if etags else {}
+            start = time.perf_counter()
+            connection.request('GET', url, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            times.append(time.perf_counter() - start)
+            assert response.status == (304 if etags else 200), (url, response.status)
+            with lock:
+                seen[url] = response.getheader('ETag')
+        connection.close()
+        with lock:
+            latencies.extend(times)
+
+    threads = [threading.Thread(target=client, args=(request_urls[i::n_clients],)) for i in range(n_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array(latencies), seen
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query API load test")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=2000, help="requests per round")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    ctx = multiprocessing.get_context('spawn')
+    server = None
+    try:
+        paths = {'shots': os.path.join(workdir, 'shot_logs.csv'),
+                 'players': os.path.join(workdir, 'players_teams.csv')}
+        shutil.copy(data.PLAYERS_TEAMS_PATH, paths['players'])
+        write_shot_log(paths['shots'], BASE_ROWS * args.scale, players_path=paths['players'])
+        all_urls = urls()
+        queue = ctx.Queue()
+        # The cache holds every URL, so the cached rounds never miss
+        server = ctx.Process(target=_serve, args=(paths, len(all_urls), queue), daemon=True)
+        server.start()
+        port = queue.get(timeout=300)
+        print(f"{BASE_ROWS * args.scale:,} shots | {len(all_urls)} distinct URLs")
+
+        print(f"{'round':<12}{'clients':>8}{'requests':>10}{'req/s':>10}{'p50 (ms)':>10}{'p99 (ms)':>10}")
+        offset = 0
+        for n_clients in args.clients:
+            # A new slice of URLs per client count, so the cold round really is cold
+            cold = [all_urls[(offset + i) % len(all_urls)] for i in range(min(args.requests, len(all_urls)))]
+            offset += len(cold)
+            cached = [cold[i % len(cold)] for i in range(args.requests)]
+            rounds = {}
+            elapsed, latencies, etags = load(port, cold, n_clients)
+            rounds['cold'] = elapsed, latencies
+            rounds['cached'] = load(port, cached, n_clients)[:2]
+            rounds['revalidate'] = load(port, cached, n_clients, etags)[:2]
+            for name, (elapsed, latencies) in rounds.items():
+                print(f"{name:<12}{n_clients:>8}{len(latencies):>10}{len(latencies) / elapsed:>10.0f}"
+                      f"{np.percentile(latencies, 50) * 1000:>10.2f}{np.percentile(latencies, 99) * 1000:>10.2f}")
+    finally:
+        if server is not None:
+            server.terminate()
+            server.join()
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
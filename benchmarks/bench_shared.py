@@ -0,0 +1,67 @@
+"""Host memory of N dashboard workers: private copies vs one shared copy.
+
+Usage::
+
+    python -m benchmarks.bench_shared [--scale 10] [--workers 1 2 4 8]
+
+Starts N worker processes side by side, in three modes: ``baseline`` only
+imports the dashboard's modules, ``private`` loads the cube itself as a
+worker does by default, and ``shared`` attaches to the
+arrays published once with :func:`nba_analysis.shared.publish`. Each worker
+computes every page table for a few filter combinations and then, once all
+workers are up, reports its proportional set size (PSS: shared pages are
+split between the processes mapping them). The sum over the workers is the
+host memory they use; its growth per added worker should be the interpreter
+alone in shared mode. ``tests/test_shared.py`` checks the workers' tables.
+"""
+import argparse
+import os
+import shutil
+import tempfile
+
+from nba_analysis import data, shared
+from tests.support import run_workers
+
+from .synthetic import BASE_ROWS, write_shot_log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared vs private worker memory benchmark")
+    parser.add_argument('--scale', type=int, default=10, help="multiple of the real log size")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    shared_directory = tempfile.mkdtemp(prefix='nba_shared_', dir=os.path.dirname(shared.SHARED_DIRECTORY))
+    try:
+        paths = {'shots': os.path.join(workdir, 'shot_logs.csv'),
+                 'players': os.path.join(workdir, 'players_teams.csv')}
+        shutil.copy(data.PLAYERS_TEAMS_PATH, paths['players'])
+        write_shot_log(paths['shots'], BASE_ROWS * args.scale, players_path=paths['players'])
+        version = shared.publish(shared_directory, paths['shots'], paths['players'], None)
+        size = sum(os.path.getsize(os.path.join(root, name))
+                   for root, _, names in os.walk(version) for name in names)
+        print(f"{BASE_ROWS * args.scale:,} shots | published {size / 2**20:.1f} MiB to {shared_directory}")
+
+        print(f"{'workers':>8}" + ''.join(f"{mode + ' PSS (MiB)':>22}" for mode in ('baseline', 'private', 'shared')))
+        totals = {}
+        for n_workers in args.workers:
+            row = f"{n_workers:>8}"
+            for mode in ('baseline', 'private', 'shared'):
+                total = run_workers(mode, n_workers, paths, shared_directory)[0]
+                totals[mode, n_workers] = total
+                row += f"{total / 2**20:>22.0f}"
+            print(row)
+
+        first, last = min(args.workers), max(args.workers)
+        if last > first:
+            print(f"\nPer added worker:" + ''.join(
+                f" {mode} {(totals[mode, last] - totals[mode, first]) / (last - first) / 2**20:.0f} MiB"
+                for mode in ('baseline', 'private', 'shared')))
+    finally:
+        shutil.rmtree(workdir)
+        shutil.rmtree(shared_directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""Shot clock chart latency per bin width: profile vs binning the filtered shots.
+
+Usage::
+
+    python -m benchmarks.bench_shot_clock [--scales 1 10] [--repeat 200]
+
+For each log size and bin width, the Page 1 shot clock table is computed
+once by filtering the frame, cutting SHOT_CLOCK into bins of that width and
+grouping, and once from :class:`nba_analysis.shot_clock.ShotClockProfile`.
+Profile latency should stay flat across widths and log sizes.
+``tests/test_shot_clock.py`` checks that the two agree.
+"""
+import argparse
+import time
+
+from nba_analysis import analytics, shot_clock
+from tests.support import binned_summary
+
+from .bench_cube import mean_time
+from .synthetic import BASE_ROWS, synthetic_shot_data
+
+
+FILTERS = [analytics.common_filters(), analytics.common_filters("Home", "2", "3 Points", "Below 5 points")]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shot clock profile benchmark")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    for scale in args.scales:
+        shot_data = synthetic_shot_data(BASE_ROWS * scale)
+        start = time.perf_counter()
+        profile = shot_clock.ShotClockProfile.from_frame(shot_data)
+        built = time.perf_counter() - start
+        print(f"\n{len(shot_data):,} shots | profile built in {built * 1000:.1f} ms, "
+              f"{(profile.made.nbytes + profile.shots.nbytes) / 2**10:.0f} KiB")
+
+        filters = FILTERS[1]
+        print(f"{'bin width (s)':>14}{'bins':>6}{'pd.cut (ms)':>13}{'profile (ms)':>14}")
+        for bin_width in shot_clock.BIN_WIDTHS:
+            frame_time = mean_time(lambda: binned_summary(shot_data, bin_width, **filters),
+                                   max(1, args.repeat // 20))
+            profile_time = mean_time(lambda: profile.summary(bin_width, **filters), args.repeat)
+            print(f"{bin_width:>14}{len(shot_clock.bin_labels(bin_width)):>6}"
+                  f"{frame_time * 1000:>13.2f}{profile_time * 1000:>14.3f}")
+
+
+if __name__ == '__main__':
+    main()
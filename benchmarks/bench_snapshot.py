@@ -0,0 +1,93 @@
+"""Compare CSV and snapshot loading: wall time and peak RSS.
+
+Usage::
+
+    python -m benchmarks.bench_snapshot [--scale 10] [--repeat 3]
+
+Each load runs in a fresh interpreter so peak RSS is not polluted by earlier
+runs. The shot log is synthetic and ``--scale`` times the size of the real
+2014-15 log.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+
+from nba_analysis import data, snapshot
+
+from .synthetic import BASE_ROWS, write_shot_log
+
+
+def _peak_rss():
+    """Peak resident set size of this process in bytes."""
+    # VmHWM is reset on exec; ru_maxrss is inherited from the forking parent
+    # on Linux, so prefer the former where it exists.
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _load(mode, shot_path, players_path, snapshot_path, queue):
+    baseline = _peak_rss()
+    start = time.perf_counter()
+    if mode == 'csv':
+        frame = data.build_shot_data(shot_path, players_path)
+    else:
+        frame = snapshot.read_snapshot(snapshot_path)
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss()
+    queue.put((elapsed, len(frame), peak, peak - baseline))
+
+
+def measure(mode, shot_path, players_path, snapshot_path):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_load, args=(mode, shot_path, players_path, snapshot_path, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV vs snapshot load benchmark")
+    parser.add_argument('--scale', type=int, default=10, help="multiple of the real log size")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if not snapshot.available():
+        parser.error("pyarrow is required for the snapshot benchmark")
+
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    try:
+        shot_path = os.path.join(workdir, 'shot_logs.csv')
+        players_path = os.path.join(workdir, 'players_teams.csv')
+        snapshot_path = os.path.join(workdir, 'shot_logs.feather')
+        shutil.copy(data.PLAYERS_TEAMS_PATH, players_path)
+        write_shot_log(shot_path, BASE_ROWS * args.scale, players_path=players_path)
+        snapshot.write_snapshot(data.build_shot_data(shot_path, players_path), snapshot_path)
+
+        print(f"{BASE_ROWS * args.scale:,} shots | CSV {os.path.getsize(shot_path) / 2**20:.0f} MiB"
+              f" | snapshot {os.path.getsize(snapshot_path) / 2**20:.0f} MiB")
+        print(f"{'format':<10}{'load (s)':>10}{'peak RSS (MiB)':>16}{'load RSS (MiB)':>16}")
+        for mode in ('csv', 'snapshot'):
+            runs = [measure(mode, shot_path, players_path, snapshot_path) for _ in range(args.repeat)]
+            elapsed = statistics.median(run[0] for run in runs)
+            peak = max(run[2] for run in runs) / 2**20
+            delta = max(run[3] for run in runs) / 2**20
+            print(f"{mode:<10}{elapsed:>10.3f}{peak:>16.0f}{delta:>16.0f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
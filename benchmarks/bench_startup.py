@@ -0,0 +1,146 @@
+"""Cold start of the dashboard: import times and time to first render.
+
+Usage::
+
+    python -m benchmarks.bench_startup [--scale 1] [--repeat 3] [--script dashboard.py]
+
+Import times are measured in a fresh interpreter per module and run.
+``tests/test_startup.py`` checks that the modules the dashboard imports
+before drawing its sidebar import none of numpy, pandas or plotly, and that
+the figures do not import Plotly Express.
+
+Time to first render starts ``streamlit run`` on a synthetic log in a new
+process per run, waits for its health check, then opens a session over the
+websocket the browser uses and times the elements the script sends: the
+title, the page header (once the sidebar filters are drawn), the first chart
+and the end of the script. ``csv`` runs start without a snapshot, so the log
+is parsed; ``snapshot`` runs read the snapshot the previous run wrote. Pass
+``--script`` with an older dashboard to compare.
+"""
+import argparse
+import asyncio
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+from nba_analysis import data, snapshot
+from tests.support import import_time
+
+from .synthetic import BASE_ROWS, write_shot_log
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTS = ['nba_analysis.options', 'nba_analysis.startup', 'nba_analysis.instrumentation',
+           'numpy', 'pandas', 'plotly.graph_objects', 'plotly.express',
+           'nba_analysis.analytics', 'nba_analysis.figures', 'nba_analysis.views']
+
+MILESTONES = ['health', 'title', 'header', 'first chart', 'finished']
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def _session(port):
+    """Seconds from the session's first message to each milestone of the script."""
+    times = {}
+    async with websockets.connect(f'ws://127.0.0.1:{port}/_stcore/stream', max_size=None) as connection:
+        message = BackMsg()
+        message.rerun_script.query_string = ''
+        start = time.perf_counter()
+        await connection.send(message.SerializeToString())
+        headings = 0
+        while 'finished' not in times:
+            message = ForwardMsg()
+            message.ParseFromString(await connection.recv())
+            now = time.perf_counter() - start
+            kind = message.WhichOneof('type')
+            if kind == 'script_finished':
+                times['finished'] = now
+            elif kind == 'delta' and message.delta.WhichOneof('type') == 'new_element':
+                element = message.delta.new_element.WhichOneof('type')
+                if element == 'heading':
+                    headings += 1
+                    times.setdefault('title' if headings == 1 else 'header', now)
+                elif element == 'plotly_chart':
+                    times.setdefault('first chart', now)
+    return times
+
+
+def first_render(script, workdir):
+    """Milestones of one cold start, in seconds since ``streamlit run`` was started."""
+    port = _free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', script, '--server.headless', 'true',
+         '--server.port', str(port), '--server.enableXsrfProtection', 'false',
+         '--browser.gatherUsageStats', 'false'],
+        cwd=workdir, env={**os.environ, 'PYTHONPATH': REPO},
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{port}/_stcore/health').read()
+                break
+            except OSError:
+                if server.poll() is not None:
+                    raise RuntimeError(f"streamlit exited with status {server.returncode}")
+                time.sleep(0.02)
+        health = time.perf_counter() - start
+        times = asyncio.run(_session(port))
+        return {'health': health, **{name: health + seconds for name, seconds in times.items()}}
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Dashboard cold start benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--script', default=os.path.join(REPO, 'dashboard.py'), help="dashboard to start")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':<32}{'import (ms)':>12}")
+    for module in IMPORTS:
+        seconds = statistics.median(import_time(module)[0] for _ in range(args.repeat))
+        print(f"{module:<32}{seconds * 1000:>12.0f}")
+
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    try:
+        shutil.copy(data.PLAYERS_TEAMS_PATH, workdir)
+        write_shot_log(os.path.join(workdir, data.SHOT_LOG_PATH), BASE_ROWS * args.scale,
+                       players_path=os.path.join(workdir, data.PLAYERS_TEAMS_PATH))
+        snapshot_path = os.path.join(workdir, snapshot.SNAPSHOT_PATH)
+        script = os.path.abspath(args.script)
+        print(f"\n{BASE_ROWS * args.scale:,} shots | {os.path.relpath(script)} | "
+              f"median of {args.repeat} cold starts, seconds since streamlit run")
+        print(f"{'source':<10}" + ''.join(f"{name:>13}" for name in MILESTONES))
+        for source in ['csv', 'snapshot']:
+            runs = []
+            for _ in range(args.repeat):
+                if source == 'csv' and os.path.exists(snapshot_path):
+                    os.remove(snapshot_path)
+                # A csv run writes the snapshot the snapshot runs read
+                runs.append(first_render(script, workdir))
+            print(f"{source:<10}" + ''.join(f"{statistics.median(run[name] for run in runs):>13.2f}"
+                                            for name in MILESTONES))
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Memory footprint of the compact column store vs the merged frame.
+
+Usage::
+
+    python -m benchmarks.bench_store [--scale 1] [--repeat 20]
+
+Reports the bytes held by the shot data in three forms: the frame the
+original dashboard built (``read_csv`` defaults merged with
+players_teams.csv, names as Python object strings), the compact merged
+frame of :func:`nba_analysis.data.build_shot_data`, and the
+:class:`nba_analysis.store.ShotStore` built from it, then times selecting
+players on each. ``tests/test_store.py`` checks that the store gives back
+the frame's values and rows.
+"""
+import argparse
+import os
+import tempfile
+
+import pandas as pd
+
+from nba_analysis import data
+from nba_analysis.analytics import FAMOUS_PLAYERS
+from nba_analysis.store import ShotStore
+
+from .bench_cube import mean_time
+from .synthetic import BASE_ROWS, write_shot_log
+
+
+def original_frame(shot_path, players_path):
+    """The merged frame as the original dashboard script loaded it."""
+    shot_data = pd.read_csv(shot_path, encoding="ISO-8859-1")
+    shot_data['TIME_LEFT'] = shot_data['SHOT_CLOCK']
+    player_df = pd.read_csv(players_path)
+    shot_data = shot_data.merge(player_df, how='left', left_on='player_name', right_on='Player')
+    shot_data = shot_data.drop(columns=['Player'])
+    return shot_data.astype({column: object for column in shot_data.columns
+                             if pd.api.types.is_string_dtype(shot_data[column])})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Column store memory benchmark")
+    parser.add_argument('--scale', type=int, default=1, help="multiple of the real log size")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        shot_path = write_shot_log(os.path.join(tmp, 'shot_logs.csv'), BASE_ROWS * args.scale)
+        original = original_frame(shot_path, data.PLAYERS_TEAMS_PATH)
+        shot_data = data.build_shot_data(shot_path, data.PLAYERS_TEAMS_PATH)
+    shot_store = ShotStore.from_frame(shot_data, data.read_players_teams())
+    print(f"{len(shot_store):,} shots, {len(shot_store.players)} players, {len(shot_store.teams)} teams")
+
+    sizes = {
+        'original frame (object strings)': original.memory_usage(deep=True).sum(),
+        'compact merged frame': shot_data.memory_usage(deep=True).sum(),
+        'column store': shot_store.nbytes,
+    }
+    print(f"\n{'representation':<34}{'MiB':>8}{'bytes/shot':>12}{'vs original':>13}")
+    for name, size in sizes.items():
+        print(f"{name:<34}{size / 2**20:>8.1f}{size / len(shot_store):>12.1f}"
+              f"{sizes['original frame (object strings)'] / size:>12.1f}x")
+
+    print(f"\n{'column':<22}{'dtype':>9}{'KiB':>9}")
+    for column, size in shot_store.memory_usage().items():
+        dtype = shot_store.columns[column].dtype.name if column in shot_store.columns else ''
+        print(f"{column:<22}{dtype:>9}{size / 2**10:>9.0f}")
+
+    lowered = [player.lower() for player in FAMOUS_PLAYERS]
+    by_string = mean_time(lambda: original[original['player_name'].isin(lowered)], args.repeat)
+    by_frame = mean_time(lambda: shot_data[shot_data['player_name'].isin(lowered)], args.repeat)
+    by_id = mean_time(lambda: shot_store.frame(shot_store.rows(players=FAMOUS_PLAYERS)), args.repeat)
+    print(f"\nSelect {len(FAMOUS_PLAYERS)} players: object strings {by_string * 1000:.1f} ms, "
+          f"compact frame {by_frame * 1000:.1f} ms, store ids {by_id * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Streamed (chunked) cube construction vs loading the whole log.
+
+Usage::
+
+    python -m benchmarks.bench_streaming [--scale 10] [--chunk-rows 100000]
+
+Builds the cube with :func:`nba_analysis.cube.stream_shot_cube` and with
+the in-memory path in fresh interpreters and reports wall time and peak RSS:
+the in-memory path grows with the log, the streamed one with the chunk size
+only. ``tests/test_streaming.py`` checks that both give the same cube.
+"""
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+
+from nba_analysis import data
+from nba_analysis.cube import ShotCube, stream_shot_cube
+
+from .bench_snapshot import _peak_rss
+from .synthetic import BASE_ROWS, write_shot_log
+
+
+def _build(mode, shot_path, players_path, chunk_rows, queue):
+    baseline = _peak_rss()
+    start = time.perf_counter()
+    if mode == 'in-memory':
+        shot_cube = ShotCube.from_frame(data.build_shot_data(shot_path, players_path))
+    else:
+        shot_cube = stream_shot_cube(shot_path, players_path, chunk_rows)
+    elapsed = time.perf_counter() - start
+    peak = _peak_rss()
+    queue.put((elapsed, int(shot_cube.shots[-1, -1, -1, -1].sum()), peak, peak - baseline))
+
+
+def measure(mode, shot_path, players_path, chunk_rows):
+    ctx = multiprocessing.get_context('spawn')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_build, args=(mode, shot_path, players_path, chunk_rows, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Streamed vs in-memory cube benchmark")
+    parser.add_argument('--scale', type=int, default=10, help="multiple of the real log size")
+    parser.add_argument('--chunk-rows', type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='nba_bench_')
+    try:
+        players_path = os.path.join(workdir, 'players_teams.csv')
+        shutil.copy(data.PLAYERS_TEAMS_PATH, players_path)
+
+        shot_path = write_shot_log(os.path.join(workdir, 'shot_logs.csv'), BASE_ROWS * args.scale,
+                                   players_path=players_path)
+        print(f"{BASE_ROWS * args.scale:,} shots | CSV {os.path.getsize(shot_path) / 2**20:.0f} MiB"
+              f" | chunks of {args.chunk_rows:,} shots")
+        print(f"{'mode':<12}{'build (s)':>10}{'peak RSS (MiB)':>16}{'build RSS (MiB)':>17}")
+        for mode in ('in-memory', 'streamed'):
+            elapsed, counted, peak, delta = measure(mode, shot_path, players_path, args.chunk_rows)
+            print(f"{mode:<12}{elapsed:>10.2f}{peak / 2**20:>16.0f}{delta / 2**20:>17.0f}")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""pytest-benchmark suite: loading, common filtering and every page's tables.
+
+Run from the repository root (``pip install -r benchmarks/requirements.txt``)::
+
+    python -m pytest benchmarks/suite.py --benchmark-storage=benchmarks/baselines \\
+        --benchmark-compare --benchmark-compare-fail=median:30%
+
+which fails when any benchmark's median is more than 30% slower than the
+latest saved run for this machine and Python version. After an intended
+change, record a new baseline with ``--benchmark-save=baseline`` instead of
+the two compare options.
+
+The log size is set by ``BENCH_ROWS`` (comma-separated, default ``1e5``),
+e.g. ``BENCH_ROWS=1e5,1e6``. Logs are generated once per size with
+:mod:`benchmarks.synthetic` and shared by every benchmark of that size.
+"""
+import os
+
+import pytest
+
+from nba_analysis import analytics
+from nba_analysis.aggregation import shooting_summary
+from nba_analysis.cube import ShotCube
+from nba_analysis.data import PLAYERS_TEAMS_PATH, build_shot_data
+from nba_analysis.snapshot import read_snapshot, write_snapshot
+from tests.support import filter_frame
+
+from .synthetic import write_shot_log
+
+
+ROWS = [int(float(rows)) for rows in os.environ.get('BENCH_ROWS', '1e5').split(',')]
+
+# Sidebar selections benchmarked for every filtered computation
+FILTERS = {
+    'all': analytics.common_filters(),
+    'home-q2-3pt-close': analytics.common_filters("Home", "2", "3 Points", "Below 5 points"),
+}
+
+BUBBLE_PLAYERS = ['LeBron James', 'Stephen Curry', 'Kawhi Leonard', 'James Harden',
+                  'Chris Paul', 'Kobe Bryant', 'Anthony Davis']
+TEAMS = ['Golden State Warriors', 'Los Angeles Lakers', 'Atlanta Hawks']
+
+# Page tables, each computed from the cube with the common filters
+PAGE_TABLES = {
+    'page1-shot-clock': lambda cube, filters: analytics.shot_clock_summary(cube, **filters),
+    'page1-catch-and-shoot': lambda cube, filters: analytics.catch_and_shoot_summary(cube, **filters),
+    'page2-bubble': lambda cube, filters: analytics.player_comparison(cube, BUBBLE_PLAYERS, **filters),
+    'page2-line': lambda cube, filters: analytics.player_comparison(cube, BUBBLE_PLAYERS[:2], **filters),
+    'page3-team': lambda cube, filters: analytics.team_levels(cube, TEAMS[0], **filters),
+    'page3-difference': lambda cube, filters: analytics.team_difference(cube, TEAMS[0], TEAMS[2], **filters),
+    'page3-multi': lambda cube, filters: analytics.team_comparison(cube, TEAMS, **filters),
+}
+
+
+@pytest.fixture(scope='module', params=ROWS, ids=lambda rows: f'{rows:.0e}')
+def shot_log(request, tmp_path_factory):
+    """Paths of a synthetic CSV and its Feather snapshot."""
+    directory = tmp_path_factory.mktemp(f'shots-{request.param}')
+    csv_path = write_shot_log(str(directory / 'shot_logs.csv'), request.param)
+    snapshot_path = str(directory / 'shot_logs.feather')
+    write_snapshot(build_shot_data(csv_path, PLAYERS_TEAMS_PATH), snapshot_path)
+    return csv_path, snapshot_path
+
+
+@pytest.fixture(scope='module')
+def shot_data(shot_log):
+    return read_snapshot(shot_log[1])
+
+
+@pytest.fixture(scope='module')
+def shot_cube(shot_data):
+    return ShotCube.from_frame(shot_data)
+
+
+def test_load_csv(benchmark, shot_log):
+    benchmark.pedantic(build_shot_data, args=(shot_log[0], PLAYERS_TEAMS_PATH), rounds=3)
+
+
+def test_load_snapshot(benchmark, shot_log):
+    benchmark.pedantic(read_snapshot, args=(shot_log[1],), rounds=5)
+
+
+def test_build_cube(benchmark, shot_data):
+    benchmark.pedantic(ShotCube.from_frame, args=(shot_data,), rounds=3)
+
+
+@pytest.mark.parametrize('filters', FILTERS.values(), ids=FILTERS.keys())
+def test_filter_frame(benchmark, shot_data, filters):
+    benchmark(filter_frame, shot_data, **filters)
+
+
+@pytest.mark.parametrize('filters', FILTERS.values(), ids=FILTERS.keys())
+def test_filtered_scan(benchmark, shot_data, filters):
+    """The Page 1 shot clock table computed by scanning the filtered shots."""
+    benchmark(lambda: shooting_summary(filter_frame(shot_data, **filters), categories=['SHOT_CLOCK_CATEGORY']))
+
+
+@pytest.mark.parametrize('filters', FILTERS.values(), ids=FILTERS.keys())
+@pytest.mark.parametrize('table', PAGE_TABLES.values(), ids=PAGE_TABLES.keys())
+def test_page_table(benchmark, shot_cube, table, filters):
+    benchmark(table, shot_cube, filters)
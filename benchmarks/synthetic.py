@@ -0,0 +1,29 @@
+"""Write a synthetic shot log CSV of any size.
+
+Usage::
+
+    python -m benchmarks.synthetic 1e8 --output shot_logs_1e8.csv
+
+The generator lives in :mod:`tests.synthetic`, shared with the test suite;
+the benchmarks import it from here.
+"""
+import argparse
+
+from nba_analysis.data import PLAYERS_TEAMS_PATH
+from tests.synthetic import BASE_ROWS, generate_shot_log, synthetic_shot_data, write_shot_log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic shot log CSV")
+    parser.add_argument('rows', type=lambda value: int(float(value)),
+                        help="number of shots, e.g. 1e5 or 100000000")
+    parser.add_argument('--output', default='shot_logs_synthetic.csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--players', default=PLAYERS_TEAMS_PATH)
+    args = parser.parse_args(argv)
+    write_shot_log(args.output, args.rows, args.seed, args.players)
+    print(f"Wrote {args.rows:,} shots to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
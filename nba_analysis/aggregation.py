@@ -0,0 +1,119 @@
+"""Vectorized shooting summaries over the precomputed bin columns.
+
+Every chart in the dashboard is built from the same cube of numbers: made
+shots and attempts per (grouping dimensions x category level) cell.
+:func:`shooting_summary` computes all cells in one pass over the frame by
+turning the grouping columns and the category levels into a single integer
+key and counting it with ``np.bincount``.
+"""
+import numpy as np
+import pandas as pd
+
+from .features import CATEGORIES
+
+
+def encode(values, uniques=None):
+    """Integer codes for ``values`` (-1 for missing) and the values they index.
+
+    If ``uniques`` is given, codes refer to its positions and values not in it
+    are treated as missing; otherwise the sorted observed values are used.
+    """
+    if uniques is None:
+        codes, uniques = pd.factorize(values, sort=True)
+        return codes, pd.Index(uniques)
+    uniques = pd.Index(uniques)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Match the (few) categories instead of every row
+        mapping = np.append(uniques.get_indexer(values.cat.categories), -1)
+        return mapping[values.cat.codes.to_numpy()], uniques
+    return uniques.get_indexer(values), uniques
+
+
+def shooting_summary(shot_data, by=(), categories=CATEGORIES, keys=None):
+    """Made shots, attempts and FG% for every ``by`` x category level cell.
+
+    ``by`` lists the grouping columns (e.g. ``player_name``, ``team_name``,
+    ``Catch and Shoot``) and ``categories`` the bin columns whose levels are
+    stacked into a single ``Category`` column. ``keys`` optionally maps a
+    grouping column to the values to report, in order; other columns report
+    their sorted observed values. The result holds every combination,
+    including cells without shots (0 attempts, 0% shooting), ordered by the
+    grouping values first and the category levels last.
+    """
+    by = list(by)
+    keys = keys or {}
+    n_rows = len(shot_data)
+
+    # Mixed-radix key over the grouping columns; rows with a missing or
+    # unrequested value in any of them are dropped
+    group_key = np.zeros(n_rows, dtype=np.int64)
+    valid = np.ones(n_rows, dtype=bool)
+    group_values = []
+    for column in by:
+        codes, uniques = encode(shot_data[column], keys.get(column))
+        group_key = group_key * len(uniques) + np.maximum(codes, 0)
+        valid &= codes >= 0
+        group_values.append(uniques)
+    n_groups = 1
+    for uniques in group_values:
+        n_groups *= len(uniques)
+
+    levels = []
+    offsets = []
+    for category in categories:
+        offsets.append(len(levels))
+        levels.extend(shot_data[category].cat.categories)
+    n_cells = n_groups * len(levels)
+
+    fgm = shot_data['FGM'].to_numpy()
+    shots = np.zeros(n_cells, dtype=np.int64)
+    made = np.zeros(n_cells, dtype=np.int64)
+    for category, offset in zip(categories, offsets):
+        codes = shot_data[category].cat.codes.to_numpy()
+        keep = valid & (codes >= 0)
+        cell = group_key[keep] * len(levels) + offset + codes[keep]
+        shots += np.bincount(cell, minlength=n_cells)
+        made += np.bincount(cell, weights=fgm[keep], minlength=n_cells).astype(np.int64)
+
+    return summary_frame(by, group_values + [levels], made, shots)
+
+
+def summary_frame(by, values, made, shots):
+    """Assemble a summary from flat per-cell counts.
+
+    ``values`` holds the values of each ``by`` column followed by the
+    category labels; cells enumerate their cartesian product with the last
+    one varying fastest, the layout of ``made`` and ``shots``.
+    """
+    columns = {}
+    sizes = [len(column_values) for column_values in values]
+    for axis, (name, column_values) in enumerate(zip(list(by) + ['Category'], values)):
+        inner = int(np.prod(sizes[axis + 1:]))
+        outer = int(np.prod(sizes[:axis]))
+        columns[name] = np.tile(np.repeat(np.array(list(column_values), dtype=object), inner), outer)
+    columns['FGM'] = made
+    columns['Shots'] = shots
+    columns['Shooting Percentage'] = np.divide(made * 100.0, shots, out=np.zeros(len(shots)),
+                                               where=shots > 0)
+    return pd.DataFrame(columns)
+
+
+def with_display_names(summary, players):
+    """Turn a ``player_name`` summary into one keyed by display name.
+
+    ``player_name`` holds lower-case names; the display names passed in
+    ``players`` (e.g. ``'LeBron James'``) are reported in a leading
+    ``Player`` column, and ``Shots`` is renamed to ``Shot Count``.
+    """
+    names = dict(zip([player.lower() for player in players], players))
+    columns = {'Player': [names.get(name) for name in summary['player_name']]}
+    for column in summary.columns.drop('player_name'):
+        columns['Shot Count' if column == 'Shots' else column] = summary[column].to_numpy()
+    return pd.DataFrame(columns)
+
+
+def player_summary(shot_data, players, categories=CATEGORIES):
+    """:func:`shooting_summary` per player, for display names like ``'LeBron James'``."""
+    summary = shooting_summary(shot_data, by=['player_name'], categories=categories,
+                               keys={'player_name': [player.lower() for player in players]})
+    return with_display_names(summary, players)
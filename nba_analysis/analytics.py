@@ -0,0 +1,150 @@
+"""Summary tables behind each dashboard page, independent of Streamlit.
+
+Every function takes a :class:`~nba_analysis.cube.ShotCube` and the common
+filters (as returned by :func:`common_filters`) and returns a DataFrame, so
+the same tables can be produced from batch jobs and benchmarks. Neither
+streamlit nor plotly is imported here.
+"""
+import numpy as np
+import pandas as pd
+
+from . import bootstrap
+from .features import CATEGORIES
+from .options import (FAMOUS_PLAYERS, LOCATION_FILTERS, MARGIN_FILTERS, QUARTER_FILTERS, SHOOT_TYPE_FILTERS,
+                      common_filters)
+
+
+CATCH_AND_SHOOT_CATEGORIES = ['Distance', 'Time Left', 'Defender Distance']
+CATCH_AND_SHOOT_TYPES = {True: 'Catch and Shoot', False: 'After Dribble Shot'}
+
+
+def shot_clock_summary(shot_cube, **filters):
+    """Shots and shooting percentage per shot clock interval (Page 1)."""
+    return shot_cube.summary(categories=['SHOT_CLOCK_CATEGORY'], **filters)
+
+
+def catch_and_shoot_summary(shot_cube, **filters):
+    """Shooting percentage of catch-and-shoot vs after-dribble shots (Page 1).
+
+    Catch-and-shoot rows come first; the 'Type' column holds the chart label.
+    """
+    summary = shot_cube.summary(by=['Catch and Shoot'], categories=CATCH_AND_SHOOT_CATEGORIES,
+                                keys={'Catch and Shoot': list(CATCH_AND_SHOOT_TYPES)}, **filters)
+    summary['Type'] = summary['Catch and Shoot'].map(CATCH_AND_SHOOT_TYPES)
+    return summary
+
+
+def _with_intervals(summary, shots_column='Shots'):
+    """Add bootstrap ``CI Low``/``CI High`` bounds of each row's shooting percentage."""
+    low, high = bootstrap.percentage_intervals(summary['FGM'].to_numpy(), summary[shots_column].to_numpy())
+    return summary.assign(**{'CI Low': low, 'CI High': high})
+
+
+def player_comparison(shot_cube, players, categories=CATEGORIES, intervals=False, **filters):
+    """Per-player shot count and shooting percentage for every level (Page 2).
+
+    With ``intervals``, ``CI Low`` and ``CI High`` hold the bounds of a
+    bootstrap confidence interval of the shooting percentage.
+    """
+    summary = shot_cube.player_summary(players, categories=categories, **filters)
+    return _with_intervals(summary, 'Shot Count') if intervals else summary
+
+
+def player_comparisons(shot_cube, comparisons, categories=CATEGORIES, **filters):
+    """:func:`player_comparison` of every player list in ``comparisons``, as a list.
+
+    All players are summarised by one cube query and each comparison takes
+    its players' rows, in its own order.
+    """
+    players = list(dict.fromkeys(player for comparison in comparisons for player in comparison))
+    summary = player_comparison(shot_cube, players, categories, **filters)
+    player_column = summary['Player'].to_numpy()
+    rows = {player: np.flatnonzero(player_column == player) for player in players}
+    return [summary.take(np.concatenate([rows[player] for player in comparison])).reset_index(drop=True)
+            for comparison in comparisons]
+
+
+def _ranked_levels(summary):
+    """Levels with shots of a one-team summary, by shooting percentage, with their counts."""
+    summary = summary[summary['Shots'] > 0].sort_values('Shooting Percentage', kind='stable')
+    return summary[['Category', 'FGM', 'Shots', 'Shooting Percentage']].reset_index(drop=True)
+
+
+def _sorted_levels(summary):
+    """Levels with shots of a one-team summary, by shooting percentage."""
+    return _ranked_levels(summary)[['Category', 'Shooting Percentage']]
+
+
+def team_levels(shot_cube, team, **filters):
+    """Shooting percentage of one team per level it has shots in (Page 3).
+
+    Sorted by shooting percentage, lowest first.
+    """
+    return _sorted_levels(shot_cube.summary(by=['team_name'], keys={'team_name': [team]}, **filters))
+
+
+def _ranked_levels_by_team(shot_cube, teams, **filters):
+    """:func:`_ranked_levels` of every team in ``teams`` from one cube query, as a dict."""
+    teams = list(dict.fromkeys(teams))
+    summary = shot_cube.summary(by=['team_name'], keys={'team_name': teams}, **filters)
+    team_column = summary['team_name'].to_numpy()
+    return {team: _ranked_levels(summary[team_column == team]) for team in teams}
+
+
+def team_levels_by_team(shot_cube, teams, **filters):
+    """:func:`team_levels` of every team in ``teams`` from one cube query, as a dict."""
+    return {team: levels[['Category', 'Shooting Percentage']]
+            for team, levels in _ranked_levels_by_team(shot_cube, teams, **filters).items()}
+
+
+def _difference(team1, team2, levels1, levels2, intervals):
+    """The :func:`team_difference` table of two teams' :func:`_ranked_levels`."""
+    paired = levels1.merge(levels2, on='Category', suffixes=('', ' 2'))
+    levels1 = paired[levels1.columns]
+    levels2 = paired[['Category'] + [f'{column} 2' for column in levels2.columns[1:]]]
+    levels2.columns = levels1.columns
+    pct1 = levels1['Shooting Percentage'].to_numpy()
+    pct2 = levels2['Shooting Percentage'].to_numpy()
+    difference = pd.DataFrame({
+        'Category': levels1['Category'].to_numpy(),
+        'Difference': abs(pct1 - pct2),
+        'Team': [team1 if better else team2 for better in pct1 > pct2],
+    })
+    if intervals:
+        low, high = bootstrap.difference_intervals(levels1['FGM'].to_numpy(), levels1['Shots'].to_numpy(),
+                                                   levels2['FGM'].to_numpy(), levels2['Shots'].to_numpy())
+        # Bounds of team1 - team2, turned into bounds of the named team's lead
+        difference['CI Low'] = np.where(pct1 > pct2, low, -high)
+        difference['CI High'] = np.where(pct1 > pct2, high, -low)
+    return difference.sort_values(by='Difference').reset_index(drop=True)
+
+
+def team_difference(shot_cube, team1, team2, intervals=False, **filters):
+    """Absolute shooting percentage difference between two teams (Page 3).
+
+    Each level is paired with the same level of the other team; levels only
+    one team has shots in are left out. 'Team' names the team with the
+    higher percentage. With ``intervals``, ``CI Low`` and ``CI High`` bound
+    the named team's lead from resampling both teams' shots; a lower bound
+    below zero means the other team may be the better one. The differences
+    are the same either way.
+    """
+    levels = _ranked_levels_by_team(shot_cube, [team1, team2], **filters)
+    return _difference(team1, team2, levels[team1], levels[team2], intervals)
+
+
+def team_differences(shot_cube, pairs, intervals=False, **filters):
+    """:func:`team_difference` of every ``(team1, team2)`` in ``pairs``, as a list.
+
+    All teams are summarised by one cube query, and every pair is then
+    taken from their levels.
+    """
+    levels = _ranked_levels_by_team(shot_cube, [team for pair in pairs for team in pair], **filters)
+    return [_difference(team1, team2, levels[team1], levels[team2], intervals) for team1, team2 in pairs]
+
+
+def team_comparison(shot_cube, teams, **filters):
+    """Shooting percentage of several teams per level they have shots in (Page 3)."""
+    summary = shot_cube.summary(by=['team_name'], keys={'team_name': list(teams)}, **filters)
+    summary = summary[summary['Shots'] > 0]
+    return summary.rename(columns={'team_name': 'Team'})[['Team', 'Category', 'Shooting Percentage']]
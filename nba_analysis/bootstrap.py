@@ -0,0 +1,72 @@
+"""Bootstrap confidence intervals for shooting percentages.
+
+A cell of a summary (a player or team and a category level) holds ``n``
+shots of which ``k`` were made. Resampling its shots with replacement and
+counting the made ones draws from Binomial(n, k/n), so every resample of
+every cell is one binomial draw: the resamples are drawn as a
+``cells x resamples`` array in batches, without per-shot data or Python
+loops over cells, and work straight from the cube's counts.
+
+Draws come from a seeded generator, so intervals are reproducible. Batches
+stop once the time budget is spent (after the first), which only cuts the
+number of resamples on a slow or busy machine.
+"""
+import time
+
+import numpy as np
+
+
+RESAMPLES = 2000
+CONFIDENCE = 0.95
+SEED = 0
+# Seconds after which no further batch of resamples is started
+TIME_BUDGET = 0.25
+
+# Resamples drawn per batch
+_BATCH = 500
+
+
+def resampled_percentages(made, shots, resamples=RESAMPLES, seed=SEED, time_budget=TIME_BUDGET):
+    """Shooting percentage of each cell in each resample, ``cells x resamples``.
+
+    Fewer columns than ``resamples`` are returned if the time budget ran out.
+    Cells without shots are NaN.
+    """
+    shots = np.asarray(shots, dtype=np.int64)[:, None]
+    rate = np.divide(np.asarray(made, dtype=np.float64)[:, None], shots,
+                     out=np.zeros(shots.shape), where=shots > 0)
+    rng = np.random.default_rng(seed)
+    deadline = time.perf_counter() + time_budget
+    batches = []
+    drawn = 0
+    while drawn < resamples and (not batches or time.perf_counter() < deadline):
+        size = min(_BATCH, resamples - drawn)
+        batches.append(rng.binomial(shots, rate, size=(len(shots), size)))
+        drawn += size
+    with np.errstate(invalid='ignore'):
+        return np.concatenate(batches, axis=1) * 100.0 / shots
+
+
+def _interval(draws, confidence):
+    # Rows of cells without shots are all NaN and give NaN bounds
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(draws, [tail, 1 - tail], axis=1)
+    return low, high
+
+
+def percentage_intervals(made, shots, confidence=CONFIDENCE, **options):
+    """Lower and upper bounds of each cell's shooting percentage, NaN without shots.
+
+    ``options`` are those of :func:`resampled_percentages`.
+    """
+    return _interval(resampled_percentages(made, shots, **options), confidence)
+
+
+def difference_intervals(made1, shots1, made2, shots2, confidence=CONFIDENCE, **options):
+    """Bounds of the first minus the second shooting percentage of paired cells.
+
+    Both sides are resampled independently, in one batch.
+    """
+    draws = resampled_percentages(np.concatenate([made1, made2]), np.concatenate([shots1, shots2]), **options)
+    first, second = np.split(draws, [len(made1)])
+    return _interval(first - second, confidence)
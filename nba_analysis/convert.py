@@ -0,0 +1,56 @@
+"""Convert the shot log CSVs into a pre-merged columnar snapshot.
+
+Usage::
+
+    python -m nba_analysis.convert [--shots shot_logs.csv]
+        [--players players_teams.csv] [--output shot_logs.feather]
+        [--cube shot_cube.npz]
+    python -m nba_analysis.convert --stream --cube shot_cube.npz [--chunk-rows 500000]
+
+With ``--stream`` only the cube is written, counting the log chunk by chunk
+so that logs larger than memory can be converted.
+"""
+import argparse
+import sys
+import time
+
+from . import data, snapshot
+from .cube import ShotCube, stream_shot_cube
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--shots', default=data.SHOT_LOG_PATH, help="shot log CSV")
+    parser.add_argument('--players', default=data.PLAYERS_TEAMS_PATH, help="player/team lookup CSV")
+    parser.add_argument('--output', default=snapshot.SNAPSHOT_PATH, help="snapshot file to write")
+    parser.add_argument('--cube', help="also write the pre-aggregated shot cube to this file")
+    parser.add_argument('--stream', action='store_true',
+                        help="only write the cube, reading the log in chunks")
+    parser.add_argument('--chunk-rows', type=int, default=data.CHUNK_ROWS,
+                        help="shots per chunk with --stream")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        if not args.cube:
+            parser.error("--stream requires --cube")
+        start = time.perf_counter()
+        stream_shot_cube(args.shots, args.players, args.chunk_rows).save(args.cube)
+        print(f"Wrote shot cube to {args.cube} in {time.perf_counter() - start:.2f}s")
+        return 0
+
+    if not snapshot.available():
+        parser.error("pyarrow is required to write snapshots")
+
+    start = time.perf_counter()
+    shot_data = data.build_shot_data(args.shots, args.players)
+    snapshot.write_snapshot(shot_data, args.output)
+    print(f"Wrote {len(shot_data):,} shots to {args.output} "
+          f"in {time.perf_counter() - start:.2f}s")
+    if args.cube:
+        ShotCube.from_frame(shot_data).save(args.cube)
+        print(f"Wrote shot cube to {args.cube}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""Pre-aggregated cube of shot counts over the dashboard's filter dimensions.
+
+The sidebar filters (location, quarter, shot type, final margin) and the
+chart dimensions (player, catch-and-shoot, category level) only take a few
+values each, so every chart can be answered from a dense array of made shots
+and attempts per combination instead of scanning the raw shots:
+
+    location x period x points type x close game x player x catch-and-shoot x level
+
+Each filter axis has one extra trailing slot holding the total over that
+axis (the sidebar's "All"), so answering a filter combination is a plain
+index into the array rather than a sum. Teams are not an axis of their own:
+each player belongs to one team, so team totals are sums over that team's
+players. The cube is built in one pass over the frame; its size depends on
+the number of players only (about 16 MB for a season), not on the number of
+shots.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import data, snapshot
+from .aggregation import encode, summary_frame, with_display_names
+from .features import BINS, CATEGORIES
+
+
+# Games decided by at most this many points count as close
+CLOSE_GAME_MARGIN = 5
+
+_FILTER_AXES = ['location', 'period', 'pts_type', 'close_game']
+
+
+def _with_totals(counts):
+    """Append the total over each filter axis as that axis' last slot."""
+    for axis in range(len(_FILTER_AXES)):
+        counts = np.concatenate([counts, counts.sum(axis=axis, keepdims=True)], axis=axis)
+    return counts.astype(np.int32)
+
+
+def _observed_axes(shot_data):
+    """Sorted players, locations, periods and points types of ``shot_data``."""
+    return [sorted(shot_data['player_name'].cat.categories),
+            list(encode(shot_data['LOCATION'])[1]),
+            list(encode(shot_data['PERIOD'])[1]),
+            list(encode(shot_data['PTS_TYPE'])[1])]
+
+
+def _merge_axes(axes, other):
+    """Sorted union of two sets of cube axes."""
+    return [sorted(set(values) | set(other_values)) for values, other_values in zip(axes, other)]
+
+
+def _player_teams(shot_data):
+    """Player -> team name (NaN if not in players_teams.csv) for ``shot_data``."""
+    teams = shot_data[['player_name', 'team_name']].drop_duplicates('player_name')
+    return dict(zip(teams['player_name'].astype(object), teams['team_name'].astype(object)))
+
+
+def _cell_shape(axes):
+    players, locations, periods, pts_types = axes
+    n_levels = sum(len(labels) for _, _, labels, _ in BINS.values())
+    return [len(locations), len(periods), len(pts_types), 2, len(players), 2, n_levels]
+
+
+def _count_cells(shot_data, axes):
+    """Made shots and attempts of ``shot_data`` per cube cell, without totals.
+
+    ``axes`` fixes the players, locations, periods and points types laid out
+    along the cube; shots with other values are not counted.
+    """
+    players, locations, periods, pts_types = axes
+    shape = _cell_shape(axes)
+    codes = [encode(shot_data['LOCATION'], locations)[0],
+             encode(shot_data['PERIOD'], periods)[0],
+             encode(shot_data['PTS_TYPE'], pts_types)[0],
+             (shot_data['FINAL_MARGIN'].abs() > CLOSE_GAME_MARGIN).to_numpy().astype(np.int64),
+             encode(shot_data['player_name'], players)[0],
+             shot_data['Catch and Shoot'].to_numpy().astype(np.int64)]
+    base = np.zeros(len(shot_data), dtype=np.int64)
+    valid = np.ones(len(shot_data), dtype=bool)
+    for axis_codes, size in zip(codes, shape):
+        base = base * size + np.maximum(axis_codes, 0)
+        valid &= axis_codes >= 0
+
+    n_levels = shape[-1]
+    n_cells = int(np.prod(shape))
+    made = np.zeros(n_cells, dtype=np.int64)
+    shots = np.zeros(n_cells, dtype=np.int64)
+    fgm = shot_data['FGM'].to_numpy()
+    offset = 0
+    for category in BINS:
+        level_codes = shot_data[category].cat.codes.to_numpy()
+        keep = valid & (level_codes >= 0)
+        cell = base[keep] * n_levels + offset + level_codes[keep]
+        shots += np.bincount(cell, minlength=n_cells)
+        made += np.bincount(cell, weights=fgm[keep], minlength=n_cells).astype(np.int64)
+        offset += len(BINS[category][2])
+    return made.reshape(shape), shots.reshape(shape)
+
+
+def _reindex_cells(counts, axes, new_axes):
+    """Lay ``counts`` over ``axes`` out along the (larger) ``new_axes``."""
+    players, locations, periods, pts_types = axes
+    new_players, new_locations, new_periods, new_pts_types = new_axes
+    positions = [pd.Index(new_values).get_indexer(values) for values, new_values in
+                 [(locations, new_locations), (periods, new_periods), (pts_types, new_pts_types)]]
+    shape = _cell_shape(new_axes)
+    index = np.ix_(*positions, np.arange(2), pd.Index(new_players).get_indexer(players),
+                   np.arange(2), np.arange(shape[-1]))
+    reindexed = np.zeros(shape, dtype=counts.dtype)
+    reindexed[index] = counts
+    return reindexed
+
+
+class ShotCube:
+    """Dense (made, attempts) counts; see the module docstring for the axes."""
+
+    def __init__(self, made, shots, players, player_teams, locations, periods, pts_types, levels):
+        self.made = made
+        self.shots = shots
+        self.players = pd.Index(players)
+        # Team of each player, NaN for players missing from players_teams.csv
+        self.player_teams = pd.Series(player_teams, dtype=object)
+        # Teams with shots, alphabetically, as offered by the Page 3 selectors
+        self.teams = sorted(self.player_teams.dropna().unique())
+        self.axes = {
+            'location': pd.Index(locations),
+            'period': pd.Index(periods),
+            'pts_type': pd.Index(pts_types),
+            'close_game': pd.Index([True, False]),
+        }
+        # (category, label) per position of the last axis
+        self.levels = list(levels)
+
+        # Plain Python lookups keep per-query overhead in the microseconds
+        self._player_values = self.players.to_numpy(dtype=object)
+        self._team_values = self.player_teams.to_numpy(dtype=object)
+        self._positions = {name: {value: position for position, value in enumerate(values)}
+                           for name, values in self.axes.items()}
+        self._level_positions = {}
+        for position, (category, _) in enumerate(self.levels):
+            self._level_positions.setdefault(category, []).append(position)
+
+    @classmethod
+    def from_frame(cls, shot_data):
+        """Count every shot of ``shot_data`` into a new cube."""
+        axes = _observed_axes(shot_data)
+        made, shots = _count_cells(shot_data, axes)
+        return cls._from_counts(made, shots, axes, _player_teams(shot_data))
+
+    @classmethod
+    def from_chunks(cls, chunks):
+        """Count shot frames arriving one chunk at a time into a new cube.
+
+        ``chunks`` yields frames shaped like the loaded shot frame, e.g. from
+        :func:`nba_analysis.data.iter_shot_data`. Only the running counts are
+        kept between chunks, so memory is bounded by the chunk size and the
+        cube, not by the log. The result equals :meth:`from_frame` on all
+        chunks concatenated.
+        """
+        axes = made = shots = None
+        teams = {}
+        for chunk in chunks:
+            chunk_axes = _observed_axes(chunk)
+            if axes is None:
+                axes = chunk_axes
+                made = np.zeros(_cell_shape(axes), dtype=np.int64)
+                shots = np.zeros_like(made)
+            else:
+                merged = _merge_axes(axes, chunk_axes)
+                if merged != axes:
+                    made = _reindex_cells(made, axes, merged)
+                    shots = _reindex_cells(shots, axes, merged)
+                    axes = merged
+            chunk_made, chunk_shots = _count_cells(chunk, axes)
+            made += chunk_made
+            shots += chunk_shots
+            teams.update(_player_teams(chunk))
+        if axes is None:
+            raise ValueError("no shots to count")
+        return cls._from_counts(made, shots, axes, teams)
+
+    def updated(self, added=None, removed=None):
+        """Return a new cube with the shots of ``added`` counted in and those of
+        ``removed`` counted out.
+
+        Both are frames shaped like the loaded shot frame; ``removed`` must
+        hold shots already counted. The cost depends on the size of the
+        frames and of the cube, not on the number of shots counted so far.
+        This cube is left unchanged.
+        """
+        axes = [list(self.players), list(self.axes['location']), list(self.axes['period']),
+                list(self.axes['pts_type'])]
+        # Drop the total slots, update the raw counts and total them again
+        made = self.made[:-1, :-1, :-1, :-1].astype(np.int64)
+        shots = self.shots[:-1, :-1, :-1, :-1].astype(np.int64)
+        teams = dict(zip(self._player_values, self._team_values))
+        if added is not None and len(added):
+            merged = _merge_axes(axes, _observed_axes(added))
+            if merged != axes:
+                made = _reindex_cells(made, axes, merged)
+                shots = _reindex_cells(shots, axes, merged)
+                axes = merged
+            added_made, added_shots = _count_cells(added, axes)
+            made += added_made
+            shots += added_shots
+            teams.update(_player_teams(added))
+        if removed is not None and len(removed):
+            removed_made, removed_shots = _count_cells(removed, axes)
+            made -= removed_made
+            shots -= removed_shots
+        return self._from_counts(made, shots, axes, teams)
+
+    @classmethod
+    def _from_counts(cls, made, shots, axes, teams):
+        players, locations, periods, pts_types = axes
+        player_teams = pd.Series(teams, dtype=object).reindex(players).to_numpy()
+        levels = [(category, label) for category in BINS for label in BINS[category][2]]
+        return cls(_with_totals(made), _with_totals(shots), players, player_teams,
+                   locations, periods, pts_types, levels)
+
+    def _filtered(self, counts, filters):
+        """Slice the player x catch-and-shoot x level counts for ``filters``."""
+        index = []
+        for name in _FILTER_AXES:
+            value = filters.get(name)
+            # The last slot of every filter axis is the total over the axis
+            position = -1 if value is None else self._positions[name].get(value)
+            if position is None:
+                return np.zeros(counts.shape[4:], dtype=np.int64)
+            index.append(position)
+        return counts[tuple(index)].astype(np.int64)
+
+    def _entity_codes(self, dim, values, active):
+        """Per-player codes into ``values`` (or the active players/teams)."""
+        per_player = self._player_values if dim == 'player_name' else self._team_values
+        if values is None:
+            values = sorted({value for value, keep in zip(per_player, active)
+                             if keep and isinstance(value, str)})
+        lookup = {value: position for position, value in enumerate(values)}
+        codes = np.fromiter((lookup.get(value, -1) for value in per_player),
+                            dtype=np.int64, count=len(per_player))
+        return codes, list(values)
+
+    def summary(self, by=(), categories=CATEGORIES, keys=None, location=None, period=None,
+                pts_type=None, close_game=None):
+        """Answer :func:`~nba_analysis.aggregation.shooting_summary` from the cube.
+
+        ``by`` may contain ``player_name``, ``team_name`` and ``Catch and
+        Shoot``. The filters restrict the shots counted: ``location`` is
+        ``'H'`` or ``'A'``, ``period`` and ``pts_type`` are integers and
+        ``close_game`` selects games decided by at most 5 points (True) or
+        more (False); None means no restriction. Without ``keys``, players
+        and teams are reported if they have any shots left after filtering.
+        """
+        by = list(by)
+        keys = keys or {}
+        filters = {'location': location, 'period': period, 'pts_type': pts_type,
+                   'close_game': close_game}
+        level_positions = [position for category in categories
+                           for position in self._level_positions[category]]
+        labels = [self.levels[position][1] for position in level_positions]
+
+        # player x catch-and-shoot x level
+        made = self._filtered(self.made, filters)[..., level_positions]
+        shots = self._filtered(self.shots, filters)[..., level_positions]
+
+        entity_dims = [dim for dim in by if dim in ('player_name', 'team_name')]
+        group_values = []
+        if entity_dims:
+            active = shots.sum(axis=(1, 2)) > 0
+            group_codes = []
+            valid = np.ones(len(self.players), dtype=bool)
+            for dim in entity_dims:
+                codes, values = self._entity_codes(dim, keys.get(dim), active)
+                group_codes.append(codes)
+                group_values.append(values)
+                valid &= codes >= 0
+            group_shape = [len(values) for values in group_values]
+            flat_codes = np.zeros(len(self.players), dtype=np.int64)
+            for codes, size in zip(group_codes, group_shape):
+                flat_codes = flat_codes * size + codes
+            # Sum the players' (catch-and-shoot x level) rows into their groups
+            n_groups = int(np.prod(group_shape))
+            width = made[0].size
+            cells = (flat_codes[valid, None] * width + np.arange(width)).ravel()
+            out_shape = group_shape + list(made.shape[1:])
+            grouped_made = np.bincount(cells, weights=made[valid].ravel(),
+                                       minlength=n_groups * width).astype(np.int64).reshape(out_shape)
+            grouped_shots = np.bincount(cells, weights=shots[valid].ravel(),
+                                        minlength=n_groups * width).astype(np.int64).reshape(out_shape)
+        else:
+            grouped_made = made.sum(axis=0)
+            grouped_shots = shots.sum(axis=0)
+
+        catch_axis = len(entity_dims)
+        if 'Catch and Shoot' in by:
+            catch_values = list(keys.get('Catch and Shoot', [False, True]))
+            order = [int(bool(value)) for value in catch_values]
+            grouped_made = grouped_made.take(order, axis=catch_axis)
+            grouped_shots = grouped_shots.take(order, axis=catch_axis)
+            dims = entity_dims + ['Catch and Shoot']
+            group_values.append(catch_values)
+        else:
+            grouped_made = grouped_made.sum(axis=catch_axis)
+            grouped_shots = grouped_shots.sum(axis=catch_axis)
+            dims = entity_dims
+
+        # Reorder the grouping axes as requested in ``by``
+        permutation = [dims.index(dim) for dim in by] + [len(dims)]
+        grouped_made = grouped_made.transpose(permutation).ravel()
+        grouped_shots = grouped_shots.transpose(permutation).ravel()
+        group_values = [group_values[dims.index(dim)] for dim in by] + [labels]
+
+        return summary_frame(by, group_values, grouped_made, grouped_shots)
+
+    def player_summary(self, players, categories=CATEGORIES, **filters):
+        """Cube counterpart of :func:`~nba_analysis.aggregation.player_summary`."""
+        summary = self.summary(by=['player_name'], categories=categories,
+                               keys={'player_name': [player.lower() for player in players]},
+                               **filters)
+        return with_display_names(summary, players)
+
+    def _arrays(self):
+        """Every array needed to rebuild the cube, by name; strings as ``str`` arrays."""
+        return {
+            'made': self.made,
+            'shots': self.shots,
+            'players': self.players.to_numpy(dtype=str),
+            'player_teams': self.player_teams.fillna('').to_numpy(dtype=str),
+            'locations': self.axes['location'].to_numpy(dtype=str),
+            'periods': self.axes['period'].to_numpy(),
+            'pts_types': self.axes['pts_type'].to_numpy(),
+            'levels': np.array(self.levels, dtype=str),
+        }
+
+    @classmethod
+    def _from_arrays(cls, arrays):
+        teams = arrays['player_teams'].astype(object)
+        teams[teams == ''] = np.nan
+        return cls(arrays['made'], arrays['shots'], arrays['players'], teams,
+                   arrays['locations'], arrays['periods'], arrays['pts_types'],
+                   [tuple(level) for level in arrays['levels']])
+
+    def save(self, path):
+        """Write the cube to ``path`` as an uncompressed ``.npz`` archive."""
+        with open(path, 'wb') as handle:
+            np.savez(handle, **self._arrays())
+
+    @classmethod
+    def load(cls, path):
+        """Read a cube written by :meth:`save`."""
+        with np.load(path, allow_pickle=False) as archive:
+            return cls._from_arrays(archive)
+
+    def save_arrays(self, directory):
+        """Write the cube to ``directory`` as one ``.npy`` file per array."""
+        os.makedirs(directory, exist_ok=True)
+        for name, values in self._arrays().items():
+            np.save(os.path.join(directory, f'{name}.npy'), values)
+
+    @classmethod
+    def load_arrays(cls, directory, mmap_mode='r'):
+        """Read a cube written by :meth:`save_arrays`.
+
+        The counts are memory-mapped read-only by default, so processes
+        loading the same files share their pages.
+        """
+        arrays = {}
+        for name in ('made', 'shots', 'players', 'player_teams', 'locations', 'periods', 'pts_types', 'levels'):
+            arrays[name] = np.load(os.path.join(directory, f'{name}.npy'),
+                                   mmap_mode=mmap_mode if name in ('made', 'shots') else None)
+        return cls._from_arrays(arrays)
+
+
+def load_shot_cube(shot_path=data.SHOT_LOG_PATH, players_path=data.PLAYERS_TEAMS_PATH,
+                   snapshot_path=snapshot.SNAPSHOT_PATH, cube_path=None):
+    """Return the cube for the shared shot log, built once per loaded log.
+
+    With ``cube_path``, a cube saved there that is newer than the source
+    files is reused instead of being rebuilt, and a rebuilt cube is saved for
+    the next process. Ingested games are counted into the cube of the log
+    they extend (see :func:`~nba_analysis.data.load_shot_log`).
+    """
+    def build(shot_log):
+        sources = ([shot_path, players_path] + ([snapshot_path] if snapshot_path else [])
+                   + data.ingested_paths(shot_path))
+        if cube_path and snapshot.is_newer(cube_path, *sources):
+            return ShotCube.load(cube_path)
+        shot_cube = ShotCube.from_frame(shot_log.frame())
+        if cube_path:
+            try:
+                shot_cube.save(cube_path)
+            except OSError:
+                pass  # read-only checkout: rebuild in the next process
+        return shot_cube
+
+    shot_log = data.load_shot_log(shot_path, players_path, snapshot_path)
+    return data.derived(shot_log, 'cube', build, update=ShotCube.updated)
+
+
+def stream_shot_cube(shot_path=data.SHOT_LOG_PATH, players_path=data.PLAYERS_TEAMS_PATH,
+                     chunk_rows=data.CHUNK_ROWS):
+    """Build the cube from a shot log read in chunks, for logs larger than memory.
+
+    Unlike :func:`load_shot_cube` nothing is cached and the shot frame is
+    never held in full.
+    """
+    return ShotCube.from_chunks(data.iter_shot_data(shot_path, players_path, chunk_rows))
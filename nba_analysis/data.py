@@ -0,0 +1,394 @@
+"""Loading of the shot log and the player/team lookup.
+
+The merged shot frame is parsed once per process and shared by every
+Streamlit session and rerun. Entries are keyed on the resolved file paths and
+their modification times, so replacing a CSV or snapshot on disk triggers a
+fresh load on the next call.
+
+Games added by :mod:`nba_analysis.ingest` are written as partition CSVs in
+:func:`ingested_directory` next to the log, which is never rewritten. A
+:class:`ShotLog` holds the log together with its partitions; when only new
+partitions appeared since the last load, just those are read and the
+structures derived from the log are carried over by counting their shots in
+(see :func:`derived`).
+"""
+import os
+import threading
+import weakref
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from . import features, snapshot
+
+
+SHOT_LOG_PATH = "shot_logs.csv"
+PLAYERS_TEAMS_PATH = "players_teams.csv"
+
+# Explicit dtypes keep pandas from inferring object/int64/float64 columns for
+# fields that only take a handful of values.
+SHOT_LOG_DTYPES = {
+    'player_name': 'category',
+    'LOCATION': 'category',
+    'SHOT_RESULT': 'category',
+    'PERIOD': 'int8',
+    'PTS_TYPE': 'int8',
+    'FGM': 'int8',
+    'SHOT_DIST': 'float32',
+    'CLOSE_DEF_DIST': 'float32',
+}
+
+# Shots per chunk when the log is streamed instead of loaded at once
+CHUNK_ROWS = 500_000
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'currsize'])
+
+_cache = {}
+_cache_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+# (id(frame), name) -> (weak reference to the frame, derived value)
+_derived = {}
+_derived_lock = threading.RLock()
+
+# derived name -> update(value, added, removed) carrying a value over to an extended log
+_updaters = {}
+
+
+def _file_key(path):
+    path = os.path.abspath(path)
+    return path, os.stat(path).st_mtime_ns
+
+
+def read_shot_log(path=SHOT_LOG_PATH):
+    """Read the raw shot log with compact dtypes."""
+    shot_data = pd.read_csv(path, encoding="ISO-8859-1", dtype=SHOT_LOG_DTYPES)
+    shot_data['TIME_LEFT'] = shot_data['SHOT_CLOCK']
+    return shot_data
+
+
+def iter_shot_log(path=SHOT_LOG_PATH, chunk_rows=CHUNK_ROWS):
+    """Yield the raw shot log in frames of at most ``chunk_rows`` shots.
+
+    Categorical columns only hold the values seen in their own chunk.
+    """
+    with pd.read_csv(path, encoding="ISO-8859-1", dtype=SHOT_LOG_DTYPES,
+                     chunksize=chunk_rows) as reader:
+        for chunk in reader:
+            chunk['TIME_LEFT'] = chunk['SHOT_CLOCK']
+            yield chunk
+
+
+def read_players_teams(path=PLAYERS_TEAMS_PATH):
+    """Read the player -> team lookup table."""
+    return pd.read_csv(path, dtype={'Player': 'string', 'team_name': 'string'})
+
+
+def merge_teams(shot_data, player_df):
+    """Attach ``team_name`` to every shot; players missing from the lookup get NaN."""
+    teams = player_df.set_index('Player')['team_name']
+    team_name = shot_data['player_name'].astype(object).map(teams)
+    shot_data['team_name'] = team_name.astype(object).astype('category')
+    return shot_data
+
+
+def build_shot_data(shot_path=SHOT_LOG_PATH, players_path=PLAYERS_TEAMS_PATH):
+    """Parse both CSV files and return the merged shot frame with its bin columns."""
+    shot_data = merge_teams(read_shot_log(shot_path), read_players_teams(players_path))
+    return features.add_features(shot_data)
+
+
+def iter_shot_data(shot_path=SHOT_LOG_PATH, players_path=PLAYERS_TEAMS_PATH, chunk_rows=CHUNK_ROWS):
+    """Yield the merged shot frame with its bin columns chunk by chunk.
+
+    For logs too large to load at once: each chunk of :func:`iter_shot_log`
+    is joined with the (small) player/team lookup and binned on its own.
+    The ingested partitions follow, one chunk each, without the games a
+    later partition replaced.
+    """
+    player_df = read_players_teams(players_path)
+    partitions = [_read_partition(path, player_df) for path in ingested_paths(shot_path)]
+    # Games of the partitions after each one; a game's shots are those of its last partition
+    replaced = [set()]
+    for partition in reversed(partitions):
+        replaced.insert(0, replaced[0] | set(pd.unique(partition['GAME_ID']).tolist()))
+    for chunk in iter_shot_log(shot_path, chunk_rows):
+        if replaced[0]:
+            chunk = chunk[~chunk['GAME_ID'].isin(replaced[0])]
+        yield features.add_features(merge_teams(chunk, player_df))
+    for partition, later in zip(partitions, replaced[1:]):
+        yield partition[~partition['GAME_ID'].isin(later)] if later else partition
+
+
+def ingested_directory(shot_path=SHOT_LOG_PATH):
+    """Directory of the partitions ingested into the log at ``shot_path``."""
+    return f'{os.path.splitext(shot_path)[0]}.ingested'
+
+
+def ingested_paths(shot_path=SHOT_LOG_PATH):
+    """Paths of the partitions ingested into ``shot_path``, oldest first."""
+    directory = ingested_directory(shot_path)
+    if not os.path.isdir(directory):
+        return []
+    return [os.path.join(directory, name) for name in sorted(os.listdir(directory))
+            if name.endswith('.csv') and not name.startswith('.')]
+
+
+def write_partition(shots, shot_path=SHOT_LOG_PATH):
+    """Write the raw ``shots`` as the next partition of ``shot_path`` and return its path.
+
+    The file is written under a temporary name and then linked to a name no
+    other partition has (a rename that cannot replace an existing file), so
+    readers never see a partial partition, a failed write leaves nothing
+    behind and concurrent ingests never overwrite each other.
+    """
+    directory = ingested_directory(shot_path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f'.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        shots.to_csv(tmp_path, index=False, encoding="ISO-8859-1")
+        paths = ingested_paths(shot_path)
+        number = int(os.path.basename(paths[-1])[:-4]) if paths else 0
+        while True:
+            number += 1
+            path = os.path.join(directory, f'{number:06d}.csv')
+            try:
+                os.link(tmp_path, path)
+            except FileExistsError:
+                continue
+            return path
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _read_partition(path, player_df):
+    return features.add_features(merge_teams(read_shot_log(path), player_df))
+
+
+def concat_shot_data(frames):
+    """Concatenate merged shot frames, keeping categorical columns categorical.
+
+    Categories are those of the first frame followed by any new values of
+    the next ones, so the codes of the first frame's rows do not change.
+    """
+    frames = list(frames)
+    if len(frames) == 1:
+        return frames[0]
+    columns = {}
+    for column in frames[0].columns:
+        parts = [frame[column] for frame in frames]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            categories = parts[0].cat.categories
+            for part in parts[1:]:
+                categories = categories.append(part.cat.categories.difference(categories, sort=False))
+            parts = [part.cat.set_categories(categories) for part in parts]
+        columns[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+class ShotLog:
+    """The merged shot frame of a log and of the games ingested into it.
+
+    ``segments`` holds the frame of the log followed by one frame per
+    partition read since the log was loaded (a fresh load concatenates them
+    all into one). A game's shots are those of the last segment holding it:
+    ``dropped`` maps a segment's position to the rows of the games a later
+    segment replaced. ``keys`` identifies the files the log was read from.
+    """
+
+    def __init__(self, segments, keys, dropped=None):
+        self.segments = list(segments)
+        self.keys = keys
+        self.dropped = dropped or {}
+        self._games = None
+
+    def __len__(self):
+        return (sum(len(segment) for segment in self.segments)
+                - sum(len(rows) for rows in self.dropped.values()))
+
+    def games(self):
+        """Game id -> position of the segment holding its shots."""
+        if self._games is None:
+            games = {}
+            for position, segment in enumerate(self.segments):
+                games.update(dict.fromkeys(pd.unique(segment['GAME_ID']).tolist(), position))
+            self._games = games
+        return self._games
+
+    def _live(self, position):
+        segment = self.segments[position]
+        rows = self.dropped.get(position)
+        if rows is None or not len(rows):
+            return segment
+        keep = np.ones(len(segment), dtype=bool)
+        keep[rows] = False
+        return segment[keep]
+
+    def frame(self, columns=None):
+        """The shots of the log as one frame, or its ``columns`` only.
+
+        A log of one segment is its frame itself; otherwise the segments are
+        concatenated on first use and the frame is kept with the log.
+        """
+        if len(self.segments) == 1:
+            frame = self.segments[0]
+        else:
+            frame = derived(self, 'frame', lambda log: concat_shot_data(
+                [log._live(position) for position in range(len(log.segments))]).reset_index(drop=True))
+        return frame if columns is None else frame[list(columns)]
+
+    def extended(self, segments, keys):
+        """This log with the partition frames ``segments`` added after it.
+
+        Returns the new log and the frames of the shots it adds and of those
+        it drops: the earlier shots of the games ``segments`` replace. Only
+        the new frames and the replaced games are looked at, not the rest of
+        the log; this log is left unchanged.
+        """
+        games = dict(self.games())
+        dropped = dict(self.dropped)
+        all_segments = self.segments + list(segments)
+        removed = []
+        for position in range(len(self.segments), len(all_segments)):
+            replaced = {}
+            for game in pd.unique(all_segments[position]['GAME_ID']).tolist():
+                if game in games:
+                    replaced.setdefault(games[game], []).append(game)
+                games[game] = position
+            for old, old_games in replaced.items():
+                old_segment = all_segments[old]
+                rows = np.flatnonzero(old_segment['GAME_ID'].isin(old_games).to_numpy())
+                dropped[old] = np.union1d(dropped.get(old, rows[:0]), rows)
+                if old < len(self.segments):
+                    removed.append(old_segment.take(rows))
+        log = ShotLog(all_segments, keys, dropped)
+        log._games = games
+        added = [log._live(position) for position in range(len(self.segments), len(all_segments))]
+        return (log, concat_shot_data(added),
+                concat_shot_data(removed) if removed else self.segments[0].iloc[:0])
+
+
+def load_shot_log(shot_path=SHOT_LOG_PATH, players_path=PLAYERS_TEAMS_PATH,
+                  snapshot_path=snapshot.SNAPSHOT_PATH, auto_convert=True):
+    """Return the :class:`ShotLog` of the files, loading only what changed.
+
+    The log itself is read as by :func:`load_shot_data`. When the only
+    change since the last call is new partitions, only those are read: the
+    returned log extends the previous one, and the values :func:`derived`
+    from the previous log with an ``update`` are carried over to it.
+    """
+    global _hits, _misses
+    use_snapshot = (snapshot_path is not None
+                    and snapshot.is_fresh(snapshot_path, shot_path, players_path))
+    if use_snapshot:
+        base_key = (_file_key(snapshot_path),)
+    else:
+        base_key = (_file_key(shot_path), _file_key(players_path))
+    partition_paths = ingested_paths(shot_path)
+    partition_keys = tuple(_file_key(path) for path in partition_paths)
+    slot = tuple(None if path is None else os.path.abspath(path)
+                 for path in (shot_path, players_path, snapshot_path))
+    with _cache_lock:
+        log = _cache.get(slot)
+        if log is not None and log.keys == (base_key, partition_keys):
+            _hits += 1
+            return log
+        _misses += 1
+        if (log is not None and log.keys[0] == base_key
+                and partition_keys[:len(log.keys[1])] == log.keys[1]):
+            player_df = read_players_teams(players_path)
+            new_segments = [_read_partition(path, player_df) for path in partition_paths[len(log.keys[1]):]]
+            extended, added, removed = log.extended(new_segments, (base_key, partition_keys))
+            _carry_over(log, extended, added, removed)
+            _cache[slot] = extended
+            return extended
+
+        if use_snapshot:
+            shot_data = snapshot.read_snapshot(snapshot_path)
+            if not features.has_features(shot_data):
+                features.add_features(shot_data)
+        else:
+            shot_data = build_shot_data(shot_path, players_path)
+            if auto_convert and snapshot_path is not None and snapshot.available():
+                try:
+                    snapshot.write_snapshot(shot_data, snapshot_path)
+                except OSError:
+                    pass  # read-only checkout: keep serving from the CSV files
+                else:
+                    base_key = (_file_key(snapshot_path),)
+        log = ShotLog([shot_data], (base_key, partition_keys))
+        if partition_paths:
+            player_df = read_players_teams(players_path)
+            log = log.extended([_read_partition(path, player_df) for path in partition_paths], log.keys)[0]
+            log = ShotLog([log.frame()], log.keys)
+        _cache[slot] = log
+        return log
+
+
+def load_shot_data(shot_path=SHOT_LOG_PATH, players_path=PLAYERS_TEAMS_PATH,
+                   snapshot_path=snapshot.SNAPSHOT_PATH, auto_convert=True):
+    """Return the merged shot frame, loading it only if the files changed.
+
+    A snapshot at ``snapshot_path`` that is newer than both CSV files is
+    preferred over parsing them. When it is missing or stale the CSV files are
+    read instead and, if ``auto_convert`` is true, a new snapshot is written
+    for the next process. Pass ``snapshot_path=None`` to always use the CSVs.
+
+    Ingested games are included (see :func:`load_shot_log`).
+
+    The returned frame is shared between all callers and must be treated as
+    read-only: filter it or take a copy before adding or overwriting columns.
+    """
+    return load_shot_log(shot_path, players_path, snapshot_path, auto_convert).frame()
+
+
+def cache_info():
+    """Return hit/miss counters for :func:`load_shot_data`."""
+    with _cache_lock:
+        return CacheInfo(_hits, _misses, len(_cache))
+
+
+def clear_cache():
+    """Forget every cached frame and derived structure and reset the counters."""
+    global _hits, _misses
+    with _cache_lock:
+        _cache.clear()
+        _hits = 0
+        _misses = 0
+    with _derived_lock:
+        _derived.clear()
+
+
+def derived(shot_data, name, build, update=None):
+    """Return ``build(shot_data)``, computed once per loaded frame or log.
+
+    Structures derived from the shared frame (aggregate cubes, indexes) are
+    kept alongside it and dropped once the frame itself is released. With
+    ``update``, the value of a :class:`ShotLog` is carried over to the log
+    it is extended into as ``update(value, added, removed)``, the frames of
+    the shots the new log adds and drops, instead of being built again.
+    """
+    if update is not None:
+        _updaters[name] = update
+    key = (id(shot_data), name)
+    with _derived_lock:
+        entry = _derived.get(key)
+        if entry is not None and entry[0]() is shot_data:
+            return entry[1]
+        for dead in [k for k, (ref, _) in _derived.items() if ref() is None]:
+            del _derived[dead]
+        value = build(shot_data)
+        _derived[key] = (weakref.ref(shot_data), value)
+        return value
+
+
+def _carry_over(log, extended, added, removed):
+    """Update the values derived from ``log`` for ``extended``, where they can be."""
+    with _derived_lock:
+        entries = [(name, value) for (owner, name), (ref, value) in _derived.items()
+                   if owner == id(log) and ref() is log and name in _updaters]
+        for name, value in entries:
+            _derived[(id(extended), name)] = (weakref.ref(extended), _updaters[name](value, added, removed))
@@ -0,0 +1,96 @@
+"""Shot distribution over shot distance and defender distance, binned server-side.
+
+Plotting every selected shot as a point sends the whole point list to the
+browser. :class:`ShotDensity` instead counts the selected shots of a
+:class:`~nba_analysis.store.ShotStore` into a fixed grid of SHOT_DIST x
+CLOSE_DEF_DIST cells, so the figure holds one value per cell however many
+shots are selected. Each shot's cell is computed once, with the store's
+other columns (see :func:`grid_cells`), so an attached shared store brings
+its cells along; a query is one mask over the store and one ``np.bincount``
+per count.
+
+The log has no court coordinates, so the grid is over the two distances.
+The last row and column of the grid are open-ended and hold the few shots
+beyond it; shots missing either distance are not counted.
+"""
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from . import data
+
+
+# Lower edges of the cells, in feet
+DISTANCE_EDGES = np.arange(0, 48, 1.0)
+DEFENDER_EDGES = np.arange(0, 20, 0.5)
+
+GRID_COLUMNS = ['Shot Distance', 'Defender Distance']
+
+# Defender distance x shot distance
+GRID_SHAPE = (len(DEFENDER_EDGES), len(DISTANCE_EDGES))
+N_CELLS = GRID_SHAPE[0] * GRID_SHAPE[1]
+
+
+def _bin(values, edges):
+    step = edges[1] - edges[0]
+    return np.clip(np.floor((np.asarray(values, dtype=np.float64) - edges[0]) / step), 0, len(edges) - 1)
+
+
+def grid_cells(shot_dist, close_def_dist):
+    """Grid cell of every shot as int16, ``N_CELLS`` for shots missing either distance."""
+    cells = _bin(close_def_dist, DEFENDER_EDGES) * GRID_SHAPE[1] + _bin(shot_dist, DISTANCE_EDGES)
+    # Shots without a cell go to a trailing slot that is dropped after counting
+    return np.where(np.isnan(cells), N_CELLS, cells).astype(np.int16)
+
+
+class ShotDensity:
+    """Made shots and attempts per grid cell, for any selection of a store's shots.
+
+    The store is only referenced weakly and must be kept alive by the caller.
+    """
+
+    def __init__(self, shot_store):
+        # Weak, as the density is cached alongside the store by load_shot_density
+        self._store = weakref.ref(shot_store)
+        self.shape = GRID_SHAPE
+
+    def counts(self, **filters):
+        """Made shots and attempts per cell of the shots passing ``filters``, as 2D arrays.
+
+        ``filters`` are those of :meth:`~nba_analysis.store.ShotStore.mask`,
+        ``players`` and ``teams`` included.
+        """
+        shot_store = self._store()
+        cells = shot_store.columns['Density Cell']
+        fgm = shot_store.columns['FGM']
+        if any(value is not None for value in filters.values()):
+            mask = shot_store.mask(**filters)
+            cells = cells[mask]
+            fgm = fgm[mask]
+        shots = np.bincount(cells, minlength=N_CELLS + 1)[:N_CELLS]
+        made = np.bincount(cells, weights=fgm, minlength=N_CELLS + 1)[:N_CELLS].astype(np.int64)
+        return made.reshape(self.shape), shots.reshape(self.shape)
+
+    def summary(self, **filters):
+        """One row per grid cell, defender distance varying slowest.
+
+        ``Shot Distance`` and ``Defender Distance`` are the lower edges of
+        the cell; ``FGM``, ``Shots`` and ``Shooting Percentage`` as in the
+        other summaries.
+        """
+        made, shots = self.counts(**filters)
+        made = made.ravel()
+        shots = shots.ravel()
+        return pd.DataFrame({
+            'Shot Distance': np.tile(DISTANCE_EDGES, self.shape[0]),
+            'Defender Distance': np.repeat(DEFENDER_EDGES, self.shape[1]),
+            'FGM': made,
+            'Shots': shots,
+            'Shooting Percentage': np.divide(made * 100.0, shots, out=np.zeros(len(shots)), where=shots > 0),
+        })
+
+
+def load_shot_density(shot_store):
+    """Return the density of ``shot_store``, created once per store."""
+    return data.derived(shot_store, 'density', ShotDensity)
@@ -0,0 +1,47 @@
+"""Derived bin columns shared by every dashboard page.
+
+The bins are computed once when the shot log is loaded, with fixed edges, so
+a shot lands in the same bucket on every page regardless of which subset is
+being looked at. Each binned column is a categorical whose codes are small
+integers (int8) and whose categories are the labels shown on the charts.
+"""
+import numpy as np
+import pandas as pd
+
+
+# CLOSE_DEF_DIST is stored as float32, so the defender threshold must be too;
+# otherwise shots recorded at exactly 3.8 feet would fall into "Tight Defense"
+TIGHT_DEFENSE_FEET = np.float32(3.8)
+
+SHOT_CLOCK_LABELS = ['0-3', '3-6', '6-9', '9-12', '12-15', '15-18', '18-21', '21-24']
+
+# column -> (source column, bin edges, labels, right-closed)
+BINS = {
+    'SHOT_CLOCK_CATEGORY': ('SHOT_CLOCK', [0, 3, 6, 9, 12, 15, 18, 21, 24], SHOT_CLOCK_LABELS, True),
+    'Distance': ('SHOT_DIST', [0, 14, np.inf],
+                 ['Short Distance (0-14 feet)', 'Long Distance (14+ feet)'], False),
+    'Time Left': ('TIME_LEFT', [0, 12, 24],
+                  ['Low Time Left (0-12 seconds)', 'High Time Left (12-24 seconds)'], False),
+    'Defender Distance': ('CLOSE_DEF_DIST', [0, TIGHT_DEFENSE_FEET, np.inf],
+                          ['Tight Defense (0-3.8 feet)', 'Loose Defense (3.8+ feet)'], False),
+    'Dribbles': ('DRIBBLES', [0, 1, np.inf],
+                 ['Few Dribbles (0-1)', 'Many Dribbles (2+)'], False),
+}
+
+# The two-level categories compared on pages 1-3, in display order
+CATEGORIES = ['Distance', 'Time Left', 'Defender Distance', 'Dribbles']
+
+FEATURE_COLUMNS = list(BINS) + ['Catch and Shoot']
+
+
+def add_features(shot_data):
+    """Add the bin columns and ``Catch and Shoot`` flag to ``shot_data`` in place."""
+    for column, (source, bins, labels, right) in BINS.items():
+        shot_data[column] = pd.cut(shot_data[source], bins=bins, labels=labels, right=right)
+    shot_data['Catch and Shoot'] = shot_data['DRIBBLES'] < 1
+    return shot_data
+
+
+def has_features(shot_data):
+    """Return True if :func:`add_features` has already been applied."""
+    return all(column in shot_data.columns for column in FEATURE_COLUMNS)
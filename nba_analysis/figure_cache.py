@@ -0,0 +1,36 @@
+"""Bounded cache of built dashboard figures shared by every session.
+
+Figures are keyed on the page, the common filters and the selected players or
+teams, so sessions looking at the same view (the default LeBron James vs
+Stephen Curry comparison, say) reuse one figure instead of rebuilding it on
+every rerun. The least recently used entries are evicted once the cache is
+full (see :mod:`nba_analysis.lru`).
+"""
+from . import data
+from .lru import LRUCache, LRUCacheInfo
+
+
+FIGURE_CACHE_SIZE = 256
+
+FigureCacheInfo = LRUCacheInfo
+
+
+class FigureCache(LRUCache):
+    """Thread-safe LRU mapping of hashable view keys to built figures.
+
+    Cached values are shared between sessions and must be treated as
+    read-only; ``st.plotly_chart`` only serializes the figure it is given.
+    """
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE):
+        super().__init__(maxsize)
+
+
+def load_figure_cache(shot_data, maxsize=FIGURE_CACHE_SIZE):
+    """Return the figure cache tied to the loaded shot log.
+
+    A new log (after the files changed on disk or games were ingested) gets
+    an empty cache, so figures of stale data are never served. Workers
+    attached with :mod:`nba_analysis.shared` pass the attached store instead.
+    """
+    return data.derived(shot_data, 'figures', lambda _: FigureCache(maxsize))
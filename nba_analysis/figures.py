@@ -0,0 +1,324 @@
+"""Plotly figures of the dashboard, built from the tables in :mod:`.analytics`.
+
+Each function takes the DataFrame returned by the matching analytics
+function and returns a ``go.Figure``; nothing here depends on Streamlit, so
+the same figures can be rendered from batch jobs.
+"""
+from collections import namedtuple
+
+import numpy as np
+import plotly.graph_objects as go
+
+
+TEAM_COLORS = ('#1f77b4', '#ff7f0e')
+
+# A figure and the size of its JSON payload, measured once when it is built
+SizedFigure = namedtuple('SizedFigure', ['figure', 'payload_bytes'])
+
+
+def _error_bars(data, column='Shooting Percentage'):
+    """Error bars from the ``CI Low``/``CI High`` bounds of ``column``, if ``data`` has them."""
+    if 'CI Low' not in data:
+        return None
+    # Clipped at zero where ``column`` was rounded after the bounds were taken
+    return dict(type='data', symmetric=False,
+                array=(data['CI High'] - data[column]).clip(lower=0),
+                arrayminus=(data[column] - data['CI Low']).clip(lower=0),
+                thickness=1.5)
+
+
+def shot_clock_figure(summary):
+    """Shots taken (bars) and shooting percentage (line) per shot clock interval."""
+    fig_dual = go.Figure()
+    fig_dual.add_trace(go.Bar(
+        x=summary['Category'],
+        y=summary['Shots'],
+        name='Shots Taken',
+        marker=dict(color='lightblue'),
+        yaxis='y'
+    ))
+
+    fig_dual.add_trace(go.Scatter(
+        x=summary['Category'],
+        y=summary['Shooting Percentage'],
+        mode='lines+markers',
+        name='Shooting Percentage',
+        line=dict(color='darkgreen', width=4, dash='dash'),
+        yaxis='y2'
+    ))
+
+    fig_dual.update_layout(
+        title='Shots Taken and Shooting Percentage by Time Left on Shot Clock',
+        xaxis_title='Time Left on Shot Clock (seconds)',
+        yaxis=dict(
+            title='Shots Taken',
+            side='left'
+        ),
+        yaxis2=dict(
+            title='Shooting Percentage (%)',
+            overlaying='y',
+            side='right'
+        ),
+        showlegend=True,
+        width=600, height=500
+    )
+    return fig_dual
+
+
+def catch_and_shoot_figure(summary):
+    """Grouped bars of catch-and-shoot vs after-dribble shooting percentage."""
+    fig3 = go.Figure()
+
+    fig3.add_trace(go.Bar(
+        x=summary[summary['Type'] == 'Catch and Shoot']['Category'],
+        y=summary[summary['Type'] == 'Catch and Shoot']['Shooting Percentage'],
+        name='Catch and Shoot',
+        marker_color='royalblue'
+    ))
+
+    fig3.add_trace(go.Bar(
+        x=summary[summary['Type'] == 'After Dribble Shot']['Category'],
+        y=summary[summary['Type'] == 'After Dribble Shot']['Shooting Percentage'],
+        name='After Dribble Shot',
+        marker_color='darkorange'
+    ))
+
+    fig3.update_layout(
+        barmode='group',
+        title='Shooting Percentage Comparison: Catch and Shoot vs After Dribble Shot',
+        xaxis_title='Category',
+        yaxis_title='Shooting Percentage',
+        legend_title_text='Type',
+        yaxis=dict(range=[0, 70]),
+        bargap=0.38,
+        xaxis_tickfont_size=11,
+        width=600, height=500
+    )
+    return fig3
+
+
+def player_bubble_figure(summary, players):
+    """Bubble chart of shooting percentage per level, sized by shot count."""
+    fig_bubble = go.Figure()
+
+    # Add scatter traces for each selected player
+    for player in players:
+        player_data = summary[summary['Player'] == player]
+        fig_bubble.add_trace(go.Scatter(
+            x=player_data['Category'],
+            y=player_data['Shooting Percentage'],
+            error_y=_error_bars(player_data),
+            mode='markers',
+            marker=dict(
+                size=player_data['Shot Count'],
+                sizemode='area',
+                sizeref=2.*max(summary['Shot Count'])/(23.**2),  # Size scaling
+                line_width=2,
+                opacity=0.8  # Set opacity to avoid white bubbles
+            ),
+            name=player,
+            hovertemplate=(
+                f'<b>{player}</b><br>' +
+                'Category: %{x}<br>' +
+                'Shooting Percentage: %{y:.1f}%<br>' +
+                'Shot Count: %{marker.size}<br>'
+            )
+        ))
+
+    # Update the layout of the figure
+    fig_bubble.update_layout(
+        title='Shooting Percentage & Shot Count Comparison: Famous NBA Players',
+        xaxis_title='Category',
+        yaxis_title='Shooting Percentage',
+        legend_title_text='Player',
+        yaxis=dict(range=[20, 70]),  # This sets the y-axis limit
+        xaxis_tickangle=28,  # This rotates the x-axis labels to the right
+        xaxis_tickfont_size=11,  # This sets the font size for the x-axis labels
+        width=1300,  # Increase the width of the chart
+        height=500  # Increase the height of the chart
+    )
+    return fig_bubble
+
+
+def player_line_figure(summary, player1, player2):
+    """Shooting percentage lines and shot count bars of two players."""
+    fig_line = go.Figure()
+
+    # Add traces for player 1 (line then bar)
+    player1_data = summary[summary['Player'] == player1]
+    fig_line.add_trace(go.Scatter(
+        x=player1_data['Category'],
+        y=player1_data['Shooting Percentage'],
+        error_y=_error_bars(player1_data),
+        mode='lines+markers',
+        name=f'{player1} Shooting Percentage',
+        line=dict(width=3.8, color='royalblue'),  # Blue line for player 1
+        marker=dict(size=12)
+    ))
+
+    player2_data = summary[summary['Player'] == player2]
+    fig_line.add_trace(go.Scatter(
+        x=player2_data['Category'],
+        y=player2_data['Shooting Percentage'],
+        error_y=_error_bars(player2_data),
+        mode='lines+markers',
+        name=f'{player2} Shooting Percentage',
+        line=dict(width=3.8, color='darkorange'),  # Orange line for player 2
+        marker=dict(size=12)
+    ))
+
+    # Add bar traces for shot counts
+    fig_line.add_trace(go.Bar(
+        x=player1_data['Category'],
+        y=player1_data['Shot Count'],
+        name=f'{player1} Shot Count',
+        marker=dict(color='royalblue'),  # Same blue for player 1
+        yaxis='y2',
+        opacity=0.9
+    ))
+
+    fig_line.add_trace(go.Bar(
+        x=player2_data['Category'],
+        y=player2_data['Shot Count'],
+        name=f'{player2} Shot Count',
+        marker=dict(color='darkorange'),  # Same orange for player 2
+        yaxis='y2',
+        opacity=0.9
+    ))
+
+    # Update layout with the legend in the top right corner
+    fig_line.update_layout(
+        title=f'Shooting Percentage & Shot Count Comparison: {player1} vs {player2}',
+        xaxis_title='Category',
+        yaxis_title='Shooting Percentage',
+        legend=dict(
+            orientation='v',
+            yanchor='top',
+            y=1,
+            xanchor='right',
+            x=1,
+            bordercolor='Black',
+            borderwidth=1
+        ),
+        yaxis=dict(range=[10, 70]),  # Set y-axis range from 10% to 70%
+        yaxis2=dict(range=[0, 1500], overlaying='y', side='right', title='Shot Count'),  # Set y2-axis range from 0 to 1500
+        xaxis_tickangle=28,  # Rotate x-axis labels
+        xaxis_tickfont_size=12,  # Increase font size for x-axis labels
+        width=1380,  # Wider figure for better readability
+        height=900,  # Adjust height accordingly
+        template='plotly_white',  # Use a white theme
+        font=dict(size=15),  # Increase overall font size
+    )
+    return fig_line
+
+
+def team_bar_figure(levels, team_color, title):
+    """Horizontal bars of one team's shooting percentage per level."""
+    fig = go.Figure(go.Bar(
+        x=levels['Shooting Percentage'],
+        y=levels['Category'],
+        orientation='h',
+        marker=dict(color=team_color)
+    ))
+    fig.update_layout(
+        title=title,
+        xaxis_title='Shooting Percentage',
+        yaxis_title='Category',
+        height=400,
+        xaxis=dict(range=[0, 60]),  # Extend x-axis to 60
+    )
+    return fig
+
+
+def team_difference_figure(difference, team1):
+    """Horizontal bars of the difference between two teams, coloured by the better team."""
+    comparison_fig = go.Figure(go.Bar(
+        x=difference['Difference'],
+        y=difference['Category'],
+        error_x=_error_bars(difference, 'Difference'),
+        orientation='h',
+        marker=dict(color=[TEAM_COLORS[0] if team == team1 else TEAM_COLORS[1] for team in difference['Team']])
+    ))
+    x_min, x_max = 0, difference['Difference'].max()
+    if 'CI High' in difference:
+        # Keep whole error bars in view, including lower bounds below zero
+        x_min = min(0, difference['CI Low'].min() - 2)
+        x_max = difference['CI High'].max()
+    comparison_fig.update_layout(
+        title='Absolute Difference in Shooting Percentage',
+        xaxis_title='Absolute Difference in Shooting Percentage',
+        yaxis_title='Category',
+        height=400,
+        xaxis=dict(range=[x_min, x_max + 2])  # Extend x-axis to max + 2
+    )
+    return comparison_fig
+
+
+def multi_team_figure(comparison):
+    """Grouped horizontal bars of several teams' shooting percentage per level."""
+    # Imported here, as the only Plotly Express chart: importing it costs more
+    # than the rest of Plotly and is only needed on Page 3
+    import plotly.express as px
+
+    fig_multi = px.bar(
+        comparison,
+        x='Shooting Percentage',
+        y='Category',
+        color='Team',
+        orientation='h',
+        barmode='group',
+        color_discrete_sequence=px.colors.qualitative.Plotly
+    )
+
+    fig_multi.update_layout(
+        title='Shooting Percentage Comparison for Multiple Teams',
+        xaxis_title='Shooting Percentage',
+        yaxis_title='Category',
+        xaxis=dict(range=[0, 60]),
+        height=600
+    )
+    return fig_multi
+
+
+def shot_density_figure(density):
+    """Heatmap of shots per shot distance x defender distance cell, FG% on hover.
+
+    ``density`` is a :meth:`~nba_analysis.density.ShotDensity.summary`;
+    empty cells are left blank.
+    """
+    distances = density['Shot Distance'].unique()
+    defenders = density['Defender Distance'].unique()
+    shape = (len(defenders), len(distances))
+    shots = density['Shots'].to_numpy()
+    fig_density = go.Figure(go.Heatmap(
+        x=distances,
+        y=defenders,
+        # float32 halves the payload; the arrays are sent base64-encoded
+        z=np.where(shots > 0, shots, np.nan).astype(np.float32).reshape(shape),
+        customdata=density['Shooting Percentage'].to_numpy(dtype=np.float32).reshape(shape),
+        colorscale='YlOrRd',
+        colorbar=dict(title='Shots'),
+        hovertemplate=(
+            'Shot Distance: %{x}+ feet<br>' +
+            'Defender Distance: %{y}+ feet<br>' +
+            'Shots: %{z}<br>' +
+            'Shooting Percentage: %{customdata:.1f}%<extra></extra>'
+        )
+    ))
+    fig_density.update_layout(
+        title=f'Shot Distribution of {shots.sum():,} Shots',
+        xaxis_title='Shot Distance (feet)',
+        yaxis_title='Closest Defender Distance (feet)',
+        height=600
+    )
+    return fig_density
+
+
+def payload_bytes(fig):
+    """Size of ``fig`` serialized as JSON, as sent to the browser."""
+    return len(fig.to_json().encode())
+
+
+def sized_figure(fig):
+    """``fig`` with its :func:`payload_bytes`, to be cached together."""
+    return SizedFigure(fig, payload_bytes(fig))
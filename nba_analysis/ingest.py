@@ -0,0 +1,93 @@
+"""Add the shots of new games to the shot log without recomputing the season.
+
+Usage::
+
+    python -m nba_analysis.ingest new_games.csv [--overwrite]
+        [--shots shot_logs.csv] [--players players_teams.csv]
+        [--snapshot shot_logs.feather]
+
+Games are identified by ``GAME_ID``. The new rows are written, as they
+are, to a new partition CSV next to the log (see
+:func:`~nba_analysis.data.ingested_directory`); neither the log nor its
+snapshot is rewritten. A game's shots are those of the last partition
+holding it, so ``overwrite`` replaces a game by ingesting it again. Every
+process picks the partition up on its next load and reads only the new
+partitions: the cube, the shot clock profile and the column store it serves
+are updated by counting the new shots in and the replaced ones out, so an
+ingest costs in proportion to the games it adds, not to the season.
+"""
+import argparse
+import sys
+from collections import namedtuple
+
+import pandas as pd
+
+from . import data, snapshot
+
+
+IngestResult = namedtuple('IngestResult', ['games_added', 'games_replaced', 'shots_added', 'shots_removed'])
+
+
+def _read_new_shots(new_shots):
+    """The raw rows of ``new_shots``, as in the CSV."""
+    if isinstance(new_shots, pd.DataFrame):
+        return new_shots
+    return pd.read_csv(new_shots, encoding="ISO-8859-1")
+
+
+def ingest_games(new_shots, shot_path=data.SHOT_LOG_PATH, players_path=data.PLAYERS_TEAMS_PATH,
+                 snapshot_path=snapshot.SNAPSHOT_PATH, overwrite=False):
+    """Add the games in ``new_shots`` (a CSV path or a raw DataFrame) to the log.
+
+    Games already in the log are rejected with a ValueError, unless
+    ``overwrite`` is true, in which case their old shots are replaced. So is
+    a batch missing a column of the log, or with values the log's dtypes
+    cannot hold: nothing is written then, and the log keeps loading. The
+    updated data is served by :func:`~nba_analysis.data.load_shot_log` and
+    the loaders built on it from then on.
+    """
+    shot_log = data.load_shot_log(shot_path, players_path, snapshot_path)
+    raw = _read_new_shots(new_shots)
+    header = list(pd.read_csv(shot_path, encoding="ISO-8859-1", nrows=0).columns)
+    missing = [column for column in header if column not in raw.columns]
+    if missing:
+        raise ValueError(f"new shots lack column(s) of {shot_path}: {', '.join(missing)}")
+    # Refuse values the log's dtypes cannot hold before anything is written
+    try:
+        shots = raw[header].astype({column: dtype for column, dtype in data.SHOT_LOG_DTYPES.items()
+                                    if column in header})
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"new shots do not fit the dtypes of {shot_path}: {error}") from None
+
+    new_games = set(pd.unique(shots['GAME_ID']).tolist())
+    duplicates = new_games & shot_log.games().keys()
+    if duplicates and not overwrite:
+        raise ValueError(f"{len(duplicates)} game(s) already in {shot_path}: "
+                         f"{', '.join(map(str, sorted(duplicates)[:10]))}; pass overwrite=True to replace them")
+
+    data.write_partition(shots, shot_path)
+    updated = data.load_shot_log(shot_path, players_path, snapshot_path)
+    return IngestResult(len(new_games - duplicates), len(duplicates), len(shots),
+                        len(shot_log) + len(shots) - len(updated))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('new_shots', help="CSV with the shots of the new games")
+    parser.add_argument('--overwrite', action='store_true', help="replace games already in the log")
+    parser.add_argument('--shots', default=data.SHOT_LOG_PATH, help="shot log CSV to append to")
+    parser.add_argument('--players', default=data.PLAYERS_TEAMS_PATH, help="player/team lookup CSV")
+    parser.add_argument('--snapshot', default=snapshot.SNAPSHOT_PATH, help="snapshot of the shot log")
+    args = parser.parse_args(argv)
+
+    try:
+        result = ingest_games(args.new_shots, args.shots, args.players, args.snapshot, args.overwrite)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f"Added {result.games_added} game(s), replaced {result.games_replaced} "
+          f"({result.shots_added:,} shots in, {result.shots_removed:,} out)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""Optional per-stage timing and memory accounting for one dashboard rerun.
+
+A :class:`StageTimer` records, for every stage wrapped in :meth:`StageTimer.stage`,
+the wall time, the number of rows it produced or processed and the memory it
+allocated according to :mod:`tracemalloc`. A disabled timer records nothing
+and costs a few attribute writes per stage, so the stages can stay wrapped in
+production.
+
+tracemalloc traces the whole process, slows every allocation in it and
+keeps a single peak, so memory accounting is a decision for the whole process
+rather than for one session: with several sessions rerunning at once the
+byte counts of concurrent stages include each other's allocations. Wall
+times are per thread and unaffected.
+"""
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+STAGE_COLUMNS = ['stage', 'seconds', 'rows', 'allocated_bytes', 'peak_bytes']
+
+
+class StageRecord:
+    """Measurements of one stage; ``rows`` is filled in by the caller."""
+
+    __slots__ = ('stage', 'seconds', 'rows', 'allocated_bytes', 'peak_bytes')
+
+    def __init__(self, stage):
+        self.stage = stage
+        self.seconds = 0.0
+        self.rows = None
+        self.allocated_bytes = None
+        self.peak_bytes = None
+
+    def as_dict(self):
+        return {column: getattr(self, column) for column in STAGE_COLUMNS}
+
+
+class StageTimer:
+    """Collects a :class:`StageRecord` per stage of one rerun.
+
+    With ``trace_memory`` the allocations of each stage are recorded too;
+    tracemalloc is started on first use and left running, as other sessions
+    may be tracing too, so only pass it for a process that is profiled as a
+    whole.
+    """
+
+    def __init__(self, enabled=True, trace_memory=False):
+        self.enabled = enabled
+        self.trace_memory = enabled and trace_memory
+        self.records = []
+        self._start = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stage(self, name):
+        """Context manager measuring the block as stage ``name``.
+
+        Yields the :class:`StageRecord` so the block can set ``record.rows``;
+        when disabled, the record is simply discarded.
+        """
+        if not self.enabled:
+            return nullcontext(StageRecord(name))
+        return self._measure(name)
+
+    @contextmanager
+    def _measure(self, name):
+        record = StageRecord(name)
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds = time.perf_counter() - start
+            if self.trace_memory:
+                current, peak = tracemalloc.get_traced_memory()
+                record.allocated_bytes = current - before
+                record.peak_bytes = peak - before
+            self.records.append(record)
+
+    def total_seconds(self):
+        """Wall time since the timer was created."""
+        return time.perf_counter() - self._start
+
+    def frame(self):
+        """The recorded stages as a DataFrame, one row per stage."""
+        # Imported here so that the dashboard can create its timer before pandas is loaded
+        import pandas as pd
+
+        return pd.DataFrame([record.as_dict() for record in self.records], columns=STAGE_COLUMNS)
+
+    def to_json(self, **context):
+        """One JSON line describing the rerun: ``context``, total time and stages."""
+        return json.dumps({
+            **context,
+            'total_seconds': self.total_seconds(),
+            'stages': [record.as_dict() for record in self.records],
+        }, default=str)
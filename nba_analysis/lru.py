@@ -0,0 +1,71 @@
+"""Bounded, thread-safe least-recently-used cache.
+
+Shared by the figure cache of the dashboard and the response cache of the
+query API: values are built on a miss by a callable, and the least recently
+used entries are evicted once the cache is full.
+"""
+import threading
+from collections import OrderedDict, namedtuple
+
+
+LRUCacheInfo = namedtuple('LRUCacheInfo', ['hits', 'misses', 'evictions', 'currsize', 'maxsize'])
+
+
+class LRUCache:
+    """Thread-safe LRU mapping of hashable keys to built values."""
+
+    def __init__(self, maxsize):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def get_or_build(self, key, build):
+        """Return the value cached under ``key``, calling ``build()`` on a miss.
+
+        The value is built outside the lock, so a slow build does not hold up
+        callers asking for other keys; two callers missing on the same key at
+        once both build it and the later result is kept. An exception raised
+        by ``build`` is not cached.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return self._entries[key]
+            self._misses += 1
+
+        value = build()
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return value
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return LRUCacheInfo(self._hits, self._misses, self._evictions, len(self._entries), self.maxsize)
+
+    def clear(self):
+        """Drop every cached value and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
@@ -0,0 +1,45 @@
+"""Pages, sidebar choices and default selections of the dashboard.
+
+Plain Python: importing this module imports neither numpy, pandas nor
+plotly, so the dashboard can draw its sidebar while those and the data are
+still loading. :mod:`.analytics`, :mod:`.views` and :mod:`.shot_clock`
+re-export the names they use.
+"""
+
+
+PAGES = ["Page 1 - Shot Clock & Catch and Shoot", "Page 2 - Players Comparison", "Page 3 - Teams Comparison"]
+
+FAMOUS_PLAYERS = [
+    'LeBron James', 'Kobe Bryant', 'Stephen Curry',
+    'Chris Paul', 'Tim Duncan',
+    'Kawhi Leonard', 'Russell Westbrook', 'James Harden', 'Carmelo Anthony',
+    'Paul Pierce', 'Klay Thompson', 'Pau Gasol', 'Blake Griffin',
+    'Anthony Davis', 'Marc Gasol', 'Damian Lillard', 'Giannis Antetokounmpo'
+]
+
+# Sidebar option -> cube filter value (None means "All")
+LOCATION_FILTERS = {"All": None, "Home": "H", "Away": "A"}
+QUARTER_FILTERS = {"All": None, "1": 1, "2": 2, "3": 3, "4": 4}
+SHOOT_TYPE_FILTERS = {"All": None, "2 Points": 2, "3 Points": 3}
+MARGIN_FILTERS = {"All": None, "Below 5 points": True, "More than 5 points": False}
+
+# Shot clock bin widths offered in the sidebar, in seconds
+BIN_WIDTHS = [0.1, 0.5, 1, 2, 3, 4, 6]
+DEFAULT_BIN_WIDTH = 3
+
+# Default sidebar selections of pages 2 and 3
+DEFAULT_BUBBLE_PLAYERS = ['LeBron James', 'Stephen Curry', 'Kawhi Leonard', 'James Harden',
+                          'Chris Paul', 'Kobe Bryant', 'Anthony Davis']
+DEFAULT_LINE_PLAYERS = ['LeBron James', 'Stephen Curry']
+DEFAULT_TEAMS = ['Golden State Warriors', 'Atlanta Hawks']
+DEFAULT_MULTI_TEAMS = ['Golden State Warriors', 'Los Angeles Lakers', 'Atlanta Hawks']
+
+
+def common_filters(location="All", quarter="All", shoot_type="All", final_margin="All"):
+    """Translate the sidebar selections into keyword filters for the cube."""
+    return {
+        'location': LOCATION_FILTERS[location],
+        'period': QUARTER_FILTERS[str(quarter)],
+        'pts_type': SHOOT_TYPE_FILTERS[shoot_type],
+        'close_game': MARGIN_FILTERS[final_margin],
+    }
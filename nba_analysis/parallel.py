@@ -0,0 +1,267 @@
+"""Shooting summaries computed by a process pool, partitioned by player or team.
+
+:class:`ParallelSummary` writes the integer-coded columns a summary needs
+into ``.npy`` files on a RAM-backed file system (``/dev/shm`` where
+available), which every worker memory-maps read-only instead of receiving a
+pickled copy of the frame. The columns are stored twice, once sorted by
+player and once by team, so the shots of consecutive players (or teams) are
+one contiguous slice. A request for many players or teams is split into
+runs of consecutive codes with roughly equal shot counts; each worker counts
+made shots and attempts per cell of its slices with ``np.bincount``, and the
+parent adds the partial counts up.
+
+The result is the same table as :func:`~nba_analysis.aggregation.shooting_summary`
+on the frame filtered by the common filters.
+
+The column files are removed when the summary is closed, garbage collected
+or its pool breaks (a worker died), and at interpreter exit otherwise; only
+a parent killed outright leaves them behind.
+"""
+import os
+import shutil
+import tempfile
+import multiprocessing
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+from .aggregation import encode, summary_frame
+from .cube import CLOSE_GAME_MARGIN
+from .features import BINS, CATEGORIES
+
+
+# Columns a summary can be partitioned by, and every column it can group by
+PARTITION_COLUMNS = ('player_name', 'team_name')
+GROUP_COLUMNS = PARTITION_COLUMNS + ('Catch and Shoot',)
+
+# filter keyword -> coded column it restricts
+_FILTER_COLUMNS = {'location': 'LOCATION', 'period': 'PERIOD', 'pts_type': 'PTS_TYPE'}
+
+# Parts per worker; more than one evens out workers that finish early
+_PARTITIONS_PER_PROCESS = 4
+
+# Memory-mapped columns of the store a worker was started for
+_worker_columns = None
+
+
+def _shared_directory():
+    return '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
+def _open_columns(directory):
+    return {f'{partition}/{name[:-4]}': np.load(os.path.join(directory, partition, name), mmap_mode='r')
+            for partition in PARTITION_COLUMNS
+            for name in os.listdir(os.path.join(directory, partition))}
+
+
+def _init_worker(directory):
+    global _worker_columns
+    _worker_columns = _open_columns(directory)
+
+
+def _count_partition(task):
+    """Made shots and attempts per cell for one partition of players/teams.
+
+    Runs in a worker against the memory-mapped columns. Also returns, per
+    group column, which of its codes occur among the filtered shots.
+    """
+    partition, ranges, group_maps, categories, level_offsets, n_cells, filters = task
+
+    def column(name):
+        values = _worker_columns[f'{partition}/{name}']
+        if len(ranges) == 1:
+            return values[ranges[0][0]:ranges[0][1]]
+        return np.concatenate([values[start:stop] for start, stop in ranges])
+
+    fgm = column('FGM')
+    valid = np.ones(len(fgm), dtype=bool)
+    for name, code in filters.items():
+        valid &= column(name) == code
+
+    # Mixed-radix cell of the requested groups; group_maps translate column
+    # codes into positions in the requested values (-1 = not requested)
+    group_key = np.zeros(len(fgm), dtype=np.int64)
+    present = []
+    for name, mapping, size in group_maps:
+        codes = column(name)
+        present.append(np.bincount(codes[valid] + 1, minlength=len(mapping))[1:] > 0)
+        group = mapping[codes]
+        group_key = group_key * size + np.maximum(group, 0)
+        valid &= group >= 0
+
+    n_levels = level_offsets[-1]
+    made = np.zeros(n_cells, dtype=np.int64)
+    shots = np.zeros(n_cells, dtype=np.int64)
+    for category, offset in zip(categories, level_offsets):
+        level = column(category)
+        keep = valid & (level >= 0)
+        cell = group_key[keep] * n_levels + offset + level[keep]
+        shots += np.bincount(cell, minlength=n_cells)
+        made += np.bincount(cell, weights=fgm[keep], minlength=n_cells).astype(np.int64)
+    return made, shots, present
+
+
+def _remove_columns(directory):
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+class ParallelSummary:
+    """Process-pool backend for per-player and per-team shooting summaries.
+
+    Call :meth:`close` (or use it as a context manager) to stop the workers
+    and remove the shared column files.
+    """
+
+    def __init__(self, shot_data, processes=None):
+        self.processes = processes or os.cpu_count() or 1
+        self.directory = tempfile.mkdtemp(prefix='nba_columns_', dir=_shared_directory())
+        # Also runs at garbage collection and interpreter exit
+        self._remove_columns = weakref.finalize(self, _remove_columns, self.directory)
+        try:
+            self._write_columns(shot_data)
+            self._executor = ProcessPoolExecutor(self.processes, mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_init_worker, initargs=(self.directory,))
+        except BaseException:
+            self._remove_columns()
+            raise
+
+    def _write_columns(self, shot_data):
+        """Save the coded columns under ``self.directory``, sorted by player and by team."""
+        self.values = {}
+        self.shot_counts = {}
+        arrays = {}
+        for column in GROUP_COLUMNS + tuple(_FILTER_COLUMNS.values()):
+            codes, uniques = encode(shot_data[column])
+            arrays[column] = codes.astype(np.int16)
+            self.values[column] = list(uniques)
+        for category in BINS:
+            arrays[category] = shot_data[category].cat.codes.to_numpy()
+        arrays['close_game'] = (shot_data['FINAL_MARGIN'].abs() <= CLOSE_GAME_MARGIN).to_numpy().astype(np.int16)
+        arrays['FGM'] = shot_data['FGM'].to_numpy()
+
+        # Every column sorted by player and by team; the shots of code i
+        # are rows offsets[i]:offsets[i + 1] (missing values come first)
+        self.offsets = {}
+        for partition in PARTITION_COLUMNS:
+            codes = arrays[partition]
+            order = np.argsort(codes, kind='stable')
+            counts = np.bincount(codes + 1, minlength=len(self.values[partition]) + 1)
+            self.offsets[partition] = np.cumsum(counts)
+            self.shot_counts[partition] = counts[1:]
+            os.mkdir(os.path.join(self.directory, partition))
+            for name, array in arrays.items():
+                np.save(os.path.join(self.directory, partition, f'{name}.npy'), array[order])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut the pool down and delete the shared column files."""
+        try:
+            self._executor.shutdown()
+        finally:
+            self._remove_columns()
+
+    def _partitions(self, partition, codes):
+        """Row ranges of ``codes``, split into parts of similar shot counts.
+
+        Consecutive codes share one range; each part is a list of
+        ``(start, stop)`` ranges into the columns sorted by ``partition``.
+        """
+        offsets = self.offsets[partition]
+        sizes = self.shot_counts[partition][codes]
+        n_parts = max(1, min(len(codes), self.processes * _PARTITIONS_PER_PROCESS))
+        # Cut the codes where the running shot count crosses each multiple
+        # of total / n_parts
+        bounds = np.searchsorted(np.cumsum(sizes), np.arange(1, n_parts) * sizes.sum() / n_parts)
+        parts = []
+        for part in np.split(np.asarray(codes), np.unique(bounds)):
+            ranges = []
+            for code in part:
+                start, stop = offsets[code], offsets[code + 1]
+                if ranges and ranges[-1][1] == start:
+                    ranges[-1] = (ranges[-1][0], stop)
+                elif stop > start:
+                    ranges.append((start, stop))
+            if ranges:
+                parts.append(ranges)
+        return parts
+
+    def summary(self, by, categories=CATEGORIES, keys=None, location=None, period=None,
+                pts_type=None, close_game=None):
+        """Parallel :func:`~nba_analysis.aggregation.shooting_summary` of the filtered shots.
+
+        ``by[0]`` must be ``player_name`` or ``team_name`` and is the column
+        the work is partitioned by; further ``by`` columns may be the other
+        of the two and ``Catch and Shoot``. Filters are those of
+        :meth:`~nba_analysis.cube.ShotCube.summary`. Without ``keys``, a
+        column reports the values that occur among the filtered shots.
+        """
+        by = list(by)
+        keys = keys or {}
+        if not by or by[0] not in PARTITION_COLUMNS:
+            raise ValueError(f"by must start with one of {PARTITION_COLUMNS}")
+
+        filters = {}
+        for name, value in (('location', location), ('period', period), ('pts_type', pts_type)):
+            if value is not None:
+                column = _FILTER_COLUMNS[name]
+                values = self.values[column]
+                filters[column] = values.index(value) if value in values else -2
+        if close_game is not None:
+            filters['close_game'] = int(close_game)
+
+        group_values = []
+        group_maps = []
+        for column in by:
+            observed = self.values[column]
+            values = list(keys[column]) if column in keys else observed
+            positions = {value: position for position, value in enumerate(values)}
+            # Last slot catches code -1 (missing values)
+            mapping = np.array([positions.get(value, -1) for value in observed] + [-1], dtype=np.int64)
+            group_maps.append((column, mapping, len(values)))
+            group_values.append(values)
+
+        # Codes of the requested players/teams, split between the workers
+        partition_column = by[0]
+        wanted = np.flatnonzero(group_maps[0][1][:-1] >= 0)
+
+        levels = []
+        level_offsets = []
+        for category in categories:
+            level_offsets.append(len(levels))
+            levels.extend(BINS[category][2])
+        level_offsets.append(len(levels))
+        n_cells = int(np.prod([len(values) for values in group_values])) * len(levels)
+
+        made = np.zeros(n_cells, dtype=np.int64)
+        shots = np.zeros(n_cells, dtype=np.int64)
+        present = [np.zeros(len(self.values[column]), dtype=bool) for column in by]
+        tasks = [(partition_column, ranges, group_maps, list(categories), level_offsets, n_cells, filters)
+                 for ranges in self._partitions(partition_column, wanted)]
+        try:
+            for partial_made, partial_shots, partial_present in self._executor.map(_count_partition, tasks):
+                made += partial_made
+                shots += partial_shots
+                for seen, partial_seen in zip(present, partial_present):
+                    seen |= partial_seen
+        except BrokenProcessPool:
+            # A worker died; the pool cannot be used again
+            self.close()
+            raise
+
+        # Drop the unrequested values that no filtered shot has
+        shape = [len(values) for values in group_values] + [len(levels)]
+        made, shots = made.reshape(shape), shots.reshape(shape)
+        for axis, column in enumerate(by):
+            if column not in keys:
+                kept = np.flatnonzero(present[axis])
+                made, shots = made.take(kept, axis=axis), shots.take(kept, axis=axis)
+                group_values[axis] = [group_values[axis][position] for position in kept]
+
+        return summary_frame(by, group_values + [levels], made.ravel(), shots.ravel())
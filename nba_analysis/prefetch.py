@@ -0,0 +1,121 @@
+"""Background building of the figures of pages that are not on screen.
+
+Only the selected page's branch of the dashboard runs in a rerun, so the
+first visit to another page builds all of its figures. After a page has
+rendered, the dashboard hands the default views of the other pages to a
+:class:`Prefetcher`, whose worker thread builds them into the shared
+:class:`~nba_analysis.figure_cache.FigureCache`; switching pages then only
+renders cached figures.
+
+Prefetching is speculative. Each session has at most one batch of views in
+flight, tagged with the common filters it was scheduled for. When the
+session's filters change, the old batch is cancelled: queued views are
+dropped and a view being built is abandoned before its figure is made.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import data
+from .figure_cache import load_figure_cache
+
+
+# One thread: prefetching competes with the reruns for the interpreter
+PREFETCH_WORKERS = 1
+
+
+class _Batch:
+    __slots__ = ('token', 'futures', 'cancelled')
+
+    def __init__(self, token):
+        self.token = token
+        self.futures = []
+        self.cancelled = threading.Event()
+
+
+class Prefetcher:
+    """Builds views into a figure cache from a background thread pool."""
+
+    def __init__(self, figure_cache, max_workers=PREFETCH_WORKERS):
+        self.figure_cache = figure_cache
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix='nba-prefetch')
+        # owner (a session) -> its batch in flight
+        self._batches = {}
+        # Reentrant: cancelling a future runs its done callback right away
+        self._lock = threading.RLock()
+
+    def schedule(self, owner, token, views):
+        """Build ``views`` in the background for ``owner``, unless already cached.
+
+        ``token`` identifies what the views were made for (the common
+        filters). Scheduling with the same token as the batch in flight
+        does nothing; with a different one, that batch is cancelled first.
+        """
+        with self._lock:
+            batch = self._batches.get(owner)
+            if batch is not None:
+                if batch.token == token:
+                    return
+                self._cancel(batch)
+            batch = _Batch(token)
+            self._batches[owner] = batch
+            for view in views:
+                if view.key in self.figure_cache:
+                    continue
+                future = self._executor.submit(self._build, view, batch.cancelled)
+                batch.futures.append(future)
+            futures = list(batch.futures)
+        if not futures:
+            self._finished(owner, batch)
+        for future in futures:
+            future.add_done_callback(lambda _: self._finished(owner, batch))
+
+    def cancel(self, owner):
+        """Cancel the batch in flight for ``owner``, if any."""
+        with self._lock:
+            batch = self._batches.pop(owner, None)
+            if batch is not None:
+                self._cancel(batch)
+
+    def pending(self, owner):
+        """Number of views of ``owner``'s batch not yet built or dropped."""
+        with self._lock:
+            batch = self._batches.get(owner)
+            return 0 if batch is None else sum(not future.done() for future in batch.futures)
+
+    def shutdown(self):
+        """Cancel every batch and stop the worker threads."""
+        with self._lock:
+            for batch in self._batches.values():
+                self._cancel(batch)
+            self._batches.clear()
+        self._executor.shutdown(wait=True)
+
+    @staticmethod
+    def _cancel(batch):
+        batch.cancelled.set()
+        for future in batch.futures:
+            future.cancel()
+
+    def _finished(self, owner, batch):
+        # Forget the batch once all of it is done, unless it was replaced
+        with self._lock:
+            if self._batches.get(owner) is batch and all(future.done() for future in batch.futures):
+                del self._batches[owner]
+
+    def _build(self, view, cancelled):
+        if cancelled.is_set() or view.key in self.figure_cache:
+            return
+        table = view.table()
+        if cancelled.is_set():
+            return
+        self.figure_cache.get_or_build(view.key, lambda: view.figure(table))
+
+
+def load_prefetcher(shot_data):
+    """Return the prefetcher for the figure cache of ``shot_data``.
+
+    ``shot_data`` is the loaded log, or an attached store, as passed to
+    :func:`~nba_analysis.figure_cache.load_figure_cache`. A new log gets a
+    new prefetcher; the old one's thread exits once it is released.
+    """
+    return data.derived(shot_data, 'prefetcher', lambda _: Prefetcher(load_figure_cache(shot_data)))
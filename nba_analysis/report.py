@@ -0,0 +1,211 @@
+"""Render the Page 2 and Page 3 comparison charts to files, without the UI.
+
+Usage::
+
+    python -m nba_analysis.report OUTPUT_DIR [--all-team-pairs]
+        [--teams TEAM1 TEAM2 ...] [--players PLAYER ... ...]
+        [--comparisons comparisons.json] [--format json|html] [--workers N]
+        [--location Home] [--quarter 4] [--shoot-type "3 Points"]
+        [--margin "Below 5 points"]
+
+A comparison is either one or two teams (Page 3: each team's bars and, for
+two, the absolute difference between them) or a list of players (Page 2:
+the bubble chart and, for exactly two, the line/bar chart). A comparisons
+file holds a JSON list of ``{"teams": [...]}`` and ``{"players": [...]}``
+objects. The filter options take the sidebar's choices.
+
+The tables of every comparison are computed first, in one cube query per
+page (:func:`~nba_analysis.analytics.team_differences` and
+:func:`~nba_analysis.analytics.player_comparisons`). Building and writing
+the figures, which is most of the time, is then spread over a process pool.
+``index.json`` in the output directory lists the files of each comparison.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import analytics, data, figures, snapshot
+from .cube import load_shot_cube
+
+
+FORMATS = ('json', 'html')
+
+# Tasks per worker round trip; figures are small and many
+_CHUNKSIZE = 16
+
+
+def slug(name):
+    """File name part for a team or player name."""
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def read_comparisons(path):
+    """The comparisons listed in a JSON file, as ``('teams'|'players', names)``."""
+    with open(path) as f:
+        entries = json.load(f)
+    comparisons = []
+    for entry in entries:
+        if len(entry) != 1 or not set(entry) <= {'teams', 'players'}:
+            raise ValueError(f"a comparison needs one of 'teams' or 'players': {entry!r}")
+        (kind, names), = entry.items()
+        comparisons.append((kind, list(names)))
+    return comparisons
+
+
+def all_team_pairs(shot_cube):
+    """Every pair of teams in the cube, in alphabetical order."""
+    teams = sorted({team for team in shot_cube.player_teams if isinstance(team, str) and team})
+    return [('teams', list(pair)) for pair in itertools.combinations(teams, 2)]
+
+
+def figure_tasks(shot_cube, comparisons, filters, file_format='json'):
+    """The figures of every comparison, as render tasks, and the report index.
+
+    A task is ``(path, chart, table, args)``, ``path`` relative to the output
+    directory. A team's bars appear once per colour however many pairs it is
+    in.
+    """
+    for kind, names in comparisons:
+        if kind == 'teams' and not 1 <= len(names) <= 2:
+            raise ValueError(f"a team comparison has one or two teams: {names!r}")
+        if kind == 'players' and not names:
+            raise ValueError("a player comparison needs at least one player")
+
+    team_comparisons = [names for kind, names in comparisons if kind == 'teams']
+    player_comparisons = [names for kind, names in comparisons if kind == 'players']
+    pairs = [tuple(names) for names in team_comparisons if len(names) == 2]
+    levels = analytics.team_levels_by_team(shot_cube, [team for names in team_comparisons for team in names],
+                                           **filters)
+    differences = dict(zip(pairs, analytics.team_differences(shot_cube, pairs, **filters)))
+    summaries = iter(analytics.player_comparisons(shot_cube, player_comparisons, **filters))
+
+    tasks = {}
+    index = []
+    for kind, names in comparisons:
+        paths = []
+        if kind == 'teams':
+            for position, team in enumerate(names):
+                path = f'teams/{slug(team)}-{position + 1}.{file_format}'
+                tasks.setdefault(path, (path, 'team_bar', levels[team],
+                                        (figures.TEAM_COLORS[position], f'Shooting Percentage by Category for {team}')))
+                paths.append(path)
+            if len(names) == 2:
+                team1, team2 = names
+                path = f'team_pairs/{slug(team1)}__{slug(team2)}.{file_format}'
+                tasks.setdefault(path, (path, 'team_difference', differences[team1, team2], (team1,)))
+                paths.append(path)
+        else:
+            summary = next(summaries)
+            name = '__'.join(slug(player) for player in names)
+            # Rounded for the bubble labels, as on Page 2
+            bubble = summary.assign(**{'Shooting Percentage': summary['Shooting Percentage'].round(1)})
+            path = f'players/{name}.bubble.{file_format}'
+            tasks.setdefault(path, (path, 'player_bubble', bubble, (names,)))
+            paths.append(path)
+            if len(names) == 2:
+                path = f'players/{name}.line.{file_format}'
+                tasks.setdefault(path, (path, 'player_line', summary, tuple(names)))
+                paths.append(path)
+        index.append({kind: names, 'files': paths})
+    return list(tasks.values()), index
+
+
+def _render(task, directory, file_format):
+    """Build one figure and write it; returns its path, or None when it has nothing to draw."""
+    path, chart, table, args = task
+    if chart == 'player_bubble':
+        if table['Shot Count'].sum() == 0:
+            return None
+        fig = figures.player_bubble_figure(table, *args)
+    else:
+        fig = getattr(figures, f'{chart}_figure')(table, *args)
+    path = os.path.join(directory, path)
+    if file_format == 'html':
+        fig.write_html(path, include_plotlyjs='cdn')
+    else:
+        with open(path, 'w') as f:
+            f.write(fig.to_json())
+    return path
+
+
+def _render_all(tasks, directory, file_format):
+    return [_render(task, directory, file_format) for task in tasks]
+
+
+def render(tasks, directory, file_format='json', workers=None):
+    """Write the figures of ``tasks`` under ``directory`` with ``workers`` processes.
+
+    Returns the written paths, None for figures with nothing to draw.
+    """
+    for subdirectory in {os.path.dirname(path) for path, *_ in tasks}:
+        os.makedirs(os.path.join(directory, subdirectory), exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        return _render_all(tasks, directory, file_format)
+    # Spawned workers start clean; they only need the tables they are sent
+    chunks = [tasks[i:i + _CHUNKSIZE] for i in range(0, len(tasks), _CHUNKSIZE)]
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        results = executor.map(_render_all, chunks, itertools.repeat(directory), itertools.repeat(file_format))
+        return [path for chunk in results for path in chunk]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render comparison charts to files")
+    parser.add_argument('output', help="directory to write the figures into")
+    parser.add_argument('--all-team-pairs', action='store_true', help="compare every pair of teams")
+    parser.add_argument('--teams', nargs='+', action='append', default=[], metavar='TEAM',
+                        help="one or two teams to compare (repeatable)")
+    parser.add_argument('--players', nargs='+', action='append', default=[], metavar='PLAYER',
+                        help="players to compare (repeatable)")
+    parser.add_argument('--comparisons', help="JSON file listing comparisons")
+    parser.add_argument('--format', choices=FORMATS, default='json', help="figure file format")
+    parser.add_argument('--workers', type=int, default=None, help="render processes (default: one per CPU)")
+    parser.add_argument('--location', choices=list(analytics.LOCATION_FILTERS), default="All")
+    parser.add_argument('--quarter', choices=list(analytics.QUARTER_FILTERS), default="All")
+    parser.add_argument('--shoot-type', choices=list(analytics.SHOOT_TYPE_FILTERS), default="All")
+    parser.add_argument('--margin', choices=list(analytics.MARGIN_FILTERS), default="All")
+    parser.add_argument('--shots', default=data.SHOT_LOG_PATH, help="shot log CSV")
+    parser.add_argument('--players-csv', default=data.PLAYERS_TEAMS_PATH, help="player/team lookup CSV")
+    parser.add_argument('--snapshot', default=snapshot.SNAPSHOT_PATH, help="snapshot to load from, if fresh")
+    args = parser.parse_args(argv)
+
+    shot_cube = load_shot_cube(args.shots, args.players_csv, args.snapshot)
+    comparisons = [('teams', names) for names in args.teams] + [('players', names) for names in args.players]
+    if args.comparisons:
+        comparisons += read_comparisons(args.comparisons)
+    if args.all_team_pairs:
+        comparisons += all_team_pairs(shot_cube)
+    if not comparisons:
+        parser.error("nothing to compare; give --teams, --players, --comparisons or --all-team-pairs")
+    filters = analytics.common_filters(args.location, args.quarter, args.shoot_type, args.margin)
+
+    start = time.perf_counter()
+    try:
+        tasks, index = figure_tasks(shot_cube, comparisons, filters, args.format)
+    except ValueError as exc:
+        parser.error(str(exc))
+    summarised = time.perf_counter() - start
+
+    start = time.perf_counter()
+    paths = render(tasks, args.output, args.format, args.workers)
+    rendered = time.perf_counter() - start
+    written = {os.path.relpath(path, args.output) for path in paths if path is not None}
+    for entry in index:
+        entry['files'] = [path for path in entry['files'] if path in written]
+    with open(os.path.join(args.output, 'index.json'), 'w') as f:
+        json.dump({'filters': filters, 'comparisons': index}, f, indent=1)
+
+    print(f"Summarised {len(comparisons)} comparisons in {summarised:.2f}s")
+    print(f"Rendered {len(written)} figures in {rendered:.2f}s "
+          f"({len(written) / rendered:.1f} figures/s) to {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,304 @@
+"""Local HTTP/JSON API serving the dashboard's summary tables.
+
+Usage::
+
+    python -m nba_analysis.service [--host 127.0.0.1] [--port 8502]
+        [--shared /dev/shm/nba_analysis] [--cache-size 256]
+    curl 'http://127.0.0.1:8502/players?player=LeBron+James&player=Stephen+Curry&quarter=4'
+
+Endpoints (GET, parameters in the query string):
+
+``/shot-clock``
+    Page 1 shots and FG% per shot clock bin; ``bin_width`` in seconds
+    (default 3).
+``/catch-and-shoot``
+    Page 1 catch-and-shoot vs after-dribble FG% per level.
+``/players``
+    Page 2 per-player levels; ``player`` repeated, ``intervals=1`` adds
+    bootstrap confidence intervals.
+``/teams``
+    Page 3 per-team levels; ``team`` repeated.
+``/team-difference``
+    Page 3 difference between ``team1`` and ``team2``; ``intervals=1`` as
+    for players.
+``/options``
+    The accepted filter values, bin widths, players and teams.
+
+Every table endpoint takes the common filters ``location``, ``quarter``,
+``shoot_type`` and ``margin`` with the sidebar's choices (default "All").
+Tables are returned as ``{"query": ..., "rows": [...]}``, missing values as
+null; errors as ``{"error": ...}`` with status 400 or 404.
+
+Responses are kept in a bounded :class:`~nba_analysis.lru.LRUCache` tied
+to the loaded data (a new log starts an empty one) and carry an ETag; a
+request whose ``If-None-Match`` lists it (or is ``*``) gets an empty 304.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import sys
+from collections import namedtuple
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from . import analytics, data, shared, snapshot
+from .cube import load_shot_cube
+from .lru import LRUCache
+from .shot_clock import BIN_WIDTHS, DEFAULT_BIN_WIDTH, load_shot_clock_profile
+
+
+SERVICE_PORT = 8502
+RESPONSE_CACHE_SIZE = 256
+
+# Query parameter -> (common_filters argument, accepted values)
+FILTER_PARAMETERS = {
+    'location': ('location', analytics.LOCATION_FILTERS),
+    'quarter': ('quarter', analytics.QUARTER_FILTERS),
+    'shoot_type': ('shoot_type', analytics.SHOOT_TYPE_FILTERS),
+    'margin': ('final_margin', analytics.MARGIN_FILTERS),
+}
+
+# status is an HTTPStatus; body is the encoded JSON document
+Response = namedtuple('Response', ['status', 'body', 'etag'])
+
+
+class QueryError(ValueError):
+    """A request the API cannot answer; ``status`` is its HTTP status."""
+
+    def __init__(self, message, status=HTTPStatus.BAD_REQUEST):
+        super().__init__(message)
+        self.status = status
+
+
+def _records(table):
+    """Rows of ``table`` as JSON-ready dicts, NaN as None."""
+    return table.astype(object).where(table.notna(), None).to_dict(orient='records')
+
+
+class _Query:
+    """The parameters of one request, consumed as the endpoint reads them."""
+
+    def __init__(self, params):
+        self._params = params
+        self.used = {}
+
+    def values(self, name, required=False):
+        values = self._params.pop(name, [])
+        if required and not values:
+            raise QueryError(f"missing parameter {name!r}")
+        if values:
+            self.used[name] = values
+        return values
+
+    def value(self, name, default=None, required=False):
+        values = self.values(name, required)
+        if len(values) > 1:
+            raise QueryError(f"parameter {name!r} given more than once")
+        return values[0] if values else default
+
+    def flag(self, name):
+        value = self.value(name, '0')
+        if value not in ('0', '1'):
+            raise QueryError(f"{name} must be 0 or 1, got {value!r}")
+        return value == '1'
+
+    def filters(self):
+        selections = {}
+        for name, (argument, choices) in FILTER_PARAMETERS.items():
+            value = self.value(name, "All")
+            if value not in choices:
+                raise QueryError(f"{name} must be one of {list(choices)}, got {value!r}")
+            selections[argument] = value
+        return analytics.common_filters(**selections)
+
+    def finish(self):
+        if self._params:
+            raise QueryError(f"unknown parameters {sorted(self._params)}")
+
+
+class QueryService:
+    """Answers API requests from the shot data, without any HTTP plumbing.
+
+    The data is looked up on every request (cheaply, see
+    :func:`~nba_analysis.data.load_shot_log`), so a changed log is picked
+    up as it is by the dashboard. With ``shared_directory`` the arrays
+    published by :mod:`nba_analysis.shared` are used instead.
+    """
+
+    def __init__(self, shot_path=data.SHOT_LOG_PATH, players_path=data.PLAYERS_TEAMS_PATH,
+                 snapshot_path=snapshot.SNAPSHOT_PATH, shared_directory=None, cache_size=RESPONSE_CACHE_SIZE):
+        self.paths = (shot_path, players_path, snapshot_path)
+        self.shared_directory = shared_directory
+        self.cache_size = cache_size
+        self._endpoints = {
+            '/shot-clock': self._shot_clock,
+            '/catch-and-shoot': self._catch_and_shoot,
+            '/players': self._players,
+            '/teams': self._teams,
+            '/team-difference': self._team_difference,
+            '/options': self._options,
+        }
+
+    def _dataset(self):
+        """The shot cube, shot clock profile and response cache of the current data."""
+        if self.shared_directory:
+            dataset = shared.attach(self.shared_directory)
+            owner, shot_cube, profile = dataset.store, dataset.cube, dataset.profile
+        else:
+            owner = data.load_shot_log(*self.paths)
+            shot_cube = load_shot_cube(*self.paths)
+            profile = load_shot_clock_profile(owner)
+        responses = data.derived(owner, 'responses', lambda _: LRUCache(self.cache_size))
+        return shot_cube, profile, responses
+
+    def get(self, path, query=''):
+        """The :class:`Response` to ``GET path?query``."""
+        shot_cube, profile, responses = self._dataset()
+        endpoint = self._endpoints.get(path)
+        if endpoint is None:
+            return self._error(f"no endpoint {path!r}; try /options", HTTPStatus.NOT_FOUND)
+        params = parse_qs(query, keep_blank_values=True)
+        # Order of repeated values matters (it is the order of the rows)
+        key = (path, tuple(sorted((name, tuple(values)) for name, values in params.items())))
+        try:
+            return responses.get_or_build(key, lambda: self._build(endpoint, shot_cube, profile, params))
+        except QueryError as exc:
+            return self._error(str(exc), exc.status)
+
+    def _build(self, endpoint, shot_cube, profile, params):
+        query = _Query(dict(params))
+        document = endpoint(shot_cube, profile, query)
+        query.finish()
+        body = json.dumps(document, separators=(',', ':')).encode()
+        return Response(HTTPStatus.OK, body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+    @staticmethod
+    def _error(message, status):
+        return Response(status, json.dumps({'error': message}).encode(), None)
+
+    @staticmethod
+    def _table(query, table):
+        return {'query': query.used, 'rows': _records(table)}
+
+    def _shot_clock(self, shot_cube, profile, query):
+        filters = query.filters()
+        bin_width = query.value('bin_width', str(DEFAULT_BIN_WIDTH))
+        try:
+            width = float(bin_width)
+            if not (math.isfinite(width) and width > 0):
+                raise ValueError("bin width must be a positive number of seconds")
+            summary = profile.summary(width, **filters)
+        except (ValueError, OverflowError) as exc:
+            raise QueryError(f"bad bin_width {bin_width!r}: {exc}") from None
+        return self._table(query, summary)
+
+    def _catch_and_shoot(self, shot_cube, profile, query):
+        return self._table(query, analytics.catch_and_shoot_summary(shot_cube, **query.filters()))
+
+    def _players(self, shot_cube, profile, query):
+        filters = query.filters()
+        players = query.values('player', required=True)
+        return self._table(query, analytics.player_comparison(shot_cube, players, intervals=query.flag('intervals'),
+                                                              **filters))
+
+    def _teams(self, shot_cube, profile, query):
+        filters = query.filters()
+        return self._table(query, analytics.team_comparison(shot_cube, query.values('team', required=True),
+                                                            **filters))
+
+    def _team_difference(self, shot_cube, profile, query):
+        filters = query.filters()
+        team1 = query.value('team1', required=True)
+        team2 = query.value('team2', required=True)
+        return self._table(query, analytics.team_difference(shot_cube, team1, team2,
+                                                            intervals=query.flag('intervals'), **filters))
+
+    def _options(self, shot_cube, profile, query):
+        teams = sorted({team for team in shot_cube.player_teams if isinstance(team, str) and team})
+        return {
+            **{name: list(choices) for name, (_, choices) in FILTER_PARAMETERS.items()},
+            'bin_width': BIN_WIDTHS,
+            'famous_players': analytics.FAMOUS_PLAYERS,
+            'players': list(shot_cube.players),
+            'teams': teams,
+        }
+
+
+def _matches(if_none_match, etag):
+    """Whether an ``If-None-Match`` header lists ``etag`` (weak comparison) or is ``*``."""
+    if if_none_match is None:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return any(tag == '*' or tag.removeprefix('W/') == etag for tag in tags)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can reuse one connection for many requests
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in two writes; with Nagle's algorithm the body
+    # would wait for the client's delayed ACK (about 40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        response = self.server.service.get(url.path, url.query)
+        etag = response.etag
+        not_modified = etag is not None and _matches(self.headers.get('If-None-Match'), etag)
+        self.send_response(HTTPStatus.NOT_MODIFIED if not_modified else response.status)
+        if etag is not None:
+            self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', '0' if not_modified else str(len(response.body)))
+        self.end_headers()
+        if not not_modified:
+            self.wfile.write(response.body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    """Threaded HTTP server for a :class:`QueryService`."""
+
+    daemon_threads = True
+
+    def __init__(self, address, service, verbose=False):
+        super().__init__(address, _Handler)
+        self.service = service
+        self.verbose = verbose
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the dashboard's summary tables as JSON")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help="port to listen on (0: any free port)")
+    parser.add_argument('--shared', default=os.environ.get(shared.SHARED_ENV),
+                        help="attach to data published by nba_analysis.shared")
+    parser.add_argument('--cache-size', type=int, default=RESPONSE_CACHE_SIZE, help="responses kept")
+    parser.add_argument('--shots', default=data.SHOT_LOG_PATH, help="shot log CSV")
+    parser.add_argument('--players', default=data.PLAYERS_TEAMS_PATH, help="player/team lookup CSV")
+    parser.add_argument('--snapshot', default=snapshot.SNAPSHOT_PATH, help="snapshot to load from, if fresh")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    service = QueryService(args.shots, args.players, args.snapshot, args.shared, args.cache_size)
+    # Load the data before accepting requests
+    service.get('/options')
+    server = QueryServer((args.host, args.port), service, args.verbose)
+    host, port = server.server_address[:2]
+    print(f"Serving on http://{host}:{port}/ (see /options)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""One copy of the shot data shared by every dashboard worker on a host.
+
+Usage::
+
+    python -m nba_analysis.shared [--directory /dev/shm/nba_analysis]
+        [--shots shot_logs.csv] [--players players_teams.csv]
+        [--snapshot shot_logs.feather]
+    NBA_ANALYSIS_SHARED=/dev/shm/nba_analysis streamlit run dashboard.py
+
+A loader process builds the :class:`~nba_analysis.store.ShotStore`, the
+:class:`~nba_analysis.cube.ShotCube` and the
+:class:`~nba_analysis.shot_clock.ShotClockProfile` once and publishes their
+arrays as ``.npy`` files on a RAM-backed file system (``/dev/shm`` where
+available).
+Each worker then memory-maps them read-only with :func:`attach` instead of
+parsing the log and building its own copies: the pages live once in the
+host's shared memory, so adding workers adds their interpreters but not
+another copy of the data.
+
+Every publish goes to a new version directory and then atomically moves the
+``current`` link to it. Workers pick the new version up on their next
+:func:`attach`; mappings of the previous version stay valid until released,
+even after its files are deleted.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections import namedtuple
+
+from . import data, snapshot
+from .cube import ShotCube, load_shot_cube
+from .shot_clock import ShotClockProfile, load_shot_clock_profile
+from .store import ShotStore, load_shot_store
+
+
+# Environment variable naming the published directory a worker attaches to
+SHARED_ENV = 'NBA_ANALYSIS_SHARED'
+
+SHARED_DIRECTORY = os.path.join('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir(),
+                                'nba_analysis')
+
+_CURRENT = 'current'
+
+# store, cube and profile are memory-mapped
+SharedDataset = namedtuple('SharedDataset', ['store', 'cube', 'profile', 'version'])
+
+_attached = {}
+_attached_lock = threading.Lock()
+
+
+def publish(directory=SHARED_DIRECTORY, shot_path=data.SHOT_LOG_PATH, players_path=data.PLAYERS_TEAMS_PATH,
+            snapshot_path=snapshot.SNAPSHOT_PATH):
+    """Build the store, cube and shot clock profile and publish them under ``directory``.
+
+    Returns the new version directory; older versions are removed.
+    """
+    shot_store = load_shot_store(shot_path, players_path, snapshot_path)
+    shot_cube = load_shot_cube(shot_path, players_path, snapshot_path)
+    profile = load_shot_clock_profile(shot_store)
+
+    os.makedirs(directory, exist_ok=True)
+    version = tempfile.mkdtemp(prefix='v', dir=directory)
+    os.chmod(version, 0o755)
+    shot_store.save(os.path.join(version, 'store'))
+    shot_cube.save_arrays(os.path.join(version, 'cube'))
+    profile.save_arrays(os.path.join(version, 'shot_clock'))
+
+    # Swap the link in one rename so a worker never sees a partial version
+    link = os.path.join(directory, _CURRENT)
+    tmp_link = f'{link}.{os.getpid()}'
+    os.symlink(os.path.basename(version), tmp_link)
+    os.replace(tmp_link, link)
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if name.startswith('v') and path != version and os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+    return version
+
+
+def attach(directory=SHARED_DIRECTORY):
+    """Map the version currently published under ``directory``, read-only.
+
+    Attaching is done once per version and process; later calls return the
+    same :class:`SharedDataset` until a new version is published.
+    """
+    version = os.path.realpath(os.path.join(directory, _CURRENT))
+    with _attached_lock:
+        dataset = _attached.get(version)
+        if dataset is not None:
+            return dataset
+        if not os.path.isdir(version):
+            raise FileNotFoundError(f"no shot data published in {directory}; "
+                                    f"run python -m nba_analysis.shared first")
+        dataset = SharedDataset(ShotStore.load(os.path.join(version, 'store')),
+                                ShotCube.load_arrays(os.path.join(version, 'cube')),
+                                ShotClockProfile.load_arrays(os.path.join(version, 'shot_clock')),
+                                version)
+        # Release older versions of this directory
+        for stale in [path for path in _attached if os.path.dirname(path) == os.path.dirname(version)]:
+            del _attached[stale]
+        _attached[version] = dataset
+        return dataset
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Publish the shot data into shared memory")
+    parser.add_argument('--directory', default=SHARED_DIRECTORY, help="directory to publish into")
+    parser.add_argument('--shots', default=data.SHOT_LOG_PATH, help="shot log CSV")
+    parser.add_argument('--players', default=data.PLAYERS_TEAMS_PATH, help="player/team lookup CSV")
+    parser.add_argument('--snapshot', default=snapshot.SNAPSHOT_PATH, help="snapshot to load from, if fresh")
+    args = parser.parse_args(argv)
+
+    version = publish(args.directory, args.shots, args.players, args.snapshot)
+    size = sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(version) for name in names)
+    print(f"Published {size / 2**20:.1f} MiB to {version}")
+    print(f"Start the workers with {SHARED_ENV}={args.directory}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Shots and shooting percentage by time left on the shot clock, at any bin width.
+
+The shot log records the shot clock to a tenth of a second, so every shot
+falls into one of 240 intervals of 0.1s between 0 and 24 seconds.
+:class:`ShotClockProfile` counts made shots and attempts per such interval
+and per combination of the sidebar filters, in one pass over the shots when
+the data is loaded. A profile at a coarser bin width adds up consecutive
+intervals of the filtered counts, so it costs the same at any width.
+
+Intervals are closed on the right like the Page 1 bins in
+:mod:`nba_analysis.features`: ``(0, 3]``, ``(3, 6]``, ... A shot taken with
+exactly 0 on the clock is in none of them, and the 3-second profile equals
+the ``SHOT_CLOCK_CATEGORY`` summary of the cube.
+"""
+import functools
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import data
+from .aggregation import encode, summary_frame
+from .cube import CLOSE_GAME_MARGIN, _with_totals
+from .options import BIN_WIDTHS, DEFAULT_BIN_WIDTH
+
+
+SHOT_CLOCK_SECONDS = 24
+
+# Resolution of the counts, in seconds; bin widths are multiples of it
+CLOCK_STEP = 0.1
+_TICKS = round(SHOT_CLOCK_SECONDS / CLOCK_STEP)
+
+_COLUMNS = ['LOCATION', 'PERIOD', 'PTS_TYPE', 'FINAL_MARGIN', 'SHOT_CLOCK', 'FGM']
+
+
+def clock_ticks(shot_clock):
+    """Interval of each shot clock value, 0 for ``(0, 0.1]``; -1 outside ``(0, 24]``."""
+    ticks = np.rint(np.asarray(shot_clock, dtype=np.float64) / CLOCK_STEP)
+    valid = (ticks >= 1) & (ticks <= _TICKS)
+    return np.where(valid, ticks - 1, -1).astype(np.int16)
+
+
+def _width_ticks(bin_width):
+    """Intervals per bin of ``bin_width`` seconds; a bin never spans more than the clock."""
+    ticks = round(bin_width / CLOCK_STEP) if math.isfinite(bin_width) else 0
+    if ticks < 1 or not np.isclose(ticks * CLOCK_STEP, bin_width):
+        raise ValueError(f"bin width must be a multiple of {CLOCK_STEP}s, got {bin_width!r}")
+    return min(ticks, _TICKS)
+
+
+@functools.lru_cache(maxsize=None)
+def bin_labels(bin_width):
+    """Chart labels of the bins of ``bin_width`` seconds, e.g. ``'0-3'``."""
+    width = _width_ticks(bin_width)
+    edges = [min(start, _TICKS) * CLOCK_STEP for start in range(0, _TICKS + width, width)]
+    return tuple(f'{start:g}-{stop:g}' for start, stop in zip(edges[:-1], edges[1:]))
+
+
+def _observed_axes(shot_data):
+    """Sorted locations, periods and points types of ``shot_data``."""
+    return [list(encode(shot_data[column])[1]) for column in ('LOCATION', 'PERIOD', 'PTS_TYPE')]
+
+
+def _count(shot_data, axes):
+    """Made shots and attempts of ``shot_data`` per cell over ``axes``, without totals."""
+    codes = [encode(shot_data[column], values)[0]
+             for column, values in zip(('LOCATION', 'PERIOD', 'PTS_TYPE'), axes)]
+    codes += [(shot_data['FINAL_MARGIN'].abs() > CLOSE_GAME_MARGIN).to_numpy().astype(np.int64),
+              clock_ticks(shot_data['SHOT_CLOCK'])]
+    shape = [len(values) for values in axes] + [2, _TICKS]
+
+    cell = np.zeros(len(shot_data), dtype=np.int64)
+    valid = np.ones(len(shot_data), dtype=bool)
+    for axis_codes, size in zip(codes, shape):
+        cell = cell * size + np.maximum(axis_codes, 0)
+        valid &= axis_codes >= 0
+    cell = cell[valid]
+    n_cells = int(np.prod(shape))
+    shots = np.bincount(cell, minlength=n_cells).reshape(shape)
+    made = np.bincount(cell, weights=shot_data['FGM'].to_numpy()[valid],
+                       minlength=n_cells).astype(np.int64).reshape(shape)
+    return made, shots
+
+
+def _reindexed(counts, axes, index):
+    reindexed = np.zeros([len(values) for values in axes] + [2, _TICKS], dtype=counts.dtype)
+    reindexed[index] = counts
+    return reindexed
+
+
+class ShotClockProfile:
+    """Made shots and attempts per 0.1s of shot clock and filter combination.
+
+    The counts are laid out like the filter axes of
+    :class:`~nba_analysis.cube.ShotCube`, totals slot included, with the
+    shot clock interval as the last axis:
+
+        location x period x points type x close game x interval
+    """
+
+    def __init__(self, made, shots, locations, periods, pts_types):
+        self.made = made
+        self.shots = shots
+        self.axes = [list(locations), list(periods), list(pts_types)]
+        self._positions = {
+            'location': {value: position for position, value in enumerate(locations)},
+            'period': {value: position for position, value in enumerate(periods)},
+            'pts_type': {value: position for position, value in enumerate(pts_types)},
+            'close_game': {True: 0, False: 1},
+        }
+
+    @classmethod
+    def from_frame(cls, shot_data):
+        """Count every shot of ``shot_data`` (or of a :class:`~nba_analysis.store.ShotStore`)."""
+        if not isinstance(shot_data, pd.DataFrame):
+            shot_data = shot_data.frame(columns=_COLUMNS)
+        axes = _observed_axes(shot_data)
+        made, shots = _count(shot_data, axes)
+        return cls(_with_totals(made), _with_totals(shots), *axes)
+
+    def updated(self, added=None, removed=None):
+        """Return a new profile with the shots of ``added`` counted in and those
+        of ``removed`` counted out, like :meth:`~nba_analysis.cube.ShotCube.updated`.
+
+        This profile is left unchanged.
+        """
+        axes = self.axes
+        made = self.made[:-1, :-1, :-1, :-1].astype(np.int64)
+        shots = self.shots[:-1, :-1, :-1, :-1].astype(np.int64)
+        if added is not None and len(added):
+            merged = [sorted(set(values) | set(other)) for values, other in zip(axes, _observed_axes(added))]
+            if merged != axes:
+                positions = [pd.Index(new_values).get_indexer(values) for values, new_values in zip(axes, merged)]
+                index = np.ix_(*positions, np.arange(2), np.arange(_TICKS))
+                made, shots = [_reindexed(counts, merged, index) for counts in (made, shots)]
+                axes = merged
+            added_made, added_shots = _count(added, axes)
+            made += added_made
+            shots += added_shots
+        if removed is not None and len(removed):
+            removed_made, removed_shots = _count(removed, axes)
+            made -= removed_made
+            shots -= removed_shots
+        return ShotClockProfile(_with_totals(made), _with_totals(shots), *axes)
+
+    def save_arrays(self, directory):
+        """Write the profile to ``directory`` as one ``.npy`` file per array."""
+        os.makedirs(directory, exist_ok=True)
+        arrays = {'made': self.made, 'shots': self.shots, 'locations': np.array(self.axes[0], dtype=str),
+                  'periods': np.array(self.axes[1]), 'pts_types': np.array(self.axes[2])}
+        for name, values in arrays.items():
+            np.save(os.path.join(directory, f'{name}.npy'), values)
+
+    @classmethod
+    def load_arrays(cls, directory, mmap_mode='r'):
+        """Read a profile written by :meth:`save_arrays`.
+
+        The counts are memory-mapped read-only by default, like those of
+        :meth:`~nba_analysis.cube.ShotCube.load_arrays`.
+        """
+        arrays = {}
+        for name in ('made', 'shots', 'locations', 'periods', 'pts_types'):
+            arrays[name] = np.load(os.path.join(directory, f'{name}.npy'),
+                                   mmap_mode=mmap_mode if name in ('made', 'shots') else None)
+        return cls(arrays['made'], arrays['shots'], arrays['locations'].tolist(), arrays['periods'].tolist(),
+                   arrays['pts_types'].tolist())
+
+    def _filtered(self, counts, filters):
+        index = []
+        for name, positions in self._positions.items():
+            value = filters.get(name)
+            # The last slot of every filter axis is the total over the axis
+            position = -1 if value is None else positions.get(value)
+            if position is None:
+                return np.zeros(_TICKS, dtype=np.int64)
+            index.append(position)
+        return counts[tuple(index)].astype(np.int64)
+
+    def summary(self, bin_width=DEFAULT_BIN_WIDTH, location=None, period=None, pts_type=None,
+                close_game=None):
+        """Shots and shooting percentage per bin of ``bin_width`` seconds.
+
+        The filters are those of :meth:`~nba_analysis.cube.ShotCube.summary`.
+        The columns are those of a cube summary, ``Category`` holding the
+        bin labels; a width that does not divide 24 leaves a shorter last bin.
+        """
+        filters = {'location': location, 'period': period, 'pts_type': pts_type,
+                   'close_game': close_game}
+        starts = np.arange(0, _TICKS, _width_ticks(bin_width))
+        made = np.add.reduceat(self._filtered(self.made, filters), starts)
+        shots = np.add.reduceat(self._filtered(self.shots, filters), starts)
+        return summary_frame([], [bin_labels(bin_width)], made, shots)
+
+
+def load_shot_clock_profile(shot_data):
+    """Return the profile of ``shot_data``, counted once per loaded log.
+
+    ``shot_data`` is the loaded :class:`~nba_analysis.data.ShotLog`, a shot
+    frame or an attached :class:`~nba_analysis.store.ShotStore`. The
+    profile of a log is updated with the games ingested into it.
+    """
+    return data.derived(shot_data, 'shot_clock', ShotClockProfile.from_frame,
+                        update=ShotClockProfile.updated)
@@ -0,0 +1,54 @@
+"""Columnar (Feather / Arrow IPC) snapshots of the merged shot frame.
+
+Snapshots are written uncompressed so they can be memory-mapped: numeric
+columns are then handed to pandas straight from the page cache instead of
+being parsed from Latin-1 text. pyarrow is optional; without it
+:func:`available` is false and callers fall back to the CSV files.
+"""
+import os
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - depends on the environment
+    feather = None
+
+
+SNAPSHOT_PATH = "shot_logs.feather"
+
+
+def available():
+    """Return True if pyarrow is installed and snapshots can be used."""
+    return feather is not None
+
+
+def is_newer(path, *source_paths):
+    """Return True if ``path`` exists and is at least as new as every source.
+
+    Sources that do not exist are ignored, so a deployment may ship a derived
+    file alone without the CSV it was built from.
+    """
+    if not os.path.exists(path):
+        return False
+    mtime = os.stat(path).st_mtime_ns
+    return all(os.stat(source).st_mtime_ns <= mtime
+               for source in source_paths if os.path.exists(source))
+
+
+def is_fresh(snapshot_path, *source_paths):
+    """Return True if the snapshot can be read and is newer than every source."""
+    return available() and is_newer(snapshot_path, *source_paths)
+
+
+def write_snapshot(frame, path=SNAPSHOT_PATH):
+    """Write ``frame`` atomically so readers never see a partial file."""
+    tmp_path = f"{path}.tmp"
+    feather.write_feather(frame, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def read_snapshot(path=SNAPSHOT_PATH):
+    """Read a snapshot, memory-mapping the file."""
+    table = feather.read_table(path, memory_map=True)
+    # split_blocks avoids consolidating columns into 2-D blocks, which would
+    # copy every numeric column out of the mapping.
+    return table.to_pandas(split_blocks=True)
@@ -0,0 +1,36 @@
+"""Work started once per process in the background, for a fast dashboard start.
+
+In a new process the first session would wait for numpy, pandas and the
+data to load before anything is drawn. :func:`start_once` runs that work
+in a daemon thread instead, so the dashboard can draw its sidebar and a
+placeholder meanwhile; later sessions find the work done. Only the standard
+library is imported here.
+"""
+import threading
+from concurrent.futures import Future
+
+
+_started = {}
+_lock = threading.Lock()
+
+
+def start_once(name, work):
+    """The Future of ``work()``, started in a daemon thread by the first call with ``name``.
+
+    Later calls with the same ``name`` return the same Future, whatever
+    their ``work``; an exception raised by ``work`` is kept in it.
+    """
+    with _lock:
+        future = _started.get(name)
+        if future is None:
+            future = _started[name] = Future()
+            threading.Thread(target=_run, args=(future, work), name=f'startup-{name}', daemon=True).start()
+    return future
+
+
+def _run(future, work):
+    future.set_running_or_notify_cancel()
+    try:
+        future.set_result(work())
+    except BaseException as exc:
+        future.set_exception(exc)
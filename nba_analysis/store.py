@@ -0,0 +1,291 @@
+"""Compact column store of the merged shot log.
+
+Every column the dashboard reads is kept as one contiguous, typed NumPy
+array (int8/int16/int32/float32) instead of a frame column. Players and
+teams are dictionary-encoded: ``player_name`` and ``team_name`` hold int16
+ids into the players and teams of players_teams.csv, so selecting players
+matches the requested names against the ~300-entry dictionary once and then
+compares small integers, instead of comparing strings on every shot. The
+bin columns and ``LOCATION`` are stored as their int8 category codes, and
+``Density Cell`` holds each shot's cell of the
+:mod:`~nba_analysis.density` grid.
+
+Filters never copy the store: :meth:`ShotStore.mask` folds every predicate
+into one boolean mask, and :meth:`ShotStore.rows` returns the selected row
+positions, from which only the columns a table needs (including the
+precomputed bins) are gathered. :meth:`ShotStore.frame` turns (a selection
+of) the store back into the frame the rest of the package expects, without
+copying the name strings.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from . import data, snapshot
+from .aggregation import encode
+from .cube import CLOSE_GAME_MARGIN
+from .density import grid_cells
+from .features import BINS
+
+
+# column -> dtype of its array; dictionary-encoded columns hold codes
+STORE_DTYPES = {
+    'GAME_ID': np.int32,
+    'player_name': np.int16,
+    'team_name': np.int16,
+    'LOCATION': np.int8,
+    'FINAL_MARGIN': np.int8,
+    'PERIOD': np.int8,
+    'PTS_TYPE': np.int8,
+    'FGM': np.int8,
+    'DRIBBLES': np.int8,
+    'SHOT_CLOCK': np.float32,
+    'TOUCH_TIME': np.float32,
+    'SHOT_DIST': np.float32,
+    'CLOSE_DEF_DIST': np.float32,
+    'Catch and Shoot': np.bool_,
+    **{column: np.int8 for column in BINS},
+    'Density Cell': np.int16,
+}
+
+# Columns stored as codes into a dictionary of values
+_DICTIONARY_COLUMNS = ('player_name', 'team_name', 'LOCATION') + tuple(BINS)
+
+# TIME_LEFT is a copy of SHOT_CLOCK in the frame; the store keeps one array
+_ALIASES = {'TIME_LEFT': 'SHOT_CLOCK'}
+
+# Columns computed by the store itself rather than taken from the frame
+_COMPUTED_COLUMNS = ('team_name', 'Density Cell')
+
+# Columns of the frame the store turns back into
+_FRAME_COLUMNS = [column for column in STORE_DTYPES if column != 'Density Cell'] + list(_ALIASES)
+
+
+def _downcast(column, values, dtype):
+    """``values`` as a contiguous array of ``dtype``, refusing to truncate."""
+    values = np.asarray(values)
+    if np.issubdtype(dtype, np.integer) and len(values):
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise ValueError(f"{column} values do not fit in {np.dtype(dtype).name}")
+    return np.ascontiguousarray(values, dtype=dtype)
+
+
+def _encode_columns(shot_data, dictionaries, player_teams):
+    """The store columns of ``shot_data``, encoded against ``dictionaries``."""
+    columns = {}
+    for column, dtype in STORE_DTYPES.items():
+        if column in _COMPUTED_COLUMNS:
+            continue
+        if column in dictionaries:
+            values = encode(shot_data[column], dictionaries[column])[0]
+        else:
+            values = shot_data[column].to_numpy()
+        columns[column] = _downcast(column, values, dtype)
+    # Team of every shot, looked up from its player id (-1 stays -1)
+    team_lookup = np.full(len(player_teams) + 1, -1, dtype=player_teams.dtype)
+    team_lookup[:-1] = player_teams
+    columns['team_name'] = team_lookup[columns['player_name']]
+    columns['Density Cell'] = grid_cells(columns['SHOT_DIST'], columns['CLOSE_DEF_DIST'])
+    return {column: columns[column] for column in STORE_DTYPES}
+
+
+class ShotStore:
+    """Typed column arrays of the shot log with dictionary-encoded names."""
+
+    def __init__(self, columns, dictionaries, player_teams):
+        # column -> 1-D array, all of the same length
+        self.columns = columns
+        # encoded column -> pd.Index of the values its codes refer to
+        self.dictionaries = dictionaries
+        # team id of each player id (-1 if not in players_teams.csv)
+        self.player_teams = player_teams
+        self._player_ids = {name.lower(): code for code, name in enumerate(self.players)}
+        self._team_ids = {name: code for code, name in enumerate(self.teams)}
+        # Arrays the columns are the start of, and how many of their rows are
+        # written, shared with the stores updated from this one (see updated)
+        self._buffers = None
+        self._filled = None
+
+    @classmethod
+    def from_frame(cls, shot_data, player_df=None):
+        """Encode the merged ``shot_data`` against the ``player_df`` lookup.
+
+        Players of the log missing from ``player_df`` are added to the end
+        of the dictionary, without a team.
+        """
+        if player_df is None:
+            player_df = data.read_players_teams()
+        players = pd.Index(player_df['Player'].astype(object)).drop_duplicates()
+        observed = encode(shot_data['player_name'])[1]
+        players = players.append(observed.difference(players))
+        teams = pd.Index(sorted(player_df['team_name'].dropna().unique()), dtype=object)
+        team_of_player = player_df.drop_duplicates('Player').set_index('Player')['team_name']
+        player_teams = teams.get_indexer(players.map(team_of_player.to_dict()))
+
+        dictionaries = {'player_name': players, 'team_name': teams,
+                        'LOCATION': encode(shot_data['LOCATION'])[1]}
+        dictionaries.update({column: pd.Index(labels) for column, (_, _, labels, _) in BINS.items()})
+        player_teams = _downcast('team_name', player_teams, STORE_DTYPES['team_name'])
+        return cls(_encode_columns(shot_data, dictionaries, player_teams), dictionaries, player_teams)
+
+    def updated(self, added=None, removed=None):
+        """Return a new store with the shots of ``added`` appended and those of
+        the games of ``removed`` taken out.
+
+        Both are frames shaped like the loaded shot frame. Only the added
+        shots are encoded: players and ``LOCATION`` values new to the store
+        are appended to its dictionaries (new players without a team), so
+        the codes of the stored shots stay valid. Appended shots go to spare
+        capacity at the end of the arrays when there is some, so the arrays
+        are not copied on every update; taking shots out copies them. This
+        store is left unchanged.
+        """
+        dictionaries = dict(self.dictionaries)
+        player_teams = self.player_teams
+        if added is None:
+            added = self.frame(rows=[])
+        new_players = encode(added['player_name'])[1].difference(dictionaries['player_name'])
+        if len(new_players):
+            dictionaries['player_name'] = dictionaries['player_name'].append(new_players)
+            player_teams = np.append(player_teams, np.full(len(new_players), -1, dtype=player_teams.dtype))
+        new_locations = encode(added['LOCATION'])[1].difference(dictionaries['LOCATION'])
+        if len(new_locations):
+            dictionaries['LOCATION'] = dictionaries['LOCATION'].append(new_locations)
+        appended = _encode_columns(added, dictionaries, player_teams)
+
+        columns, buffers, filled = self.columns, self._buffers, self._filled
+        if removed is not None and len(removed):
+            keep = ~np.isin(columns['GAME_ID'], pd.unique(removed['GAME_ID']))
+            columns = {column: values[keep] for column, values in columns.items()}
+            buffers = None
+        n_rows = len(columns['FGM'])
+        size = n_rows + len(added)
+        # The spare capacity is free only to the store holding the last rows written to it
+        if buffers is None or filled[0] != n_rows or len(buffers['FGM']) < size:
+            buffers = {column: np.empty(max(2 * size, 1024), dtype=values.dtype)
+                       for column, values in columns.items()}
+            for column, values in columns.items():
+                buffers[column][:n_rows] = values
+            filled = [n_rows]
+        for column, values in appended.items():
+            buffers[column][n_rows:size] = values
+        filled[0] = size
+        shot_store = ShotStore({column: values[:size] for column, values in buffers.items()},
+                               dictionaries, player_teams)
+        shot_store._buffers, shot_store._filled = buffers, filled
+        return shot_store
+
+    def save(self, directory):
+        """Write the store to ``directory`` as one ``.npy`` file per array."""
+        os.makedirs(directory, exist_ok=True)
+        for column, values in self.columns.items():
+            np.save(os.path.join(directory, f'{column}.npy'), values)
+        for column, values in self.dictionaries.items():
+            np.save(os.path.join(directory, f'{column}.dictionary.npy'), values.to_numpy(dtype=str))
+        np.save(os.path.join(directory, 'player_teams.npy'), self.player_teams)
+
+    @classmethod
+    def load(cls, directory, mmap_mode='r'):
+        """Read a store written by :meth:`save`.
+
+        The columns are memory-mapped read-only by default: processes
+        loading the same files share one copy of their pages.
+        """
+        def path(name):
+            return os.path.join(directory, f'{name}.npy')
+
+        columns = {column: np.load(path(column), mmap_mode=mmap_mode) for column in STORE_DTYPES}
+        dictionaries = {column: pd.Index(np.load(path(f'{column}.dictionary')).tolist(), dtype=object)
+                        for column in _DICTIONARY_COLUMNS}
+        return cls(columns, dictionaries, np.load(path('player_teams')))
+
+    def __len__(self):
+        return len(self.columns['FGM'])
+
+    @property
+    def players(self):
+        return self.dictionaries['player_name']
+
+    @property
+    def teams(self):
+        return self.dictionaries['team_name']
+
+    def memory_usage(self):
+        """Bytes held per column, plus the dictionaries, as a Series."""
+        usage = {column: values.nbytes for column, values in self.columns.items()}
+        usage['dictionaries'] = (self.player_teams.nbytes
+                                 + sum(values.memory_usage(deep=True) for values in self.dictionaries.values()))
+        return pd.Series(usage)
+
+    @property
+    def nbytes(self):
+        return int(self.memory_usage().sum())
+
+    def player_ids(self, names):
+        """Ids of the players ``names`` (any capitalisation); -1 if unknown."""
+        return np.array([self._player_ids.get(name.lower(), -1) for name in names], dtype=np.int16)
+
+    def team_ids(self, names):
+        """Ids of the teams ``names``; -1 if unknown."""
+        return np.array([self._team_ids.get(name, -1) for name in names], dtype=np.int16)
+
+    def mask(self, location=None, period=None, pts_type=None, close_game=None, players=None, teams=None):
+        """One boolean mask of the shots passing every given filter.
+
+        Filters take the values of :meth:`~nba_analysis.cube.ShotCube.summary`
+        plus ``players`` and ``teams`` name lists; None means "All". Every
+        predicate is evaluated into the same scratch buffer and folded into
+        the mask in place, so memory does not grow with the number of filters.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        scratch = np.empty(len(self), dtype=bool)
+        if location is not None:
+            locations = self.dictionaries['LOCATION']
+            code = locations.get_loc(location) if location in locations else -2
+            mask &= np.equal(self.columns['LOCATION'], code, out=scratch)
+        for column, value in (('PERIOD', period), ('PTS_TYPE', pts_type)):
+            if value is not None:
+                mask &= np.equal(self.columns[column], value, out=scratch)
+        if close_game is not None:
+            np.less_equal(np.abs(self.columns['FINAL_MARGIN']), CLOSE_GAME_MARGIN, out=scratch)
+            mask &= scratch if close_game else np.logical_not(scratch, out=scratch)
+        for column, ids in (('player_name', None if players is None else self.player_ids(players)),
+                            ('team_name', None if teams is None else self.team_ids(teams))):
+            if ids is not None:
+                # Membership per id, with a trailing False slot for code -1
+                wanted = np.zeros(len(self.dictionaries[column]) + 1, dtype=bool)
+                wanted[ids[ids >= 0]] = True
+                mask &= wanted[self.columns[column]]
+        return mask
+
+    def rows(self, **filters):
+        """Row positions of the shots passing the :meth:`mask` filters."""
+        return np.flatnonzero(self.mask(**filters))
+
+    def frame(self, rows=None, columns=None):
+        """The store (or its ``rows``) as a shot frame with categorical names and bins."""
+        columns = list(columns) if columns is not None else _FRAME_COLUMNS
+        result = {}
+        for column in columns:
+            values = self.columns[_ALIASES.get(column, column)]
+            if rows is not None:
+                values = values[rows]
+            if column in self.dictionaries:
+                values = pd.Categorical.from_codes(values, categories=self.dictionaries[column],
+                                                   validate=False)
+            result[column] = values
+        return pd.DataFrame(result)
+
+
+def load_shot_store(shot_path=data.SHOT_LOG_PATH, players_path=data.PLAYERS_TEAMS_PATH,
+                    snapshot_path=snapshot.SNAPSHOT_PATH):
+    """Return the store of the shared shot log, built once per loaded log.
+
+    Ingested games are appended to the store of the log they extend.
+    """
+    shot_log = data.load_shot_log(shot_path, players_path, snapshot_path)
+    return data.derived(shot_log, 'store',
+                        lambda log: ShotStore.from_frame(log.frame(), data.read_players_teams(players_path)),
+                        update=ShotStore.updated)
@@ -0,0 +1,118 @@
+"""Every dashboard chart as a figure cache key, a table and a figure builder.
+
+The Streamlit script renders these views; :mod:`nba_analysis.prefetch`
+builds the views of the pages not on screen ahead of time. Both must use
+the same keys for the figure cache to be shared, so the keys are made here
+and nowhere else. A key holds the page, the chart, the common filters and
+the chart's own selections.
+"""
+from collections import namedtuple
+
+from . import analytics, figures
+from .options import (DEFAULT_BIN_WIDTH, DEFAULT_BUBBLE_PLAYERS, DEFAULT_LINE_PLAYERS, DEFAULT_MULTI_TEAMS,
+                      DEFAULT_TEAMS, PAGES)
+
+
+# ``table()`` computes the chart's DataFrame and ``figure(table)`` builds
+# the figure from it (or returns None when there is nothing to draw)
+ChartView = namedtuple('ChartView', ['key', 'table', 'figure'])
+
+
+def shot_clock_view(profile, filters, bin_width=DEFAULT_BIN_WIDTH):
+    """Shots and shooting percentage by time left on the shot clock, per ``bin_width`` seconds (Page 1)."""
+    return ChartView(('page1', 'fig_dual', tuple(filters.items()), bin_width),
+                     lambda: profile.summary(bin_width, **filters),
+                     figures.shot_clock_figure)
+
+
+def catch_and_shoot_view(shot_cube, filters):
+    """Catch-and-shoot vs after-dribble shooting percentage (Page 1)."""
+    return ChartView(('page1', 'fig3', tuple(filters.items())),
+                     lambda: analytics.catch_and_shoot_summary(shot_cube, **filters),
+                     figures.catch_and_shoot_figure)
+
+
+def player_bubble_view(shot_cube, filters, players, intervals=False):
+    """Bubble chart of ``players``; no figure when they have no shots (Page 2).
+
+    With ``intervals``, bootstrap confidence intervals are drawn as error bars.
+    """
+    def table():
+        summary_table = analytics.player_comparison(shot_cube, players, intervals=intervals, **filters)
+        summary_table['Shooting Percentage'] = summary_table['Shooting Percentage'].round(1)
+        return summary_table
+
+    def figure(summary_table):
+        if summary_table['Shot Count'].sum() == 0:
+            return None
+        return figures.player_bubble_figure(summary_table, players)
+
+    return ChartView(('page2', 'fig_bubble', tuple(filters.items()), tuple(players), intervals), table, figure)
+
+
+def player_line_view(shot_cube, filters, player1, player2, intervals=False):
+    """Line/bar comparison of two players, optionally with confidence intervals (Page 2)."""
+    return ChartView(('page2', 'fig_line', tuple(filters.items()), player1, player2, intervals),
+                     lambda: analytics.player_comparison(shot_cube, [player1, player2], intervals=intervals,
+                                                         **filters),
+                     lambda summary: figures.player_line_figure(summary, player1, player2))
+
+
+def shot_density_view(density, filters, players=None):
+    """Shot distribution over shot and defender distance of ``players``, or of every player (Page 2).
+
+    ``density`` is a :class:`~nba_analysis.density.ShotDensity`; no figure
+    when the players have no shots. The figure is a
+    :class:`~nba_analysis.figures.SizedFigure`, so its payload is measured
+    once per build rather than on every rerun that shows it.
+    """
+    def figure(summary):
+        if summary['Shots'].sum() == 0:
+            return None
+        return figures.sized_figure(figures.shot_density_figure(summary))
+
+    return ChartView(('page2', 'fig_density', tuple(filters.items()), None if players is None else tuple(players)),
+                     lambda: density.summary(players=players, **filters),
+                     figure)
+
+
+def team_bar_view(shot_cube, filters, team, team_color):
+    """Shooting percentage of one team by category (Page 3)."""
+    return ChartView(('page3', 'team_bar', tuple(filters.items()), team, team_color),
+                     lambda: analytics.team_levels(shot_cube, team, **filters),
+                     lambda levels: figures.team_bar_figure(levels, team_color,
+                                                            f'Shooting Percentage by Category for {team}'))
+
+
+def team_difference_view(shot_cube, filters, team1, team2, intervals=False):
+    """Shooting percentage difference between two teams, optionally with confidence intervals (Page 3)."""
+    return ChartView(('page3', 'comparison_fig', tuple(filters.items()), team1, team2, intervals),
+                     lambda: analytics.team_difference(shot_cube, team1, team2, intervals=intervals, **filters),
+                     lambda difference: figures.team_difference_figure(difference, team1))
+
+
+def multi_team_view(shot_cube, filters, teams):
+    """Shooting percentage of several teams by category (Page 3)."""
+    return ChartView(('page3', 'fig_multi', tuple(filters.items()), tuple(teams)),
+                     lambda: analytics.team_comparison(shot_cube, teams, **filters),
+                     figures.multi_team_figure)
+
+
+def page_views(page, shot_cube, profile, filters):
+    """The views ``page`` shows with its default selections, top to bottom.
+
+    ``profile`` is the :class:`~nba_analysis.shot_clock.ShotClockProfile`
+    of the data in ``shot_cube``.
+    """
+    if page == PAGES[0]:
+        return [shot_clock_view(profile, filters), catch_and_shoot_view(shot_cube, filters)]
+    if page == PAGES[1]:
+        return [player_bubble_view(shot_cube, filters, DEFAULT_BUBBLE_PLAYERS),
+                player_line_view(shot_cube, filters, *DEFAULT_LINE_PLAYERS)]
+    if page == PAGES[2]:
+        team1, team2 = DEFAULT_TEAMS
+        return [team_bar_view(shot_cube, filters, team1, figures.TEAM_COLORS[0]),
+                team_bar_view(shot_cube, filters, team2, figures.TEAM_COLORS[1]),
+                team_difference_view(shot_cube, filters, team1, team2),
+                multi_team_view(shot_cube, filters, DEFAULT_MULTI_TEAMS)]
+    raise ValueError(f"unknown page {page!r}")
@@ -0,0 +1,23 @@
+"""Assertions shared by the test modules."""
+import numpy as np
+import pandas as pd
+
+from .support import TABLE_FILTERS, TABLES
+
+
+def assert_cubes_equal(expected, actual):
+    """Same counts on the same axes, and the same table for every chart."""
+    np.testing.assert_array_equal(expected.made, actual.made)
+    np.testing.assert_array_equal(expected.shots, actual.shots)
+    assert list(expected.players) == list(actual.players)
+    pd.testing.assert_series_equal(expected.player_teams, actual.player_teams)
+    for name, values in expected.axes.items():
+        assert list(values) == list(actual.axes[name]), name
+    assert_same_tables(expected, actual)
+
+
+def assert_same_tables(expected, actual):
+    """Every chart's table from ``actual`` equals the one from ``expected``."""
+    for filters in TABLE_FILTERS:
+        for table in TABLES.values():
+            pd.testing.assert_frame_equal(table(expected, filters), table(actual, filters))
@@ -0,0 +1,74 @@
+"""Shared fixtures: a small synthetic season and the structures built from it.
+
+The real log is not part of the repository, so the tests use the same
+synthetic logs as the benchmarks, at a size that keeps the suite fast while
+every player offered on Page 2 still has shots.
+"""
+import os
+import shutil
+import tracemalloc
+
+import pytest
+
+from nba_analysis import data
+from nba_analysis.cube import ShotCube
+from nba_analysis.instrumentation import StageTimer
+from nba_analysis.store import ShotStore
+
+from .synthetic import synthetic_shot_data, write_shot_log
+
+
+N_SHOTS = 20_000
+
+# The dashboard's common filters: none, and all of them at once
+FILTERS = [
+    {},
+    {'location': 'H', 'period': 2, 'pts_type': 3, 'close_game': True},
+    {'location': 'A', 'pts_type': 2, 'close_game': False},
+]
+
+
+@pytest.fixture(scope='session')
+def shot_data():
+    return synthetic_shot_data(N_SHOTS)
+
+
+@pytest.fixture(scope='session')
+def shot_cube(shot_data):
+    return ShotCube.from_frame(shot_data)
+
+
+@pytest.fixture(scope='session')
+def shot_store(shot_data):
+    return ShotStore.from_frame(shot_data)
+
+
+@pytest.fixture(params=FILTERS, ids=['no filters', 'home 2nd quarter threes', 'away twos'])
+def filters(request):
+    return request.param
+
+
+@pytest.fixture(scope='session')
+def shot_files(tmp_path_factory):
+    """Paths of a synthetic ``shots`` log and a copy of the ``players`` lookup, read-only."""
+    directory = tmp_path_factory.mktemp('shot_files')
+    players_path = os.path.join(directory, 'players_teams.csv')
+    shutil.copy(data.PLAYERS_TEAMS_PATH, players_path)
+    shot_path = write_shot_log(os.path.join(directory, 'shot_logs.csv'), N_SHOTS, seed=1,
+                               players_path=players_path)
+    return {'shots': shot_path, 'players': players_path}
+
+
+@pytest.fixture
+def memory_timer():
+    """A timer tracing memory, with tracemalloc stopped again afterwards.
+
+    Left running, tracing would slow every later test and make their peaks
+    depend on the order the tests run in.
+    """
+    was_tracing = tracemalloc.is_tracing()
+    try:
+        yield StageTimer(trace_memory=True)
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
@@ -0,0 +1,225 @@
+"""Reference implementations, selections and helpers shared by the tests.
+
+The benchmarks time the package against the same references and import
+them from here, so editing a benchmark cannot change what the tests check.
+"""
+import itertools
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from nba_analysis import analytics, shared, shot_clock
+from nba_analysis.aggregation import summary_frame
+from nba_analysis.cube import CLOSE_GAME_MARGIN, load_shot_cube
+from nba_analysis.features import BINS, CATEGORIES
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Summaries the dashboard draws, as shooting_summary/ShotCube.summary arguments
+QUERIES = {
+    'shot clock': dict(categories=['SHOT_CLOCK_CATEGORY']),
+    'catch and shoot': dict(by=['Catch and Shoot'], categories=['Distance', 'Time Left', 'Defender Distance'],
+                            keys={'Catch and Shoot': [True, False]}),
+    '7 players': dict(by=['player_name'], keys={'player_name': [
+        'lebron james', 'stephen curry', 'kawhi leonard', 'james harden',
+        'chris paul', 'kobe bryant', 'anthony davis']}),
+    '2 teams': dict(by=['team_name'], keys={'team_name': ['Golden State Warriors', 'Atlanta Hawks']}),
+    'all teams': dict(by=['team_name']),
+}
+
+# Every chart's table, and the sidebar selections they are compared under
+TABLES = {
+    'shot clock': lambda cube, filters: analytics.shot_clock_summary(cube, **filters),
+    'catch and shoot': lambda cube, filters: analytics.catch_and_shoot_summary(cube, **filters),
+    'players': lambda cube, filters: analytics.player_comparison(cube, analytics.FAMOUS_PLAYERS, **filters),
+    'teams': lambda cube, filters: analytics.team_comparison(
+        cube, ['Golden State Warriors', 'Los Angeles Lakers', 'Atlanta Hawks'], **filters),
+    'team difference': lambda cube, filters: analytics.team_difference(
+        cube, 'Golden State Warriors', 'Atlanta Hawks', **filters),
+}
+
+TABLE_FILTERS = [analytics.common_filters(),
+                 analytics.common_filters("Home", "2", "3 Points", "Below 5 points"),
+                 analytics.common_filters("Away", "4", "2 Points", "More than 5 points")]
+
+# Filters switched on one after the other
+FILTER_STEPS = [
+    ('location', 'H'),
+    ('period', 2),
+    ('close_game', True),
+    ('pts_type', 2),
+    ('teams', ['Golden State Warriors', 'Atlanta Hawks']),
+]
+
+# Scouting packs: the famous players in sevens, and every pair of the first five
+PLAYER_COMPARISONS = ([analytics.FAMOUS_PLAYERS[i:i + 7] for i in range(0, len(analytics.FAMOUS_PLAYERS), 7)]
+                      + [list(pair) for pair in itertools.combinations(analytics.FAMOUS_PLAYERS[:5], 2)])
+
+# Cells checked against explicit resampling: (made, shots)
+CELLS = [(3, 7), (40, 100), (420, 1000)]
+
+# Imported by the dashboard before its sidebar, and what they must not import
+LIGHT_MODULES = ['nba_analysis.options', 'nba_analysis.startup', 'nba_analysis.instrumentation']
+HEAVY_MODULES = ['numpy', 'pandas', 'plotly']
+
+_, SHOT_CLOCK_EDGES, SHOT_CLOCK_LABELS, _ = BINS['SHOT_CLOCK_CATEGORY']
+
+
+def filter_frame(shot_data, location=None, period=None, pts_type=None, close_game=None):
+    """The shots matching the common filters, by boolean-indexing the frame."""
+    mask = np.ones(len(shot_data), dtype=bool)
+    if location is not None:
+        mask &= shot_data['LOCATION'] == location
+    if period is not None:
+        mask &= shot_data['PERIOD'] == period
+    if pts_type is not None:
+        mask &= shot_data['PTS_TYPE'] == pts_type
+    if close_game is not None:
+        mask &= (shot_data['FINAL_MARGIN'].abs() <= CLOSE_GAME_MARGIN) == close_game
+    return shot_data[mask]
+
+
+def legacy_player_summary(shot_data, players):
+    """The nested loop Page 2 used to build its bubble-chart table."""
+    def calculate_shooting_percentage(data):
+        if len(data) == 0:
+            return 0
+        return (data['FGM'].sum() / len(data)) * 100
+
+    data = shot_data[shot_data['player_name'].isin([player.lower() for player in players])]
+    summary_table = pd.DataFrame(columns=['Category', 'Player', 'Shooting Percentage', 'Shot Count'])
+    for category in CATEGORIES:
+        for level in data[category].cat.categories:
+            for player in players:
+                subset = data[(data['player_name'] == player.lower()) & (data[category] == level)]
+                summary_table = pd.concat([summary_table, pd.DataFrame([{
+                    'Category': f'{level}', 'Player': player,
+                    'Shooting Percentage': calculate_shooting_percentage(subset),
+                    'Shot Count': len(subset)}])])
+    return summary_table
+
+
+def chained_table(shot_data, location=None, period=None, close_game=None, pts_type=None, teams=None):
+    """Shots and made shots per shot clock bin, filtering as the original script did."""
+    filtered_data = shot_data
+    if location is not None:
+        filtered_data = filtered_data[filtered_data['LOCATION'] == location]
+    if period is not None:
+        filtered_data = filtered_data[filtered_data['PERIOD'] == period]
+    if close_game is not None:
+        filtered_data = filtered_data[(abs(filtered_data['FINAL_MARGIN']) <= CLOSE_GAME_MARGIN) == close_game]
+    if pts_type is not None:
+        filtered_data = filtered_data[filtered_data['PTS_TYPE'] == pts_type]
+    if teams is not None:
+        filtered_data = filtered_data[filtered_data['team_name'].isin(teams)]
+    filtered_data['SHOT_CLOCK_CATEGORY'] = pd.cut(filtered_data['SHOT_CLOCK'], bins=SHOT_CLOCK_EDGES,
+                                                  labels=SHOT_CLOCK_LABELS)
+    table = filtered_data.groupby('SHOT_CLOCK_CATEGORY', observed=False)['FGM'].agg(['count', 'sum'])
+    return filtered_data.index.to_numpy(), table['count'].to_numpy(), table['sum'].to_numpy()
+
+
+def store_table(shot_store, **filters):
+    """The same table from the selected rows of the store and their precomputed bin codes."""
+    rows = shot_store.rows(**filters)
+    codes = shot_store.columns['SHOT_CLOCK_CATEGORY'][rows]
+    keep = codes >= 0
+    shots = np.bincount(codes[keep], minlength=len(SHOT_CLOCK_LABELS))
+    # FGM is 0/1: counting the made shots' codes avoids float64 weights
+    keep &= shot_store.columns['FGM'][rows] == 1
+    made = np.bincount(codes[keep], minlength=len(SHOT_CLOCK_LABELS))
+    return rows, shots, made
+
+
+def binned_summary(shot_data, bin_width, **filters):
+    """The shot clock profile table by ``pd.cut`` and groupby over the filtered shots."""
+    shots = filter_frame(shot_data, **filters)
+    labels = list(shot_clock.bin_labels(bin_width))
+    edges = np.minimum(np.arange(len(labels) + 1) * bin_width, shot_clock.SHOT_CLOCK_SECONDS)
+    # Round to the recorded tenths so edges fall exactly between intervals
+    bins = pd.cut(shots['SHOT_CLOCK'].round(1), bins=edges.round(1), labels=labels, right=True)
+    grouped = shots['FGM'].groupby(bins, observed=False).agg(['sum', 'count'])
+    return summary_frame([], [labels], grouped['sum'].to_numpy(dtype=np.int64),
+                         grouped['count'].to_numpy(dtype=np.int64))
+
+
+def per_chart_tables(shot_cube, kind, names, filters):
+    """The tables of one comparison's charts, one analytics call per chart, in file order."""
+    if kind == 'teams':
+        return ([analytics.team_levels(shot_cube, team, **filters) for team in names]
+                + [analytics.team_difference(shot_cube, *names, **filters)])
+    summary = analytics.player_comparison(shot_cube, names, **filters)
+    bubble = summary.assign(**{'Shooting Percentage': summary['Shooting Percentage'].round(1)})
+    return [bubble, summary] if len(names) == 2 else [bubble]
+
+
+def explicit_interval(made, shots, resamples, seed=1):
+    """Percentile interval from resampling the cell's shots one by one."""
+    outcomes = np.r_[np.ones(made), np.zeros(shots - made)]
+    picks = np.random.default_rng(seed).integers(0, shots, size=(resamples, shots))
+    return np.quantile(outcomes[picks].mean(axis=1) * 100, [0.025, 0.975])
+
+
+def wait_idle(prefetcher, owner, timeout=60):
+    """Block until ``owner`` has nothing left to prefetch."""
+    deadline = time.monotonic() + timeout
+    while prefetcher.pending(owner):
+        if time.monotonic() > deadline:
+            raise TimeoutError("prefetch did not finish")
+        time.sleep(0.001)
+
+
+def import_time(module):
+    """Seconds to import ``module`` in a fresh interpreter, and the modules it brought in."""
+    code = (f"import sys, time; start = time.perf_counter(); import {module}; "
+            f"print(time.perf_counter() - start); print(' '.join(sys.modules))")
+    output = subprocess.run([sys.executable, '-c', code], cwd=REPO, check=True,
+                            capture_output=True, text=True).stdout.splitlines()
+    return float(output[0]), set(output[1].split())
+
+
+def _pss():
+    """Proportional set size of this process in bytes (Linux only)."""
+    with open('/proc/self/smaps_rollup') as rollup:
+        for line in rollup:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("no Pss in /proc/self/smaps_rollup")
+
+
+def _worker(mode, paths, shared_directory, barrier, queue):
+    tables = None
+    if mode == 'private':
+        shot_cube = load_shot_cube(paths['shots'], paths['players'], None)
+    elif mode == 'shared':
+        shot_cube = shared.attach(shared_directory).cube
+    if mode != 'baseline':
+        tables = [table(shot_cube, filters) for filters in TABLE_FILTERS for table in TABLES.values()]
+    # Measure once every worker holds its data, so shared pages are split
+    barrier.wait()
+    queue.put((_pss(), tables))
+    barrier.wait()
+
+
+def run_workers(mode, n_workers, paths, shared_directory):
+    """Total PSS of ``n_workers`` dashboard workers alive together, and their tables.
+
+    ``baseline`` workers only import the package, ``private`` ones load the
+    cube themselves and ``shared`` ones attach to ``shared_directory``.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    barrier = ctx.Barrier(n_workers)
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(mode, paths, shared_directory, barrier, queue))
+               for _ in range(n_workers)]
+    for worker in workers:
+        worker.start()
+    results = [queue.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    return sum(pss for pss, _ in results), [tables for _, tables in results]
@@ -0,0 +1,100 @@
+"""Synthetic shot logs with the same schema as the 2014-15 ``shot_logs.csv``.
+
+The real log is not part of the repository, so the tests and the benchmarks
+generate their own. Players are drawn from ``players_teams.csv`` (plus a few
+players missing from it, as in the real data) and the numeric columns follow
+rough league-wide distributions; the values are not meant to be analysed,
+only to be shaped like the real thing.
+
+Logs of 10^5 to 10^8 rows are generated and written in chunks, so memory
+stays bounded by the chunk size rather than the log size (see
+:mod:`benchmarks.synthetic` to write one from the command line).
+"""
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from nba_analysis.data import PLAYERS_TEAMS_PATH, build_shot_data
+
+
+# Number of shots in the real 2014-15 log
+BASE_ROWS = 128069
+
+UNLISTED_PLAYERS = ['jimmer dredette', 'nene', 'mnta ellis']
+
+# Rows generated at a time by iter_shot_log
+CHUNK_ROWS = 1_000_000
+
+
+def _shot_chunk(rng, n_rows, players, n_games):
+    fgm = (rng.random(n_rows) < 0.45).astype(np.int64)
+    pts_type = rng.choice([2, 3], n_rows, p=[0.74, 0.26])
+    shot_clock = np.round(rng.uniform(0, 24, n_rows), 1)
+    shot_clock[rng.random(n_rows) < 0.02] = 24.0
+    shot_clock[rng.random(n_rows) < 0.04] = np.nan
+    dribbles = np.where(rng.random(n_rows) < 0.45, 0, rng.integers(1, 25, n_rows))
+
+    return pd.DataFrame({
+        'GAME_ID': 21400001 + rng.integers(0, n_games, n_rows),
+        'MATCHUP': 'MAR 04, 2015 - CHA @ BKN',
+        'LOCATION': rng.choice(['A', 'H'], n_rows),
+        'W': rng.choice(['W', 'L'], n_rows),
+        'FINAL_MARGIN': rng.integers(-40, 41, n_rows),
+        'SHOT_NUMBER': rng.integers(1, 30, n_rows),
+        'PERIOD': rng.choice([1, 2, 3, 4, 5, 6, 7], n_rows,
+                             p=[0.25, 0.25, 0.24, 0.24, 0.015, 0.004, 0.001]),
+        'GAME_CLOCK': '1:09',
+        'SHOT_CLOCK': shot_clock,
+        'DRIBBLES': dribbles,
+        'TOUCH_TIME': np.round(rng.uniform(0, 24, n_rows), 1),
+        'SHOT_DIST': np.round(rng.uniform(0, 45, n_rows), 1),
+        'PTS_TYPE': pts_type,
+        'SHOT_RESULT': np.where(fgm == 1, 'made', 'missed'),
+        'CLOSEST_DEFENDER': 'Anderson, Alan',
+        'CLOSEST_DEFENDER_PLAYER_ID': 101187,
+        'CLOSE_DEF_DIST': np.round(rng.gamma(2.0, 2.0, n_rows), 1),
+        'FGM': fgm,
+        'PTS': fgm * pts_type,
+        'player_name': rng.choice(players, n_rows),
+        'player_id': 203148,
+    })
+
+
+def iter_shot_log(n_rows=BASE_ROWS, seed=0, players_path=PLAYERS_TEAMS_PATH, chunk_rows=CHUNK_ROWS):
+    """Yield DataFrames of at most ``chunk_rows`` shots, ``n_rows`` in total.
+
+    Each chunk draws from its own generator seeded with ``(seed, chunk)``, so
+    the same ``seed`` and ``chunk_rows`` always give the same log.
+    """
+    players = pd.read_csv(players_path)['Player'].tolist() + UNLISTED_PLAYERS
+    # About 100 shots per game, as in the real log
+    n_games = max(1, n_rows // 100)
+    for chunk, start in enumerate(range(0, n_rows, chunk_rows)):
+        rng = np.random.default_rng([seed, chunk])
+        yield _shot_chunk(rng, min(chunk_rows, n_rows - start), players, n_games)
+
+
+def generate_shot_log(n_rows=BASE_ROWS, seed=0, players_path=PLAYERS_TEAMS_PATH):
+    """Return a DataFrame of ``n_rows`` synthetic shots."""
+    return pd.concat(list(iter_shot_log(n_rows, seed, players_path)), ignore_index=True)
+
+
+def write_shot_log(path, n_rows=BASE_ROWS, seed=0, players_path=PLAYERS_TEAMS_PATH):
+    """Write a synthetic shot log CSV to ``path`` chunk by chunk and return ``path``."""
+    for chunk, shots in enumerate(iter_shot_log(n_rows, seed, players_path)):
+        shots.to_csv(path, index=False, encoding="ISO-8859-1",
+                     mode='w' if chunk == 0 else 'a', header=chunk == 0)
+    return path
+
+
+def synthetic_shot_data(n_rows=BASE_ROWS, seed=0, players_path=PLAYERS_TEAMS_PATH):
+    """Return a merged, typed shot frame with bin columns, as the dashboard sees it.
+
+    The synthetic log goes through a temporary CSV so that dtypes and derived
+    columns come from exactly the same code path as the real data.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        shot_path = write_shot_log(os.path.join(tmp, 'shot_logs.csv'), n_rows, seed, players_path)
+        return build_shot_data(shot_path, players_path)
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_analysis import analytics, bootstrap, figures
+from nba_analysis.options import DEFAULT_TEAMS, FAMOUS_PLAYERS
+
+from .support import CELLS, explicit_interval
+
+
+@pytest.mark.parametrize('made, shots', CELLS)
+def test_binomial_resampling_matches_explicit_resampling(made, shots):
+    low, high = bootstrap.percentage_intervals([made], [shots], resamples=20000, time_budget=60)
+    # Within one shot's worth of percentage, plus sampling noise
+    np.testing.assert_allclose([low[0], high[0]], explicit_interval(made, shots, 20000), atol=100 / shots + 1)
+
+
+def test_same_seed_gives_same_intervals(shot_cube, filters):
+    summary = analytics.player_comparison(shot_cube, FAMOUS_PLAYERS, intervals=True, **filters)
+    pd.testing.assert_frame_equal(summary, analytics.player_comparison(shot_cube, FAMOUS_PLAYERS, intervals=True,
+                                                                       **filters))
+    bounded = summary.dropna(subset=['CI Low'])
+    assert (bounded['CI Low'] <= bounded['CI High']).all()
+
+
+def test_team_difference_intervals_pair_levels_by_category(shot_cube, filters):
+    team1, team2 = DEFAULT_TEAMS
+    difference = analytics.team_difference(shot_cube, team1, team2, intervals=True, **filters)
+    levels1, levels2 = (analytics.team_levels(shot_cube, team, **filters)
+                        .set_index('Category')['Shooting Percentage'] for team in DEFAULT_TEAMS)
+    assert set(difference['Category']) == set(levels1.index) & set(levels2.index)
+    pct1 = levels1[difference['Category']].to_numpy()
+    pct2 = levels2[difference['Category']].to_numpy()
+    np.testing.assert_allclose(difference['Difference'], np.abs(pct1 - pct2))
+    assert list(difference['Team']) == [team1 if better else team2 for better in pct1 > pct2]
+    assert (difference['CI Low'] <= difference['CI High']).all()
+
+
+def test_difference_figure_shows_negative_lower_bounds():
+    difference = pd.DataFrame({'Category': ['a', 'b'], 'Difference': [1.0, 4.0], 'Team': ['X', 'Y'],
+                               'CI Low': [-6.0, 1.0], 'CI High': [7.0, 9.0]})
+    x_min, x_max = figures.team_difference_figure(difference, 'X').layout.xaxis.range
+    assert x_min <= -6 and x_max >= 9
+    plain = difference.drop(columns=['CI Low', 'CI High'])
+    assert figures.team_difference_figure(plain, 'X').layout.xaxis.range[0] == 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from nba_analysis import density, figures, shared, views
+from nba_analysis.figure_cache import FigureCache
+from nba_analysis.options import DEFAULT_BUBBLE_PLAYERS
+
+
+def histogram(shot_store, **filters):
+    """Shots per grid cell by ``np.histogram2d`` over the selected shots."""
+    rows = shot_store.rows(**filters)
+    # The last cell of each axis is open-ended
+    distance = np.minimum(shot_store.columns['SHOT_DIST'][rows], density.DISTANCE_EDGES[-1])
+    defender = np.minimum(shot_store.columns['CLOSE_DEF_DIST'][rows], density.DEFENDER_EDGES[-1])
+    step = [density.DEFENDER_EDGES[1], density.DISTANCE_EDGES[1]]
+    counts, _, _ = np.histogram2d(defender, distance, bins=[
+        np.append(density.DEFENDER_EDGES, density.DEFENDER_EDGES[-1] + step[0]),
+        np.append(density.DISTANCE_EDGES, density.DISTANCE_EDGES[-1] + step[1])])
+    return counts
+
+
+@pytest.mark.parametrize('players', [None, DEFAULT_BUBBLE_PLAYERS, ['Nobody At All']],
+                         ids=['every player', 'bubble players', 'unknown'])
+def test_counts_match_histogram(shot_store, filters, players):
+    made, shots = density.ShotDensity(shot_store).counts(players=players, **filters)
+    np.testing.assert_array_equal(shots, histogram(shot_store, players=players, **filters))
+    counted = (shot_store.mask(players=players, **filters) & ~np.isnan(shot_store.columns['SHOT_DIST'])
+               & ~np.isnan(shot_store.columns['CLOSE_DEF_DIST']))
+    assert made.sum() == shot_store.columns['FGM'][counted].sum()
+
+
+def test_attached_store_maps_its_cells(shot_files, tmp_path):
+    version = shared.publish(str(tmp_path), shot_files['shots'], shot_files['players'], None)
+    dataset = shared.attach(str(tmp_path))
+    assert dataset.version == version
+    cells = dataset.store.columns['Density Cell']
+    assert isinstance(cells, np.memmap)
+    private = density.ShotDensity(shared.load_shot_store(shot_files['shots'], shot_files['players'], None))
+    attached = density.load_shot_density(dataset.store)
+    for filters in [{}, {'players': DEFAULT_BUBBLE_PLAYERS, 'location': 'H'}]:
+        for expected, actual in zip(private.counts(**filters), attached.counts(**filters)):
+            np.testing.assert_array_equal(expected, actual)
+
+
+def test_figure_is_cached_with_its_payload(shot_store, filters, monkeypatch):
+    view = views.shot_density_view(density.ShotDensity(shot_store), filters, DEFAULT_BUBBLE_PLAYERS)
+    figure_cache = FigureCache()
+    sized = figure_cache.get_or_build(view.key, lambda: view.figure(view.table()))
+    assert isinstance(sized, figures.SizedFigure)
+    assert sized.payload_bytes == len(sized.figure.to_json().encode())
+    # A cache hit brings the size along instead of serializing the figure again
+    monkeypatch.setattr(figures, 'payload_bytes', None)
+    assert figure_cache.get_or_build(view.key, lambda: view.figure(view.table())) is sized
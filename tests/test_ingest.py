@@ -0,0 +1,139 @@
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_analysis import data, snapshot
+from nba_analysis.cube import ShotCube, load_shot_cube, stream_shot_cube
+from nba_analysis.density import load_shot_density
+from nba_analysis.ingest import ingest_games
+from nba_analysis.options import BIN_WIDTHS, DEFAULT_BUBBLE_PLAYERS
+from nba_analysis.shot_clock import ShotClockProfile, load_shot_clock_profile
+from nba_analysis.store import ShotStore, load_shot_store
+
+from .checks import assert_cubes_equal
+from .conftest import FILTERS, N_SHOTS
+from .synthetic import generate_shot_log
+
+
+NEW_GAMES = 25
+
+
+def _comparable(frame):
+    """``frame`` with categoricals as objects, so category order does not matter."""
+    return frame.astype({column: object for column in frame.columns
+                         if isinstance(frame[column].dtype, pd.CategoricalDtype)})
+
+
+@pytest.fixture
+def season(tmp_path):
+    """A season on disk without its last games, loaded with everything derived from it."""
+    paths = {'shots': str(tmp_path / 'shot_logs.csv'), 'players': str(tmp_path / 'players_teams.csv'),
+             'snapshot': str(tmp_path / snapshot.SNAPSHOT_PATH)}
+    shutil.copy(data.PLAYERS_TEAMS_PATH, paths['players'])
+    log = generate_shot_log(N_SHOTS, seed=2, players_path=paths['players'])
+    new_games = np.sort(log['GAME_ID'].unique())[-NEW_GAMES:]
+    is_new = log['GAME_ID'].isin(new_games)
+    log[~is_new].to_csv(paths['shots'], index=False, encoding="ISO-8859-1")
+    data.clear_cache()
+    load_all(paths)
+    yield paths, log[~is_new], log[is_new]
+    data.clear_cache()
+
+
+def load_all(paths):
+    args = (paths['shots'], paths['players'], paths['snapshot'])
+    shot_log = data.load_shot_log(*args)
+    shot_store = load_shot_store(*args)
+    return (shot_log, load_shot_cube(*args), load_shot_clock_profile(shot_log), shot_store,
+            load_shot_density(shot_store))
+
+
+def assert_served(paths, expected_log, tmp_path):
+    """The served frame and everything derived from it equal a full reload of ``expected_log``."""
+    expected_csv = str(tmp_path / 'expected.csv')
+    expected_log.to_csv(expected_csv, index=False, encoding="ISO-8859-1")
+    expected = data.build_shot_data(expected_csv, paths['players'])
+    shot_log, shot_cube, profile, shot_store, density = load_all(paths)
+    pd.testing.assert_frame_equal(_comparable(expected), _comparable(shot_log.frame()))
+    assert_cubes_equal(ShotCube.from_frame(expected), shot_cube)
+
+    expected_profile = ShotClockProfile.from_frame(expected)
+    for filters in FILTERS:
+        for bin_width in BIN_WIDTHS:
+            pd.testing.assert_frame_equal(expected_profile.summary(bin_width, **filters),
+                                          profile.summary(bin_width, **filters))
+
+    expected_store = ShotStore.from_frame(expected, data.read_players_teams(paths['players']))
+    pd.testing.assert_frame_equal(_comparable(expected_store.frame()), _comparable(shot_store.frame()))
+    for filters in FILTERS:
+        for players in (None, DEFAULT_BUBBLE_PLAYERS):
+            np.testing.assert_array_equal(expected_store.rows(players=players, **filters),
+                                          shot_store.rows(players=players, **filters))
+            expected_density = load_shot_density(expected_store)
+            for expected_counts, counts in zip(expected_density.counts(players=players, **filters),
+                                               density.counts(players=players, **filters)):
+                np.testing.assert_array_equal(expected_counts, counts)
+
+
+def test_ingest_matches_full_reload(season, tmp_path, monkeypatch):
+    paths, old_rows, new_rows = season
+    # Only the new partition is read: the season is neither parsed nor counted again
+    monkeypatch.setattr(data, 'build_shot_data', None)
+    for counted in (ShotCube, ShotClockProfile, ShotStore):
+        monkeypatch.setattr(counted, 'from_frame', None)
+    result = ingest_games(new_rows, paths['shots'], paths['players'], paths['snapshot'])
+    assert result == (NEW_GAMES, 0, len(new_rows), 0)
+    monkeypatch.undo()
+    assert_served(paths, pd.concat([old_rows, new_rows]), tmp_path)
+
+
+def test_duplicate_games_are_rejected(season):
+    paths, _, new_rows = season
+    ingest_games(new_rows, paths['shots'], paths['players'], paths['snapshot'])
+    with pytest.raises(ValueError, match="already in"):
+        ingest_games(new_rows.iloc[:1], paths['shots'], paths['players'], paths['snapshot'])
+    assert len(data.ingested_paths(paths['shots'])) == 1
+
+
+@pytest.mark.parametrize('bad_batch', [
+    lambda rows: rows.drop(columns=['FGM']),
+    lambda rows: rows.drop(columns=['MATCHUP']),
+    lambda rows: rows.assign(FGM=np.where(np.arange(len(rows)) == 0, np.nan, rows['FGM'])),
+    lambda rows: rows.assign(SHOT_DIST='far'),
+], ids=['missing FGM', 'missing MATCHUP', 'FGM with NA', 'text SHOT_DIST'])
+def test_bad_batch_leaves_the_log_loadable(season, tmp_path, bad_batch):
+    paths, old_rows, new_rows = season
+    with pytest.raises(ValueError):
+        ingest_games(bad_batch(new_rows), paths['shots'], paths['players'], paths['snapshot'])
+    assert not os.path.exists(data.ingested_directory(paths['shots']))
+    # A new process still loads the season, and a good batch still goes in
+    data.clear_cache()
+    assert_served(paths, old_rows, tmp_path)
+    ingest_games(new_rows, paths['shots'], paths['players'], paths['snapshot'])
+    assert_served(paths, pd.concat([old_rows, new_rows]), tmp_path)
+
+
+def test_overwrite_appends_without_rewriting_the_log(season, tmp_path):
+    paths, old_rows, new_rows = season
+    before = os.stat(paths['shots'])
+    ingest_games(new_rows, paths['shots'], paths['players'], paths['snapshot'])
+    # One game of the new batch and one of the season, all shots made
+    replaced = [new_rows['GAME_ID'].iloc[-1], old_rows['GAME_ID'].iloc[0]]
+    log = pd.concat([old_rows, new_rows])
+    replacement = log[log['GAME_ID'].isin(replaced)].assign(FGM=1, SHOT_RESULT='made')
+    result = ingest_games(replacement, paths['shots'], paths['players'], paths['snapshot'], overwrite=True)
+    assert result == (0, 2, len(replacement), len(replacement))
+    after = os.stat(paths['shots'])
+    assert (after.st_mtime_ns, after.st_size) == (before.st_mtime_ns, before.st_size)
+    assert len(data.ingested_paths(paths['shots'])) == 2
+    expected = pd.concat([log[~log['GAME_ID'].isin(replaced)], replacement])
+    assert_served(paths, expected, tmp_path)
+
+    # A new process reads the season and both partitions
+    data.clear_cache()
+    assert_served(paths, expected, tmp_path)
+    assert_cubes_equal(load_shot_cube(paths['shots'], paths['players'], paths['snapshot']),
+                       stream_shot_cube(paths['shots'], paths['players'], chunk_rows=4_999))
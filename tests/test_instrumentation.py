@@ -0,0 +1,26 @@
+import tracemalloc
+
+from nba_analysis.instrumentation import StageTimer
+
+
+def test_timing_does_not_trace_memory():
+    was_tracing = tracemalloc.is_tracing()
+    timer = StageTimer()
+    with timer.stage('table') as stage:
+        stage.rows = 3
+    assert tracemalloc.is_tracing() == was_tracing
+    record = timer.records[0]
+    assert (record.stage, record.rows, record.allocated_bytes) == ('table', 3, None)
+
+
+def test_trace_memory(memory_timer):
+    with memory_timer.stage('table'):
+        data = bytearray(1 << 20)
+    assert memory_timer.records[0].peak_bytes >= len(data)
+
+
+def test_disabled_timer_records_nothing():
+    timer = StageTimer(enabled=False, trace_memory=True)
+    with timer.stage('table'):
+        pass
+    assert timer.records == []
@@ -0,0 +1,33 @@
+import pytest
+
+from nba_analysis.figure_cache import FigureCache
+from nba_analysis.lru import LRUCache
+
+
+def test_least_recently_used_is_evicted():
+    cache = LRUCache(2)
+    cache.get_or_build('a', lambda: 1)
+    cache.get_or_build('b', lambda: 2)
+    assert cache.get_or_build('a', lambda: None) == 1
+    cache.get_or_build('c', lambda: 3)
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+    assert cache.stats() == (1, 3, 1, 2, 2)
+
+
+def test_failed_build_is_not_cached():
+    cache = LRUCache(2)
+    with pytest.raises(KeyError):
+        cache.get_or_build('a', lambda: {}['missing'])
+    assert 'a' not in cache and len(cache) == 0
+
+
+def test_figure_cache_is_an_lru_cache():
+    cache = FigureCache(1)
+    assert isinstance(cache, LRUCache)
+    cache.get_or_build('a', lambda: 1)
+    cache.get_or_build('b', lambda: 2)
+    assert cache.stats().evictions == 1
+    cache.clear()
+    assert cache.stats() == (0, 0, 0, 0, 1)
+    with pytest.raises(ValueError):
+        FigureCache(0)
@@ -0,0 +1,138 @@
+"""The cube answers every dashboard page as the frame did.
+
+Each summary is checked against the vectorized aggregation over the filtered
+frame and against the loop the dashboard ran before the cube existed.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_analysis import analytics
+from nba_analysis.aggregation import player_summary, shooting_summary
+from nba_analysis.features import CATEGORIES
+from nba_analysis.options import DEFAULT_MULTI_TEAMS, DEFAULT_TEAMS, FAMOUS_PLAYERS
+
+from .support import QUERIES, filter_frame, legacy_player_summary
+
+
+def percentage(data):
+    """The dashboard's original shooting percentage: 0 for no shots."""
+    return data['FGM'].sum() / len(data) * 100 if len(data) else 0
+
+
+def legacy_catch_and_shoot(data):
+    rows = []
+    for category in analytics.CATCH_AND_SHOOT_CATEGORIES:
+        for level in data[category].cat.categories:
+            for catch, label in analytics.CATCH_AND_SHOOT_TYPES.items():
+                subset = data[(data['Catch and Shoot'] == catch) & (data[category] == level)]
+                rows.append({'Category': level, 'Type': label, 'Shooting Percentage': percentage(subset)})
+    return pd.DataFrame(rows)
+
+
+def legacy_team_levels(data):
+    """Page 3's ``prepare_data_for_plotting``: (level, FG%) of one team, lowest first."""
+    levels = []
+    for category in CATEGORIES:
+        shooting_percentage = data.groupby(category, observed=True)['FGM'].mean() * 100
+        levels.extend(shooting_percentage.items())
+    levels.sort(key=lambda level: level[1])
+    return levels
+
+
+def assert_same_levels(table, levels):
+    assert table['Category'].tolist() == [level for level, _ in levels]
+    np.testing.assert_allclose(table['Shooting Percentage'], [pct for _, pct in levels])
+
+
+@pytest.mark.parametrize('query', list(QUERIES), ids=list(QUERIES))
+def test_cube_summary_matches_frame(shot_data, shot_cube, filters, query):
+    expected = shooting_summary(filter_frame(shot_data, **filters), **QUERIES[query])
+    actual = shot_cube.summary(**QUERIES[query], **filters)
+    pd.testing.assert_frame_equal(expected.astype(object), actual.astype(object), check_exact=False)
+
+
+def test_shot_clock(shot_data, shot_cube, filters):
+    data = filter_frame(shot_data, **filters)
+    expected = data.groupby('SHOT_CLOCK_CATEGORY', observed=False).agg(
+        Shots=('SHOT_CLOCK', 'count'), FGM=('FGM', 'sum'))
+    actual = analytics.shot_clock_summary(shot_cube, **filters)
+    assert actual['Category'].tolist() == expected.index.tolist()
+    np.testing.assert_array_equal(actual['Shots'], expected['Shots'])
+    np.testing.assert_array_equal(actual['FGM'], expected['FGM'])
+
+
+def test_catch_and_shoot(shot_data, shot_cube, filters):
+    expected = legacy_catch_and_shoot(filter_frame(shot_data, **filters)).set_index(['Type', 'Category'])
+    actual = analytics.catch_and_shoot_summary(shot_cube, **filters).set_index(['Type', 'Category'])
+    assert actual.index.sort_values().equals(expected.index.sort_values())
+    np.testing.assert_allclose(actual['Shooting Percentage'].reindex(expected.index),
+                               expected['Shooting Percentage'])
+
+
+@pytest.mark.parametrize('players', [FAMOUS_PLAYERS, ['LeBron James'], ['Stephen Curry', 'Nobody At All']],
+                         ids=['famous', 'one', 'unknown'])
+def test_player_comparison(shot_data, shot_cube, filters, players):
+    data = filter_frame(shot_data, **filters)
+    key = ['Player', 'Category']
+    expected = legacy_player_summary(data, players).set_index(key).sort_index()
+    for actual in [player_summary(data, players), analytics.player_comparison(shot_cube, players, **filters)]:
+        actual = actual.set_index(key).sort_index()
+        assert actual.index.equals(expected.index)
+        np.testing.assert_array_equal(actual['Shot Count'], expected['Shot Count'].astype(int))
+        np.testing.assert_allclose(actual['Shooting Percentage'], expected['Shooting Percentage'].astype(float))
+
+
+def test_player_comparisons(shot_cube, filters):
+    comparisons = [FAMOUS_PLAYERS[:7], FAMOUS_PLAYERS[5:7]]
+    for comparison, table in zip(comparisons, analytics.player_comparisons(shot_cube, comparisons, **filters)):
+        pd.testing.assert_frame_equal(table, analytics.player_comparison(shot_cube, comparison, **filters))
+
+
+def test_team_levels(shot_data, shot_cube, filters):
+    data = filter_frame(shot_data, **filters)
+    by_team = analytics.team_levels_by_team(shot_cube, DEFAULT_MULTI_TEAMS, **filters)
+    for team in DEFAULT_MULTI_TEAMS:
+        levels = legacy_team_levels(data[data['team_name'] == team])
+        assert_same_levels(analytics.team_levels(shot_cube, team, **filters), levels)
+        assert_same_levels(by_team[team], levels)
+
+
+def test_team_difference(shot_data, shot_cube, filters):
+    data = filter_frame(shot_data, **filters)
+    team1, team2 = DEFAULT_TEAMS
+    levels2 = dict(legacy_team_levels(data[data['team_name'] == team2]))
+    # Each of team1's levels against the same level of team2, not the one of the same rank
+    paired = [(label, pct1, levels2[label]) for label, pct1 in legacy_team_levels(data[data['team_name'] == team1])
+              if label in levels2]
+    expected = pd.DataFrame({
+        'Category': [label for label, _, _ in paired],
+        'Difference': [abs(pct1 - pct2) for _, pct1, pct2 in paired],
+        'Team': [team1 if pct1 > pct2 else team2 for _, pct1, pct2 in paired],
+    }).sort_values(by='Difference').reset_index(drop=True)
+    actual = analytics.team_difference(shot_cube, team1, team2, **filters)
+    pd.testing.assert_frame_equal(actual, expected)
+    with_intervals = analytics.team_difference(shot_cube, team1, team2, intervals=True, **filters)
+    pd.testing.assert_frame_equal(with_intervals[actual.columns], actual)
+
+
+def test_team_differences(shot_cube, filters):
+    pairs = [tuple(DEFAULT_TEAMS), tuple(reversed(DEFAULT_TEAMS)), tuple(DEFAULT_MULTI_TEAMS[:2]),
+             (DEFAULT_TEAMS[0], DEFAULT_TEAMS[0]), (DEFAULT_TEAMS[0], 'No Such Team')]
+    for pair, actual in zip(pairs, analytics.team_differences(shot_cube, pairs, **filters), strict=True):
+        pd.testing.assert_frame_equal(actual, analytics.team_difference(shot_cube, *pair, **filters))
+
+
+def test_team_comparison(shot_data, shot_cube, filters):
+    data = filter_frame(shot_data, **filters)
+    expected = [(team, level, pct) for team in DEFAULT_MULTI_TEAMS
+                for category in CATEGORIES
+                for level, pct in (data[data['team_name'] == team]
+                                   .groupby(category, observed=True)['FGM'].mean() * 100).items()]
+    actual = analytics.team_comparison(shot_cube, DEFAULT_MULTI_TEAMS, **filters)
+    assert list(zip(actual['Team'], actual['Category'])) == [(team, level) for team, level, _ in expected]
+    np.testing.assert_allclose(actual['Shooting Percentage'], [pct for _, _, pct in expected])
+
+
+def test_team_options(shot_data, shot_cube):
+    assert shot_cube.teams == sorted(shot_data['team_name'].dropna().unique())
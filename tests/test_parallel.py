@@ -0,0 +1,56 @@
+import gc
+import os
+import signal
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+import pytest
+
+from nba_analysis.aggregation import shooting_summary
+from nba_analysis.parallel import ParallelSummary
+
+from .support import filter_frame
+
+QUERIES = [
+    dict(by=['team_name']),
+    dict(by=['player_name'], keys={'player_name': ['lebron james', 'stephen curry', 'nobody at all']}),
+    dict(by=['team_name', 'Catch and Shoot']),
+]
+
+
+@pytest.fixture(scope='module')
+def backend(shot_data):
+    with ParallelSummary(shot_data, processes=2) as backend:
+        yield backend
+
+
+@pytest.mark.parametrize('query', QUERIES, ids=['teams', 'players', 'teams x catch and shoot'])
+def test_matches_shooting_summary(shot_data, backend, filters, query):
+    expected = shooting_summary(filter_frame(shot_data, **filters), **query)
+    pd.testing.assert_frame_equal(backend.summary(**query, **filters), expected)
+
+
+def test_close_removes_columns(shot_data):
+    backend = ParallelSummary(shot_data, processes=1)
+    assert os.listdir(backend.directory)
+    backend.close()
+    assert not os.path.exists(backend.directory)
+
+
+def test_garbage_collection_removes_columns(shot_data):
+    backend = ParallelSummary(shot_data, processes=1)
+    directory = backend.directory
+    backend._executor.shutdown()
+    del backend
+    gc.collect()
+    assert not os.path.exists(directory)
+
+
+def test_dead_worker_removes_columns(shot_data):
+    backend = ParallelSummary(shot_data, processes=1)
+    backend.summary(by=['team_name'])
+    for process in list(backend._executor._processes.values()):
+        os.kill(process.pid, signal.SIGKILL)
+    with pytest.raises(BrokenProcessPool):
+        backend.summary(by=['team_name'])
+    assert not os.path.exists(backend.directory)
@@ -0,0 +1,73 @@
+import pytest
+
+from nba_analysis import analytics, views
+from nba_analysis.figure_cache import FigureCache
+from nba_analysis.prefetch import Prefetcher
+from nba_analysis.shot_clock import ShotClockProfile
+
+from .support import wait_idle
+
+
+FILTERS = analytics.common_filters()
+OTHER_FILTERS = analytics.common_filters("Home", "2", "3 Points", "Below 5 points")
+
+
+@pytest.fixture(scope='module')
+def profile(shot_data):
+    return ShotClockProfile.from_frame(shot_data)
+
+
+@pytest.fixture
+def prefetcher():
+    prefetcher = Prefetcher(FigureCache())
+    yield prefetcher
+    prefetcher.shutdown()
+
+
+def all_views(shot_cube, profile, filters):
+    return [view for page in views.PAGES for view in views.page_views(page, shot_cube, profile, filters)]
+
+
+def _not_built():
+    raise AssertionError("a prefetched view was built again")
+
+
+def test_prefetched_figures_equal_built_ones(prefetcher, shot_cube, profile):
+    page_views = all_views(shot_cube, profile, FILTERS)
+    prefetcher.schedule('session', tuple(FILTERS.items()), page_views)
+    wait_idle(prefetcher, 'session')
+    for view in page_views:
+        figure = prefetcher.figure_cache.get_or_build(view.key, _not_built)
+        assert figure.to_json() == view.figure(view.table()).to_json()
+
+
+def test_same_filters_are_scheduled_once(prefetcher, shot_cube, profile):
+    page_views = all_views(shot_cube, profile, FILTERS)
+    token = tuple(FILTERS.items())
+    prefetcher.schedule('session', token, page_views)
+    pending = prefetcher.pending('session')
+    prefetcher.schedule('session', token, page_views)
+    assert prefetcher.pending('session') <= pending
+    wait_idle(prefetcher, 'session')
+    # Every view is cached: nothing is left to schedule
+    prefetcher.schedule('other session', token, page_views)
+    assert prefetcher.pending('other session') == 0
+
+
+def test_changed_filters_cancel_the_stale_batch(prefetcher, shot_cube, profile):
+    first = all_views(shot_cube, profile, FILTERS)
+    second = all_views(shot_cube, profile, OTHER_FILTERS)
+    prefetcher.schedule('session', tuple(FILTERS.items()), first)
+    prefetcher.schedule('session', tuple(OTHER_FILTERS.items()), second)
+    wait_idle(prefetcher, 'session')
+    # At most the view already being built when the filters changed
+    assert sum(view.key in prefetcher.figure_cache for view in first) <= 1
+    assert all(view.key in prefetcher.figure_cache for view in second)
+
+
+def test_cancel_drops_the_batch(prefetcher, shot_cube, profile):
+    page_views = all_views(shot_cube, profile, FILTERS)
+    prefetcher.schedule('session', tuple(FILTERS.items()), page_views)
+    prefetcher.cancel('session')
+    assert prefetcher.pending('session') == 0
+    assert sum(view.key in prefetcher.figure_cache for view in page_views) <= 1
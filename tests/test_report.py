@@ -0,0 +1,25 @@
+import os
+
+import pandas as pd
+
+from nba_analysis import report
+
+from .support import PLAYER_COMPARISONS, TABLE_FILTERS, per_chart_tables
+
+
+def test_batched_tables_match_per_chart(shot_cube):
+    comparisons = report.all_team_pairs(shot_cube)[:40] + [('players', names) for names in PLAYER_COMPARISONS]
+    for filters in TABLE_FILTERS:
+        tasks, index = report.figure_tasks(shot_cube, comparisons, filters)
+        tables = {path: table for path, _, table, _ in tasks}
+        for (kind, names), entry in zip(comparisons, index, strict=True):
+            for path, expected in zip(entry['files'], per_chart_tables(shot_cube, kind, names, filters), strict=True):
+                pd.testing.assert_frame_equal(tables[path], expected)
+
+
+def test_render_writes_every_figure(shot_cube, tmp_path):
+    comparisons = report.all_team_pairs(shot_cube)[:3] + [('players', PLAYER_COMPARISONS[-1])]
+    tasks, _ = report.figure_tasks(shot_cube, comparisons, TABLE_FILTERS[0])
+    written = [path for path in report.render(tasks, str(tmp_path), 'json', 1) if path is not None]
+    assert len(written) == len(tasks)
+    assert all(os.path.getsize(path) > 0 for path in written)
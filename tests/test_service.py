@@ -0,0 +1,95 @@
+import http.client
+import json
+import threading
+from urllib.parse import urlencode
+
+import pandas as pd
+import pytest
+
+from nba_analysis import analytics
+from nba_analysis.cube import load_shot_cube
+from nba_analysis.service import QueryServer, QueryService, _matches
+
+
+SELECTION = {'location': 'Home', 'quarter': '2'}
+FILTERS = analytics.common_filters("Home", "2", "All", "All")
+
+
+@pytest.fixture(scope='module')
+def service(shot_files):
+    return QueryService(shot_files['shots'], shot_files['players'], None)
+
+
+@pytest.fixture(scope='module')
+def server(service):
+    server = QueryServer(('127.0.0.1', 0), service)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_responses_match_analytics(service, shot_files):
+    shot_cube = load_shot_cube(shot_files['shots'], shot_files['players'], None)
+    players = ['LeBron James', 'Stephen Curry']
+    teams = ['Atlanta Hawks', 'Utah Jazz']
+    expected = [
+        ('/players', {'player': players}, analytics.player_comparison(shot_cube, players, **FILTERS)),
+        ('/teams', {'team': teams}, analytics.team_comparison(shot_cube, teams, **FILTERS)),
+        ('/team-difference', {'team1': teams[0], 'team2': teams[1]},
+         analytics.team_difference(shot_cube, *teams, **FILTERS)),
+        ('/catch-and-shoot', {}, analytics.catch_and_shoot_summary(shot_cube, **FILTERS)),
+        ('/shot-clock', {}, analytics.shot_clock_summary(shot_cube, **FILTERS)),
+    ]
+    for path, params, table in expected:
+        response = service.get(path, urlencode({**params, **SELECTION}, doseq=True))
+        assert response.status == 200, (path, response.body)
+        rows = pd.DataFrame(json.loads(response.body)['rows'], columns=table.columns)
+        pd.testing.assert_frame_equal(rows, table.reset_index(drop=True), check_dtype=False)
+
+
+@pytest.mark.parametrize('bin_width', ['inf', '-inf', 'nan', '1e309', '0', '-3', '0.25', 'three'])
+def test_bad_bin_width_is_rejected(service, bin_width):
+    response = service.get('/shot-clock', urlencode({'bin_width': bin_width}))
+    assert response.status == 400
+    assert 'bin_width' in json.loads(response.body)['error']
+
+
+def test_bad_requests(service):
+    assert service.get('/nowhere').status == 404
+    assert service.get('/catch-and-shoot', 'colour=red').status == 400
+    assert service.get('/players').status == 400
+    assert service.get('/teams', 'team=Utah+Jazz&quarter=5').status == 400
+
+
+@pytest.mark.parametrize('header, matches', [
+    (None, False),
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", W/"abc" ,"def"', True),
+    ('*', True),
+    ('"ab"', False),
+    ('"abcd"', False),
+    ('"xabc"', False),
+    ('abc', False),
+    ('', False),
+])
+def test_if_none_match(header, matches):
+    assert _matches(header, '"abc"') is matches
+
+
+def test_revalidation_over_http(server):
+    connection = http.client.HTTPConnection('127.0.0.1', server.server_address[1])
+    url = f'/shot-clock?{urlencode(SELECTION)}'
+    connection.request('GET', url)
+    response = connection.getresponse()
+    body = response.read()
+    etag = response.getheader('ETag')
+    assert response.status == 200 and body and etag
+    for header, status in [(etag, 304), (f'"other", W/{etag}', 304), ('*', 304),
+                           (etag[:-2] + '"', 200), ('"other"', 200)]:
+        connection.request('GET', url, headers={'If-None-Match': header})
+        response = connection.getresponse()
+        assert (response.status, len(response.read())) == (status, 0 if status == 304 else len(body)), header
+    connection.close()
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_analysis import shared
+from nba_analysis.cube import load_shot_cube
+from nba_analysis.shot_clock import BIN_WIDTHS, ShotClockProfile
+from nba_analysis.store import load_shot_store
+
+from .checks import assert_cubes_equal
+from .support import TABLE_FILTERS, TABLES, run_workers
+
+
+def _published_bytes(version):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(version) for name in names)
+
+
+def test_attached_data_matches_private(shot_files, tmp_path):
+    shared.publish(str(tmp_path), shot_files['shots'], shot_files['players'], None)
+    dataset = shared.attach(str(tmp_path))
+    for values in dataset.store.columns.values():
+        assert isinstance(values, np.memmap) and not values.flags.writeable
+    private_store = load_shot_store(shot_files['shots'], shot_files['players'], None)
+    # The saved dictionaries come back as object rather than string Indexes
+    pd.testing.assert_frame_equal(private_store.frame(), dataset.store.frame(), check_categorical=False)
+    assert_cubes_equal(load_shot_cube(shot_files['shots'], shot_files['players'], None), dataset.cube)
+
+
+def test_attached_profile_matches_private(shot_files, tmp_path, filters, monkeypatch):
+    shared.publish(str(tmp_path), shot_files['shots'], shot_files['players'], None)
+    private = ShotClockProfile.from_frame(load_shot_store(shot_files['shots'], shot_files['players'], None))
+    # Workers map the published counts rather than counting the shots again
+    monkeypatch.setattr(ShotClockProfile, 'from_frame', None)
+    profile = shared.attach(str(tmp_path)).profile
+    assert isinstance(profile.made, np.memmap) and not profile.shots.flags.writeable
+    for bin_width in BIN_WIDTHS:
+        pd.testing.assert_frame_equal(private.summary(bin_width, **filters), profile.summary(bin_width, **filters))
+
+
+def test_attach_maps_instead_of_copying(shot_files, tmp_path, memory_timer):
+    version = shared.publish(str(tmp_path), shot_files['shots'], shot_files['players'], None)
+    with memory_timer.stage('attach') as stage:
+        shared.attach(str(tmp_path))
+    # Only the dictionaries are read into the process
+    assert stage.peak_bytes < _published_bytes(version) / 10
+
+
+def test_new_version_replaces_the_old(shot_files, tmp_path):
+    first = shared.publish(str(tmp_path), shot_files['shots'], shot_files['players'], None)
+    attached = shared.attach(str(tmp_path))
+    second = shared.publish(str(tmp_path), shot_files['shots'], shot_files['players'], None)
+    assert not os.path.exists(first)
+    # The old mapping stays readable after its files are deleted
+    assert int(attached.store.columns['FGM'].sum()) >= 0
+    assert shared.attach(str(tmp_path)).version == second
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/smaps_rollup'), reason="needs Linux PSS accounting")
+def test_workers_share_one_copy(shot_files, tmp_path):
+    paths = {'shots': shot_files['shots'], 'players': shot_files['players']}
+    shared.publish(str(tmp_path), paths['shots'], paths['players'], None)
+    private_pss, private_tables = run_workers('private', 2, paths, str(tmp_path))
+    shared_pss, shared_tables = run_workers('shared', 2, paths, str(tmp_path))
+    shot_cube = load_shot_cube(paths['shots'], paths['players'], None)
+    expected = [table(shot_cube, filters) for filters in TABLE_FILTERS for table in TABLES.values()]
+    for worker_tables in private_tables + shared_tables:
+        for expected_table, table in zip(expected, worker_tables):
+            pd.testing.assert_frame_equal(expected_table, table)
+    assert shared_pss < private_pss
@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_analysis import analytics, shot_clock
+from nba_analysis.shot_clock import BIN_WIDTHS, ShotClockProfile
+
+from .support import binned_summary
+
+
+@pytest.fixture(scope='module')
+def profile(shot_data):
+    return ShotClockProfile.from_frame(shot_data)
+
+
+def test_three_second_profile_equals_cube(profile, shot_cube, filters):
+    pd.testing.assert_frame_equal(profile.summary(3, **filters), analytics.shot_clock_summary(shot_cube, **filters))
+
+
+@pytest.mark.parametrize('bin_width', BIN_WIDTHS)
+def test_profile_equals_binning_the_shots(shot_data, profile, filters, bin_width):
+    pd.testing.assert_frame_equal(profile.summary(bin_width, **filters),
+                                  binned_summary(shot_data, bin_width, **filters))
+
+
+def test_store_profile_equals_frame_profile(profile, shot_store):
+    from_store = ShotClockProfile.from_frame(shot_store)
+    np.testing.assert_array_equal(profile.made, from_store.made)
+    np.testing.assert_array_equal(profile.shots, from_store.shots)
+
+
+@pytest.mark.parametrize('bin_width', [0, -3, 0.25, float('inf'), float('nan')])
+def test_bad_bin_width_is_rejected(profile, bin_width):
+    with pytest.raises(ValueError):
+        profile.summary(bin_width)
+
+
+def test_wide_bin_covers_the_clock(profile):
+    assert shot_clock.bin_labels(100) == ('0-24',)
+    pd.testing.assert_frame_equal(profile.summary(100), profile.summary(24))
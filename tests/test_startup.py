@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from nba_analysis import startup
+
+from .support import HEAVY_MODULES, LIGHT_MODULES, import_time
+
+
+@pytest.mark.parametrize('module', LIGHT_MODULES)
+def test_sidebar_modules_import_no_heavy_module(module):
+    imported = import_time(module)[1]
+    assert not [name for name in HEAVY_MODULES if name in imported]
+
+
+@pytest.mark.parametrize('module', ['nba_analysis.figures', 'nba_analysis.views'])
+def test_figures_do_not_import_plotly_express(module):
+    assert 'plotly.express' not in import_time(module)[1]
+
+
+def test_work_starts_once():
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        return 42
+
+    future = startup.start_once('test_work_starts_once', work)
+    assert startup.start_once('test_work_starts_once', lambda: 0) is future
+    release.set()
+    assert future.result(5) == 42
+    assert calls == ['startup-test_work_starts_once']
+
+
+def test_error_is_kept_in_the_future():
+    future = startup.start_once('test_error_is_kept', lambda: {}['missing'])
+    with pytest.raises(KeyError):
+        future.result(5)
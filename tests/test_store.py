@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nba_analysis.options import DEFAULT_TEAMS, FAMOUS_PLAYERS
+
+from .support import FILTER_STEPS, chained_table, store_table
+
+
+def test_store_gives_back_the_frame(shot_data, shot_store):
+    frame = shot_store.frame()
+    for column in frame.columns:
+        expected, actual = shot_data[column], frame[column]
+        if isinstance(expected.dtype, pd.CategoricalDtype):
+            expected, actual = expected.astype(object), actual.astype(object)
+        pd.testing.assert_series_equal(expected, actual, check_dtype=False, rtol=1e-6)
+
+
+def test_name_selections_match_the_frame(shot_data, shot_store):
+    # Player names are matched whatever their capitalisation
+    lowered = [player.lower() for player in FAMOUS_PLAYERS]
+    np.testing.assert_array_equal(np.flatnonzero(shot_data['player_name'].isin(lowered)),
+                                  shot_store.rows(players=FAMOUS_PLAYERS))
+    np.testing.assert_array_equal(np.flatnonzero(shot_data['team_name'].isin(DEFAULT_TEAMS)),
+                                  shot_store.rows(teams=DEFAULT_TEAMS))
+
+
+@pytest.mark.parametrize('n_filters', range(len(FILTER_STEPS) + 1))
+def test_filters_match_chained_frame(shot_data, shot_store, n_filters):
+    filters = dict(FILTER_STEPS[:n_filters])
+    # Without filters the chained table writes its bin column into the frame itself
+    expected_table = chained_table(shot_data.copy(), **filters)
+    for expected, actual in zip(expected_table, store_table(shot_store, **filters)):
+        np.testing.assert_array_equal(expected, actual)
+
+
+def test_peak_memory_does_not_grow_with_filters(shot_store, memory_timer):
+    # The mask and its scratch buffer are allocated once, whatever the
+    # number of filters; only the (shrinking) selection adds to them
+    peaks = []
+    for n_filters in range(1, len(FILTER_STEPS) + 1):
+        with memory_timer.stage('store') as stage:
+            store_table(shot_store, **dict(FILTER_STEPS[:n_filters]))
+        peaks.append(stage.peak_bytes)
+    assert max(peaks) <= peaks[0] * 1.05, peaks
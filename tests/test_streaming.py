@@ -0,0 +1,14 @@
+import pytest
+
+from nba_analysis import data
+from nba_analysis.cube import ShotCube, stream_shot_cube
+
+from .checks import assert_cubes_equal
+
+
+@pytest.mark.parametrize('chunk_rows', [1_999, 7_919, 1_000_000])
+def test_streamed_cube_matches_in_memory(shot_files, chunk_rows):
+    # Small chunks split players, periods and locations unevenly
+    expected = ShotCube.from_frame(data.build_shot_data(shot_files['shots'], shot_files['players']))
+    actual = stream_shot_cube(shot_files['shots'], shot_files['players'], chunk_rows)
+    assert_cubes_equal(expected, actual)